@@ -0,0 +1,472 @@
+import itertools
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_right
+
+from quiz_persistence import copy_file_mode
+
+try:
+    import lzma
+except ImportError:  # lzma 없이 빌드된 파이썬
+    lzma = None
+
+
+BANK_MAGIC = b"QBNK"
+BANK_VERSION = 2  # 2부터 색인 변경분을 이어 붙일 수 있음 (1은 전체 색인만)
+READABLE_VERSIONS = (1, 2)
+MAX_INDEX_DELTAS = 32  # 색인 변경분이 이만큼 이어지면 다음에 고칠 때 전체 색인을 새로 씀
+FIND_LIMIT = 64  # 고칠 문제가 이보다 많으면 bytes.find 대신 ID 열을 한 번 훑어 찾음
+BLOCK_RECORDS = 256  # 블록 하나에 담는 문제 수 (고치거나 지운 블록은 이보다 적을 수 있음)
+
+# 머리글: 표식, 버전, 압축 방식, 색인 위치, 색인 길이, 색인 CRC, 살아 있는 블록 바이트 합
+HEADER = struct.Struct("<4sHHQQIQ")
+
+CODECS = {"zlib": 0, "lzma": 1}
+DECOMPRESS_ERRORS = (zlib.error, EOFError) + ((lzma.LZMAError,) if lzma is not None else ())
+
+
+def compress(codec, data):
+    if codec == "lzma":
+        return lzma.compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(codec, data):
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def check_codec(codec):
+    """쓸 수 있는 압축 방식인지 확인합니다."""
+    if codec not in CODECS:
+        raise ValueError(f"알 수 없는 압축 방식입니다: {codec} (zlib 또는 lzma)")
+    if codec == "lzma" and lzma is None:
+        raise ValueError("이 파이썬에는 lzma 모듈이 없습니다. zlib을 사용해주세요.")
+
+
+def encode_block(codec, questions):
+    """문제 dict 목록을 한 줄에 하나씩 JSON으로 적어 압축한 블록 바이트로 만듭니다."""
+    data = "\n".join(json.dumps(question, ensure_ascii=False, separators=(",", ":")) for question in questions)
+    return compress(codec, data.encode('utf-8'))
+
+
+def decode_lines(codec, data):
+    """압축한 블록 바이트를 문제마다 한 줄씩의 바이트열 목록으로 풉니다 (깨졌으면 ValueError).
+
+    문제 하나만 읽을 때는 그 줄만 JSON으로 풀면 되도록 줄 단위로 둡니다.
+    """
+    try:
+        return decompress(codec, data).split(b"\n")
+    except DECOMPRESS_ERRORS as e:
+        raise ValueError(f"문제 은행 블록이 깨졌습니다: {e}")
+
+
+def ids_to_bytes(ids):
+    """문제 ID 배열을 리틀 엔디언 바이트열로 (플랫폼과 상관없이 같은 파일이 되도록)"""
+    if sys.byteorder == "big":
+        ids = array('I', ids)
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def ids_from_bytes(data):
+    ids = array('I')
+    ids.frombytes(data)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+class BankWriter:
+    """열린 파일 끝에 블록과 색인을 차례로 쓰고 마지막에 머리글을 고칩니다."""
+
+    def __init__(self, f, codec):
+        self.f = f
+        self.codec = codec
+
+    def write_block(self, questions):
+        """블록 하나를 파일 끝에 쓰고 색인 항목 [위치, 길이, 문제 수]를 반환합니다."""
+        data = encode_block(self.codec, questions)
+        self.f.seek(0, os.SEEK_END)
+        offset = self.f.tell()
+        self.f.write(data)
+        return [offset, len(data), len(questions)]
+
+    def finish(self, blocks, ids):
+        """전체 색인(모든 블록 항목과 문제 ID)을 쓰고 그 (위치, 길이, CRC)를 반환합니다."""
+        index = json.dumps({"blocks": blocks}, separators=(",", ":")).encode('utf-8') + b"\n" + ids_to_bytes(ids)
+        return self.write_index(index, blocks)
+
+    def finish_delta(self, blocks, base, depth, changed, changed_ids):
+        """바뀐 블록의 색인 항목과 문제 ID만 담은 색인 변경분을 쓰고 그 (위치, 길이, CRC)를 반환합니다.
+
+        base는 이전 색인의 (위치, 길이, CRC), changed는 바뀌거나 새로 붙은 블록 번호
+        (오름차순), changed_ids는 그 블록들의 문제 ID를 차례로 이은 배열입니다.
+        """
+        entries = [[number] + blocks[number] for number in changed]
+        index = json.dumps({"base": list(base), "depth": depth, "changed": entries},
+                           separators=(",", ":")).encode('utf-8') + b"\n" + ids_to_bytes(changed_ids)
+        return self.write_index(index, blocks)
+
+    def write_index(self, index, blocks):
+        """색인을 파일 끝에 쓰고 디스크에 내린 뒤 머리글이 새 색인을 가리키게 합니다.
+
+        머리글을 가장 나중에 고치므로 도중에 멈추면 이전 색인이 그대로 남습니다.
+        """
+        data = compress(self.codec, index)
+        self.f.seek(0, os.SEEK_END)
+        offset = self.f.tell()
+        self.f.write(data)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        live = sum(block[1] for block in blocks)
+        record = (offset, len(data), zlib.crc32(data))
+        self.f.seek(0)
+        self.f.write(HEADER.pack(BANK_MAGIC, BANK_VERSION, CODECS[self.codec], *record, live))
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return record
+
+
+def write_bank(path, questions, replace=None, codec="zlib"):
+    """문제(dict 또는 행 뷰)를 블록 압축 문제 은행 파일로 원자적으로 저장합니다.
+
+    questions는 한 번만 훑으므로 제너레이터를 주면 블록 하나만큼만 메모리에
+    둡니다. replace는 write_json_atomic과 같습니다.
+    """
+    check_codec(codec)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".qbank", dir=directory)
+    try:
+        copy_file_mode(fd, path)
+        with os.fdopen(fd, 'w+b') as f:
+            f.write(bytes(HEADER.size))
+            writer = BankWriter(f, codec)
+            blocks = []
+            ids = array('I')
+            chunk = []
+            for question in questions:
+                chunk.append(dict(question.items()))
+                if len(chunk) == BLOCK_RECORDS:
+                    blocks.append(writer.write_block(chunk))
+                    ids.extend(question["id"] for question in chunk)
+                    chunk = []
+            if chunk:
+                blocks.append(writer.write_block(chunk))
+                ids.extend(question["id"] for question in chunk)
+            writer.finish(blocks, ids)
+        if replace is None:
+            os.replace(temp_path, path)
+        elif replace(temp_path, path) is False:
+            os.remove(temp_path)
+            return False
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class QuestionBank:
+    """블록 압축 문제 은행 파일(.qbank)을 문제 단위로 읽고 고칩니다.
+
+    파일은 머리글, 문제 BLOCK_RECORDS개씩 JSON으로 묶어 zlib(또는 lzma)으로
+    압축한 블록들, 블록 위치와 문제 ID 순서를 담은 색인으로 되어 있습니다.
+    문제 하나를 읽을 때는 그 문제가 든 블록 하나만 풀고, 고치거나 덧붙일
+    때는 바뀐 블록만 다시 압축해 파일 끝에 쓴 뒤 그 블록들의 색인 항목만 담은
+    색인 변경분을 덧붙이고 머리글을 고칩니다. 변경분은 이전 색인을 가리키므로
+    읽을 때는 전체 색인까지 거슬러 올라가 차례로 반영하며, MAX_INDEX_DELTAS개가
+    이어지면 다음에 고칠 때 전체 색인을 새로 씁니다. 예전 블록과 색인 자리는
+    비어 있는 채로 남으므로 빈 자리가 살아 있는 블록보다 커지면 needs_rewrite()가
+    True가 되고, 그때는 write_bank()로 새로 씁니다 (rewrite()).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.load()
+
+    def load(self):
+        """머리글과 색인(변경분 사슬 포함)을 읽습니다 (깨졌거나 형식이 다르면 ValueError)."""
+        path = self.path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size or header[:len(BANK_MAGIC)] != BANK_MAGIC:
+                raise ValueError(f"문제 은행 파일이 아닙니다: {path}")
+            _, version, codec, index_offset, index_length, index_crc, _ = HEADER.unpack(header)
+            if version not in READABLE_VERSIONS:
+                raise ValueError(f"지원하지 않는 문제 은행 버전입니다: {version}")
+            self.codec = "lzma" if codec == CODECS["lzma"] else "zlib"
+            check_codec(self.codec)
+            stat = os.fstat(f.fileno())
+            record = (index_offset, index_length, index_crc)
+            chain = []  # 최근 색인부터 전체 색인까지 (내용, 문제 ID 바이트)
+            while True:
+                index = self.read_index(f, record)
+                end = index.index(b"\n")
+                chain.append((json.loads(index[:end]), index[end + 1:]))
+                if "base" not in chain[-1][0]:
+                    break
+                if len(chain) > MAX_INDEX_DELTAS:
+                    raise ValueError(f"문제 은행 파일의 색인이 깨졌습니다: {path}")
+                record = tuple(chain[-1][0]["base"])
+        full, id_bytes = chain.pop()
+        blocks = full["blocks"]  # [위치, 길이, 문제 수]
+        if chain:
+            # 블록마다 문제 ID를 나눠 두고 오래된 변경분부터 바뀐 블록만 갈아 끼움
+            ids = ids_from_bytes(id_bytes)
+            block_ids = []
+            start = 0
+            for block in blocks:
+                block_ids.append(ids[start:start + block[2]])
+                start += block[2]
+            for delta, delta_bytes in reversed(chain):
+                delta_ids = ids_from_bytes(delta_bytes)
+                start = 0
+                for number, offset, length, count in delta["changed"]:
+                    if number == len(blocks):
+                        blocks.append(None)
+                        block_ids.append(None)
+                    blocks[number] = [offset, length, count]
+                    block_ids[number] = delta_ids[start:start + count]
+                    start += count
+            ids = array('I')
+            for part in block_ids:
+                ids.extend(part)
+            id_bytes = None
+        else:
+            ids = ids_from_bytes(id_bytes)
+        self.set_index(blocks, ids, id_bytes)
+        self.record = (index_offset, index_length, index_crc)  # 머리글이 가리키는 색인
+        self.depth = len(chain)  # 전체 색인 위에 이어 붙인 변경분 수
+        self.file_id = (stat.st_ino, stat.st_size)
+
+    def read_index(self, f, record):
+        """(위치, 길이, CRC)의 색인을 읽어 풉니다."""
+        offset, length, crc = record
+        f.seek(offset)
+        data = f.read(length)
+        if len(data) != length or zlib.crc32(data) != crc:
+            raise ValueError(f"문제 은행 파일의 색인이 깨졌습니다: {self.path}")
+        try:
+            return decompress(self.codec, data)
+        except DECOMPRESS_ERRORS as e:
+            raise ValueError(f"문제 은행 파일의 색인이 깨졌습니다: {e}")
+
+    def set_index(self, blocks, ids, id_bytes=None):
+        self.blocks = blocks
+        self.ids = ids
+        self.id_bytes = ids_to_bytes(ids) if id_bytes is None else id_bytes  # 리틀 엔디언 4바이트씩
+        self.live = sum(block[1] for block in blocks)
+        self.starts = []  # 블록마다 첫 문제의 (전체) 순번
+        start = 0
+        for block in blocks:
+            self.starts.append(start)
+            start += block[2]
+        self.cached = None  # 마지막으로 푼 (블록 번호, 줄 목록)
+
+    def is_current(self):
+        """파일이 이 객체가 읽은 상태 그대로인지 (다른 인스턴스가 고치거나 새로 쓰지 않았는지)"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(HEADER.size)
+                stat = os.fstat(f.fileno())
+        except OSError:
+            return False
+        return (len(header) == HEADER.size and (stat.st_ino, stat.st_size) == self.file_id
+                and HEADER.unpack(header)[3:6] == self.record)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def read_lines(self, number):
+        """number번째 블록을 풀어 문제마다 한 줄씩의 바이트열 목록으로"""
+        if self.cached is not None and self.cached[0] == number:
+            return self.cached[1]
+        offset, length, _ = self.blocks[number]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        lines = decode_lines(self.codec, data)
+        self.cached = (number, lines)
+        return lines
+
+    def read_block(self, number):
+        """number번째 블록의 문제 dict 목록"""
+        return [json.loads(line) for line in self.read_lines(number)]
+
+    def __iter__(self):
+        """모든 문제를 블록 순서대로 하나씩 내놓습니다 (블록 하나만큼만 메모리에 둠)."""
+        with open(self.path, 'rb') as f:
+            for offset, length, count in self.blocks:
+                if not count:
+                    continue
+                f.seek(offset)
+                for line in decode_lines(self.codec, f.read(length)):
+                    yield json.loads(line)
+
+    def locate(self, position):
+        """전체 순번을 (블록 번호, 블록 안 순번)으로"""
+        number = bisect_right(self.starts, position) - 1
+        return number, position - self.starts[number]
+
+    def position_of(self, question_id):
+        """문제 ID의 전체 순번 (없으면 None)
+
+        ID 열의 원시 바이트에서 bytes.find로 찾으므로 ID마다 파이썬 객체를 만들지 않습니다.
+        """
+        if not 0 <= question_id <= 0xFFFFFFFF:
+            return None
+        key = struct.pack("<I", question_id)
+        start = 0
+        while True:
+            found = self.id_bytes.find(key, start)
+            if found < 0:
+                return None
+            if found % 4 == 0:
+                return found // 4
+            start = found + 1
+
+    def get(self, question_id):
+        """문제 하나를 읽습니다 (그 문제가 든 블록만 풂). 없으면 None"""
+        position = self.position_of(question_id)
+        if position is None:
+            return None
+        number, slot = self.locate(position)
+        return json.loads(self.read_lines(number)[slot])
+
+    def patch(self, question_id, fields):
+        """문제 하나의 필드를 고칩니다."""
+        question = self.get(question_id)
+        if question is None:
+            raise ValueError(f"문제 은행에 없는 문제입니다: {question_id}")
+        question.update(fields)
+        self.apply([question])
+
+    def append(self, questions):
+        """새 문제들을 끝에 덧붙입니다 (마지막 블록에 자리가 있으면 그 블록부터 채움)."""
+        self.apply(questions)
+
+    def apply(self, questions, deleted_ids=()):
+        """문제 dict를 ID로 찾아 통째로 바꾸거나(없으면 끝에 덧붙임) deleted_ids를 지웁니다.
+
+        바뀐 블록만 다시 압축해 쓰고 색인은 그 블록들의 항목만 변경분으로 덧붙이므로
+        몇 문제만 고칠 때 전체 색인을 다시 압축하지 않습니다.
+        """
+        questions = [dict(question.items()) for question in questions]
+        deleted_ids = set(deleted_ids)
+        wanted = {question["id"] for question in questions} | deleted_ids
+        changes = {}  # 블록 번호 -> {블록 안 순번: 새 문제 dict 또는 None(삭제)}
+        if len(wanted) <= FIND_LIMIT:
+            # 몇 개뿐이면 ID 바이트열에서 bytes.find로 찾음 (ID마다 파이썬 객체를 만들지 않음)
+            found = {question_id: self.position_of(question_id) for question_id in wanted}
+            found = {question_id: position for question_id, position in found.items() if position is not None}
+        else:
+            found = {self.ids[position]: position for position in
+                     itertools.compress(range(len(self.ids)), map(wanted.__contains__, self.ids))}
+        for question_id, position in found.items():
+            if question_id in deleted_ids:
+                number, slot = self.locate(position)
+                changes.setdefault(number, {})[slot] = None
+        appended = []
+        for question in questions:
+            if question["id"] in deleted_ids:
+                continue
+            position = found.get(question["id"])
+            if position is None:
+                appended.append(question)
+            else:
+                number, slot = self.locate(position)
+                changes.setdefault(number, {})[slot] = question
+        last = len(self.blocks) - 1
+        if appended and last >= 0 and self.blocks[last][2] < BLOCK_RECORDS:
+            changes.setdefault(last, {})
+        if not changes and not appended:
+            return
+
+        # 바뀐 블록만 다시 압축해 쓰고, 색인도 그 블록들의 항목만 변경분으로 덧붙임
+        blocks = list(self.blocks)
+        changed = []
+        changed_ids = array('I')
+        with open(self.path, 'r+b') as f:
+            writer = BankWriter(f, self.codec)
+            for number in sorted(changes):
+                slots = changes[number]
+                block_questions = []
+                for slot, question in enumerate(self.read_block(number) if blocks[number][2] else ()):
+                    question = slots.get(slot, question)
+                    if question is not None:
+                        block_questions.append(question)
+                if number == last:
+                    room = BLOCK_RECORDS - len(block_questions)
+                    block_questions.extend(appended[:room])
+                    appended = appended[room:]
+                # 비운 블록도 번호가 밀리지 않도록 빈 항목으로 남김 (새로 쓸 때 빠짐)
+                blocks[number] = writer.write_block(block_questions) if block_questions else [0, 0, 0]
+                changed.append(number)
+                changed_ids.extend(question["id"] for question in block_questions)
+            for start in range(0, len(appended), BLOCK_RECORDS):
+                chunk = appended[start:start + BLOCK_RECORDS]
+                blocks.append(writer.write_block(chunk))
+                changed.append(len(blocks) - 1)
+                changed_ids.extend(question["id"] for question in chunk)
+            replaced = dict(zip(changed, blocks_ids(blocks, changed, changed_ids)))
+            ids = array('I')
+            for number, block in enumerate(blocks):
+                part = replaced.get(number)
+                if part is None:
+                    start = self.starts[number]
+                    part = self.ids[start:start + block[2]]
+                ids.extend(part)
+            if self.depth >= MAX_INDEX_DELTAS:
+                record = writer.finish(blocks, ids)
+                depth = 0
+            else:
+                record = writer.finish_delta(blocks, self.record, self.depth + 1, changed, changed_ids)
+                depth = self.depth + 1
+            stat = os.fstat(f.fileno())
+        self.set_index(blocks, ids)
+        self.record = record
+        self.depth = depth
+        self.file_id = (stat.st_ino, stat.st_size)
+
+    def garbage_bytes(self):
+        """고치거나 지운 블록과 예전 색인(아직 읽는 변경분 사슬 포함)이 남긴 빈 자리의 크기"""
+        return self.file_id[1] - HEADER.size - self.live - self.record[1]
+
+    def needs_rewrite(self):
+        """빈 자리가 살아 있는 블록보다 커져 새로 쓸 때가 되었는지"""
+        return self.garbage_bytes() > self.live
+
+    def rewrite(self):
+        """빈 자리 없이 새 파일로 다시 씁니다."""
+        write_bank(self.path, iter(self), codec=self.codec)
+        self.load()
+
+
+def blocks_ids(blocks, numbers, ids):
+    """numbers 블록들의 문제 ID를 차례로 이은 ids를 블록마다 나눕니다."""
+    start = 0
+    for number in numbers:
+        count = blocks[number][2]
+        yield ids[start:start + count]
+        start += count
+
+
+def read_bank_usage(path):
+    """머리글만 읽어 (살아 있는 블록 바이트 합, 빈 자리 바이트 수)를 반환합니다 (없거나 깨졌으면 None)."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    if len(header) != HEADER.size or header[:len(BANK_MAGIC)] != BANK_MAGIC:
+        return None
+    _, _, _, _, index_length, _, live = HEADER.unpack(header)
+    return live, size - HEADER.size - live - index_length
@@ -0,0 +1,80 @@
+from array import array
+
+
+class QuestionBatch:
+    """여러 문제에 대한 변경을 문제 ID로 모아 두었다가 한 번에 적용하는 일괄 작업입니다.
+
+    QuizEngine.apply_batch()가 ID 열을 한 번만 훑어 대상 행을 찾고, 모든
+    변경을 반영한 뒤 저장과 목록 새로고침을 한 번만 합니다. 한 문제에 여러
+    변경이 겹치면 삭제가 우선이고, 틀린 횟수는 지정한 값으로 바꾸거나 초기화한
+    뒤 증감을 더합니다.
+
+    되돌리기 기록도 같은 형식(변경 전 값으로 되돌리는 일괄 작업)이므로,
+    틀린 횟수처럼 많이 바뀔 수 있는 값은 array 두 개에 담고 삭제한 행은
+    QuestionTable.take()의 튜플로 보관합니다.
+    """
+
+    def __init__(self):
+        self.deletes = set()
+        self.fields = {}  # 문제 ID -> {필드: 새 값} (문제, 정답 등)
+        self.resets = set()
+        self.wrong_deltas = {}  # 문제 ID -> 틀린 횟수 증감
+        self.wrong_count_ids = array('I')  # 틀린 횟수를 지정한 값으로 바꿀 문제 ID
+        self.wrong_count_values = array('I')
+        self.restores = []  # 되살릴 행 (QuestionTable.take() 형식)
+        self.additions = []  # 새로 추가할 문제 dict (ID는 적용할 때 저장소가 붙임)
+
+    def delete(self, question_ids):
+        """문제들을 삭제합니다."""
+        self.deletes.update(question_ids)
+        return self
+
+    def set_fields(self, question_id, fields):
+        """문제 하나의 필드(문제, 정답, 첨부 파일)를 바꿉니다 (값이 None이면 그 필드를 없앰)."""
+        self.fields.setdefault(question_id, {}).update(fields)
+        return self
+
+    def edit_answers(self, answers):
+        """{문제 ID: 새 정답}대로 정답을 바꿉니다."""
+        for question_id, answer in answers.items():
+            answer = answer.strip()
+            if not answer:
+                raise ValueError("정답을 입력해주세요.")
+            self.set_fields(question_id, {"answer": answer})
+        return self
+
+    def reset_wrong_counts(self, question_ids):
+        """문제들의 틀린 횟수를 0으로 되돌립니다."""
+        self.resets.update(question_ids)
+        return self
+
+    def adjust_wrong_counts(self, question_ids, delta):
+        """문제들의 틀린 횟수를 delta만큼 늘리거나 줄입니다 (0 아래로는 내려가지 않음)."""
+        for question_id in question_ids:
+            self.wrong_deltas[question_id] = self.wrong_deltas.get(question_id, 0) + delta
+        return self
+
+    def set_wrong_counts(self, question_ids, counts):
+        """문제들의 틀린 횟수를 counts의 같은 자리 값으로 바꿉니다."""
+        self.wrong_count_ids.extend(question_ids)
+        self.wrong_count_values.extend(counts)
+        return self
+
+    def restore(self, records):
+        """QuestionTable.take()로 떼어 둔 행을 원래 위치에 되살립니다."""
+        self.restores.extend(records)
+        return self
+
+    def add(self, questions):
+        """새 문제들을 추가합니다 (ID는 적용할 때 붙음)."""
+        self.additions.extend(questions)
+        return self
+
+    def question_ids(self):
+        """이미 있는 문제 중 변경 대상인 문제 ID 전체 (되살릴 행은 제외)"""
+        return (self.deletes | self.resets | self.fields.keys() | self.wrong_deltas.keys()
+                | set(self.wrong_count_ids))
+
+    def __bool__(self):
+        return bool(self.deletes or self.fields or self.resets or self.wrong_deltas
+                    or self.wrong_count_ids or self.restores or self.additions)
@@ -0,0 +1,278 @@
+"""퀴즈 핵심 경로(로드, 저장, 필터, 출제, 채점, 검색)의 성능을 문제 수별로 측정합니다.
+
+화면 없이 QuizEngine만 사용하므로 디스플레이가 없는 Linux에서도 실행됩니다.
+
+사용 예:
+    python quiz_bench.py --sizes 1000 10000 100000
+    python quiz_bench.py --save-baseline bench_baseline.json
+    python quiz_bench.py --compare bench_baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from quiz_bank import QuestionBank, write_bank
+from quiz_engine import QuizEngine, normalize_answer
+from quiz_persistence import write_json_atomic
+
+
+KOREAN_WORDS = ["데이터베이스", "정규화", "트랜잭션", "프로세스", "스케줄링", "운영체제",
+                "네트워크", "프로토콜", "알고리즘", "자료구조", "소프트웨어", "테스트",
+                "요구사항", "설계", "모듈", "결합도", "응집도", "인터페이스", "보안", "암호화"]
+ENGLISH_WORDS = ["apple", "banana", "network", "process", "schedule", "database",
+                 "normalize", "transaction", "protocol", "algorithm", "structure",
+                 "interface", "module", "coupling", "cohesion", "security", "encrypt"]
+
+
+def generate_bank(size, seed=0):
+    """한국어/영어가 섞인 임의의 문제 목록을 만듭니다 (정답 길이도 다양하게)."""
+    rng = random.Random(seed)
+    questions = []
+    for i in range(size):
+        words = rng.choices(KOREAN_WORDS + ENGLISH_WORDS, k=rng.randint(3, 20))
+        answer_words = rng.choices(ENGLISH_WORDS if i % 2 else KOREAN_WORDS, k=rng.choice((1, 1, 2, 3, 6)))
+        questions.append({
+            "id": i + 1,
+            "question": f"{i + 1}. " + " ".join(words) + "?",
+            "answer": " ".join(answer_words),
+            "wrong_count": rng.choice((0, 0, 0, 1, 1, 2, 3, 5))
+        })
+    return questions
+
+
+def generate_answers(questions, seed=0, wrong_ratio=0.3):
+    """채점용 답안을 만듭니다 (일부는 일부러 틀리게, 일부는 띄어쓰기/대소문자만 다르게)."""
+    rng = random.Random(seed)
+    answers = []
+    for question in questions:
+        roll = rng.random()
+        if roll < wrong_ratio:
+            answers.append((question, rng.choice(ENGLISH_WORDS)))
+        elif roll < wrong_ratio + 0.2:
+            answers.append((question, question["answer"].upper().replace(" ", "")))
+        else:
+            answers.append((question, question["answer"]))
+    return answers
+
+
+class BenchmarkContext:
+    """한 문제 수에 대한 임시 데이터 폴더와 엔진을 준비합니다."""
+
+    def __init__(self, size, seed):
+        self.size = size
+        self.directory = tempfile.mkdtemp(prefix="quiz-bench-")
+        self.questions = generate_bank(size, seed)
+        write_json_atomic(os.path.join(self.directory, "quiz_data.json"), self.questions)
+        self.file_size = os.path.getsize(os.path.join(self.directory, "quiz_data.json"))
+        self.bank_path = os.path.join(self.directory, "bench.qbank")
+        write_bank(self.bank_path, self.questions)
+        self.bank_size = os.path.getsize(self.bank_path)
+        self.engine = self.new_engine()
+        self.engine.load()
+        self.answers = generate_answers(self.engine.questions, seed)
+
+    def new_engine(self):
+        return QuizEngine(self.directory)
+
+    def close(self):
+        self.engine.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# --- 측정 대상 (반환값: 처리한 항목 수) ---
+
+def bench_load(context):
+    engine = context.new_engine()
+    try:
+        return len(engine.load())
+    finally:
+        engine.close()
+
+
+def bench_save(context):
+    # 작성 스레드가 하는 일(스냅샷 + 원자적 쓰기)을 동기적으로 측정
+    data, on_written, replace = context.engine.store.snapshot()
+    if write_json_atomic(context.engine.store.path, data, replace):
+        on_written()
+    return len(data)
+
+
+def bench_bank_save(context):
+    # 같은 문제를 블록 압축 문제 은행 파일로 저장
+    write_bank(context.bank_path, context.engine.questions)
+    return len(context.engine.questions)
+
+
+def bench_bank_get(context):
+    # 문제 은행 파일에서 임의의 문제 1000개를 하나씩 읽음 (블록 하나씩만 풂)
+    bank = QuestionBank(context.bank_path)
+    ids = random.Random(0).choices(context.engine.questions.ids, k=1000)
+    for question_id in ids:
+        bank.get(question_id)
+    return len(ids)
+
+
+def bench_filter(context):
+    context.engine.settings["min_wrong_count"] = 1
+    return len(context.engine.filtered_questions())
+
+
+def bench_draw(context):
+    context.engine.settings["practice_mode"] = "random"
+    context.engine.start_session(context.engine.questions)
+    drawn = 0
+    while context.engine.next_question() is not None:
+        drawn += 1
+    return drawn
+
+
+def bench_draw_weighted(context):
+    # 오답 가중 랜덤: 모두 맞힌다고 보고 세션 전체를 뽑음
+    context.engine.settings["practice_mode"] = "weighted"
+    session = context.engine.start_session(context.engine.questions)
+    drawn = 0
+    while context.engine.next_question() is not None:
+        session.scheduler.record(session.current_question, True)
+        drawn += 1
+    return drawn
+
+
+def bench_normalize(context):
+    for question, user_answer in context.answers:
+        normalize_answer(user_answer)
+        normalize_answer(question["answer"])
+    return len(context.answers)
+
+
+def bench_grade(context):
+    return len(context.engine.grade_batch(context.answers, record=False))
+
+
+def bench_search(context):
+    # 검색창에 한 글자씩 입력하는 상황 (색인은 첫 반복 때 만들어 두고 재사용)
+    query = "데이터베이스 정규화"
+    for end in range(1, len(query) + 1):
+        context.engine.search(query[:end])
+    return len(query)
+
+
+BENCHMARKS = {
+    "load": bench_load,
+    "save": bench_save,
+    "bank_save": bench_bank_save,
+    "bank_get": bench_bank_get,
+    "filter": bench_filter,
+    "draw": bench_draw,
+    "draw_weighted": bench_draw_weighted,
+    "normalize": bench_normalize,
+    "grade": bench_grade,
+    "search": bench_search,
+}
+
+
+def measure(func, context, repeat):
+    """가장 빠른 실행 시간, 처리량, 최대 메모리를 측정합니다."""
+    best = None
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = func(context)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # 메모리는 tracemalloc 부담이 크므로 시간 측정과 따로 한 번만
+    gc.collect()
+    tracemalloc.start()
+    func(context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "items": items,
+        "items_per_second": items / best if best else None,
+        "peak_bytes": peak
+    }
+
+
+def run(sizes, names, repeat, seed):
+    """크기별로 모든 측정을 실행하고 결과 사전을 반환합니다."""
+    results = {}
+    for size in sizes:
+        context = BenchmarkContext(size, seed)
+        try:
+            size_results = {"file_bytes": context.file_size, "bank_bytes": context.bank_size}
+            for name in names:
+                size_results[name] = measure(BENCHMARKS[name], context, repeat)
+                print_result(size, name, size_results[name])
+            results[str(size)] = size_results
+        finally:
+            context.close()
+    return results
+
+
+def print_result(size, name, result):
+    rate = result["items_per_second"]
+    rate_text = f"{rate:,.0f}/s" if rate else "-"
+    print(f"{size:>9,}  {name:<14} {result['seconds'] * 1000:10.2f} ms  {rate_text:>14}"
+          f"  peak {result['peak_bytes'] / 1024 / 1024:8.2f} MB")
+
+
+def compare(results, baseline):
+    """기준 결과와 비교해 시간 비율을 출력합니다 (1보다 크면 느려짐)."""
+    print("\n기준 대비 (현재 시간 / 기준 시간):")
+    for size, size_results in results.items():
+        base_size = baseline["results"].get(size)
+        if not base_size:
+            continue
+        for name, result in size_results.items():
+            base = base_size.get(name)
+            if not isinstance(result, dict) or not base:
+                continue
+            ratio = result["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            flag = "  <-- 느려짐" if ratio > 1.2 else ""
+            print(f"{int(size):>9,}  {name:<14} x{ratio:5.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="퀴즈마스터 성능 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="측정할 문제 수 (예: 1000 10000 100000 1000000)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="일부 항목만 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--seed", type=int, default=0, help="데이터 생성 시드")
+    parser.add_argument("--save-baseline", metavar="PATH", help="결과를 기준 JSON으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기준 JSON과 비교")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    print(f"Python {platform.python_version()} ({platform.system()}), 반복 {args.repeat}회")
+    results = run(args.sizes, names, args.repeat, args.seed)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+    if args.save_baseline:
+        write_json_atomic(args.save_baseline, {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results
+        })
+        print(f"\n기준 결과를 저장했습니다: {args.save_baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""화면 없이 퀴즈를 실행하는 명령줄 도구입니다 (tkinter를 불러오지 않음).
+
+사용 예:
+    python quiz_cli.py practice --min-wrong 1 --mode spaced
+    python quiz_cli.py grade answers.jsonl --show-wrong
+    python quiz_cli.py import words.csv --duplicates skip
+    python quiz_cli.py --deck 영단어 practice
+    python quiz_cli.py practice --decks 영단어 정처기
+    python quiz_cli.py export 오답노트.html --min-wrong 1
+    python quiz_cli.py convert quiz_data.json quiz_data.qbank --compression lzma
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from quiz_duplicates import DUPLICATE_POLICIES
+from quiz_engine import PRACTICE_MODES, QuizEngine, check_typo_distance
+from quiz_import import QuestionImporter
+from quiz_profiling import start_profiling
+from quiz_storage import convert_question_file
+
+
+def read_answers(path):
+    """답안 파일에서 (문제 ID, 답안) 쌍을 차례로 읽습니다.
+
+    .jsonl은 한 줄에 {"id": ..., "answer": ...} 하나, .json은 같은 형식의 배열,
+    .csv/.tsv는 id, answer 열이 있는 표를 받습니다.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["id"], record["answer"]
+    elif path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for record in json.load(f):
+                yield record["id"], record["answer"]
+    else:
+        delimiter = "\t" if path.endswith(".tsv") else ","
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f, delimiter=delimiter):
+                yield int(row["id"]), row["answer"]
+
+
+def print_summary(summary):
+    """세션/채점 결과 요약을 출력합니다."""
+    print(f"총 문제 수: {summary['total']}개 | 정답: {summary['correct']}개 | "
+          f"오답: {summary['wrong']}개 | 정답률: {summary['accuracy']:.1f}%")
+
+
+def run_practice(engine, args):
+    """터미널에서 연습 세션을 진행합니다."""
+    # 명령줄 옵션은 이번 실행에만 적용 (설정 파일은 그대로)
+    if args.min_wrong is not None:
+        engine.settings["min_wrong_count"] = args.min_wrong
+    if args.mode:
+        engine.settings["practice_mode"] = args.mode
+    if args.max_typo is not None:
+        engine.matcher.max_distance = args.max_typo
+
+    if not args.decks and not engine.count_filtered():
+        print(f"틀린 횟수가 {engine.settings['min_wrong_count']}회 이상인 문제가 없습니다.")
+        return 1
+
+    # 간격 반복 모드는 엔진이 복습 대기열에서 직접 고름
+    if args.decks:
+        session = engine.start_merged_session(args.decks)
+    elif engine.settings["practice_mode"] == "spaced":
+        session = engine.start_session()
+    else:
+        session = engine.start_session(engine.filtered_questions())
+    if not session.total:
+        print("지금 복습할 문제가 없습니다.")
+        return 0
+
+    while True:
+        question = engine.next_question()
+        if question is None:
+            break
+        print(f"\n[{session.drawn_count}/{session.total}] {question['question']}")
+        for field, label in (("image", "이미지"), ("audio", "소리")):
+            path = engine.media_path(question, field)
+            if path:
+                print(f"({label}: {path})")
+        try:
+            user_answer = input("답: ")
+        except EOFError:
+            print()
+            break
+        if engine.check_answer(user_answer):
+            print("✅ 정답입니다!")
+        else:
+            print(f"❌ 틀렸습니다! 정답: {question['answer'].strip()}")
+
+    print()
+    print_summary(session.summary())
+    return 0
+
+
+def run_grade(engine, args):
+    """답안 파일을 한꺼번에 채점합니다."""
+    if args.max_typo is not None:
+        engine.matcher.max_distance = args.max_typo
+    by_id = engine.questions_by_id()
+    pairs = []
+    unknown = 0
+    for question_id, user_answer in read_answers(args.answers):
+        question = by_id.get(question_id)
+        if question is None:
+            unknown += 1
+        else:
+            pairs.append((question, user_answer))
+
+    results = engine.grade_batch(pairs, record=not args.dry_run)
+
+    wrong = 0
+    for question, user_answer, correct in results:
+        if not correct:
+            wrong += 1
+            if args.show_wrong:
+                print(f"#{question['id']} {question['question']} | 입력: {user_answer} | 정답: {question['answer']}")
+
+    total = len(results)
+    print_summary({
+        "total": total,
+        "correct": total - wrong,
+        "wrong": wrong,
+        "accuracy": (total - wrong) / total * 100 if total else 0
+    })
+    if unknown:
+        print(f"알 수 없는 문제 ID: {unknown}개 (건너뜀)")
+    return 0
+
+
+def run_import(engine, args):
+    """CSV/TSV/JSONL 파일의 문제를 한꺼번에 추가합니다 (저장은 한 번)."""
+    importer = QuestionImporter(args.file).start()
+    questions = importer.wait()
+    for error in importer.errors:
+        print(f"건너뜀: {error}", file=sys.stderr)
+    duplicates = engine.count_import_duplicates(questions)
+    if args.dry_run:
+        print(f"읽은 문제: {len(questions)}개 (중복 {duplicates}개) | 건너뛴 줄: {len(importer.errors)}개 (저장하지 않음)")
+        return 0
+    result = engine.import_questions(questions, args.duplicates)
+    print(f"추가: {len(result['added'])}개 | 정답 합침: {len(result['merged'])}개 | "
+          f"중복 건너뜀: {result['skipped']}개 | 건너뛴 줄: {len(importer.errors)}개")
+    return 0
+
+
+def run_duplicates(engine, args):
+    """서로 중복인 문제 묶음을 출력합니다."""
+    groups = engine.find_duplicates()
+    for indices in groups:
+        print(" / ".join(f"#{engine.questions[i]['id']} {engine.questions[i]['question']}" for i in indices))
+    print(f"중복 묶음: {len(groups)}개")
+    return 0
+
+
+def run_decks(engine, args):
+    """덱 목록과 덱별 요약을 출력하거나 새 덱을 만듭니다 (요약은 덱 파일을 열지 않고 읽음)."""
+    if args.create:
+        engine.create_deck(args.create)
+        print(f"'{args.create.strip()}' 덱을 만들었습니다.")
+        return 0
+    for name in engine.deck_names():
+        summary = engine.deck_summary(name)
+        marker = "*" if name == engine.workspace.current else " "
+        if summary["count"] is None:
+            print(f"{marker} {name}")
+        else:
+            print(f"{marker} {name} | 문제 {summary['count']}개 | 틀린 문제 {summary['wrong_questions']}개 | "
+                  f"틀린 횟수 합계 {summary['total_wrong']}회")
+    return 0
+
+
+def run_export(engine, args):
+    """연습 대상 문제를 틀린 횟수가 많은 순서로 CSV/XLSX/HTML 파일로 내보냅니다."""
+    exporter = engine.exporter(args.file, args.min_wrong)
+    count = exporter.start().wait()
+    print(f"{count}개 문제를 내보냈습니다: {args.file}")
+    return 0
+
+
+def run_convert(args):
+    """JSON 문제 파일과 블록 압축 문제 은행 파일(.qbank)을 서로 바꿉니다."""
+    if os.path.exists(args.target):
+        print(f"이미 있는 파일입니다: {args.target}", file=sys.stderr)
+        return 1
+    try:
+        count = convert_question_file(args.source, args.target, args.compression)
+    except (ValueError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"{count}개 문제를 옮겼습니다: {args.source} -> {args.target} "
+          f"({os.path.getsize(args.source):,} -> {os.path.getsize(args.target):,} 바이트)")
+    return 0
+
+
+def typo_distance(text):
+    """--max-typo 값을 확인합니다 (0 이상의 정수만)."""
+    try:
+        return check_typo_distance(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="퀴즈마스터 명령줄 도구")
+    parser.add_argument("--data-dir", default=".", help="quiz_data.json 등이 있는 폴더")
+    parser.add_argument("--deck", help="사용할 덱 (기본은 마지막으로 쓴 덱)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    practice = commands.add_parser("practice", help="터미널에서 연습하기")
+    practice.add_argument("--min-wrong", type=int, help="틀린 횟수가 이 값 이상인 문제만 출제")
+    practice.add_argument("--mode", choices=sorted(PRACTICE_MODES),
+                          help="출제 방식 (기본은 설정 파일의 값)")
+    practice.add_argument("--max-typo", type=typo_distance, help="정답으로 인정할 오타 글자 수 (기본은 설정 파일의 값)")
+    practice.add_argument("--decks", nargs="+", help="여러 덱을 합쳐서 연습")
+    practice.set_defaults(handler=run_practice)
+
+    grade = commands.add_parser("grade", help="답안 파일 일괄 채점 (.jsonl/.json/.csv/.tsv)")
+    grade.add_argument("answers", help="답안 파일 경로")
+    grade.add_argument("--dry-run", action="store_true", help="틀린 횟수를 저장하지 않음")
+    grade.add_argument("--show-wrong", action="store_true", help="틀린 답안을 출력")
+    grade.add_argument("--max-typo", type=typo_distance, help="정답으로 인정할 오타 글자 수 (기본은 설정 파일의 값)")
+    grade.set_defaults(handler=run_grade)
+
+    import_parser = commands.add_parser("import", help="문제 파일 가져오기 (.csv/.tsv/.jsonl)")
+    import_parser.add_argument("file", help="문제 파일 경로 (question, answer 열 또는 필드)")
+    import_parser.add_argument("--dry-run", action="store_true", help="검증만 하고 저장하지 않음")
+    import_parser.add_argument("--duplicates", choices=sorted(DUPLICATE_POLICIES), default="merge",
+                               help="이미 있는 문제와 같은 문제 처리 (기본: merge, 다른 정답만 '/'로 추가)")
+    import_parser.set_defaults(handler=run_import)
+
+    duplicates = commands.add_parser("duplicates", help="서로 중복인 문제 찾기")
+    duplicates.set_defaults(handler=run_duplicates)
+
+    decks = commands.add_parser("decks", help="덱 목록과 요약 보기")
+    decks.add_argument("--create", metavar="NAME", help="새 덱 만들기")
+    decks.set_defaults(handler=run_decks)
+
+    export = commands.add_parser("export", help="오답노트 내보내기 (.csv/.xlsx/.html)")
+    export.add_argument("file", help="만들 파일 (확장자로 형식 결정)")
+    export.add_argument("--min-wrong", type=int, help="틀린 횟수가 이 값 이상인 문제만 (기본은 설정 파일의 값)")
+    export.set_defaults(handler=run_export)
+
+    convert = commands.add_parser("convert", help="JSON 파일과 문제 은행 파일(.qbank) 서로 바꾸기")
+    convert.add_argument("source", help="원본 파일 (.json 또는 .qbank, 남은 저널까지 반영)")
+    convert.add_argument("target", help="만들 파일 (확장자로 형식 결정)")
+    convert.add_argument("--compression", choices=("zlib", "lzma"), default="zlib",
+                         help="문제 은행 블록 압축 방식 (lzma는 더 작지만 느림)")
+    convert.set_defaults(handler=run_convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.handler is run_convert:
+        return run_convert(args)  # 파일 형식만 바꾸므로 데이터 폴더를 불러오지 않음
+    start_profiling(QuizEngine)  # QUIZ_PROFILE을 설정했을 때만 계측
+    engine = QuizEngine(args.data_dir,
+                        on_error=lambda e: print(f"저장 중 오류가 발생했습니다: {str(e)}", file=sys.stderr))
+    try:
+        engine.load()
+        if args.deck:
+            engine.open_deck(args.deck)
+            engine.release_unused_decks()
+        return args.handler(engine, args)
+    except (ValueError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
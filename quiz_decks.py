@@ -0,0 +1,197 @@
+import json
+import os
+import re
+from collections import OrderedDict
+
+from quiz_history import AnswerHistory
+from quiz_storage import open_question_store
+from quiz_undo import UndoHistory
+
+
+DEFAULT_DECK = "기본"  # 기존 quiz_data.json을 그대로 쓰는 덱
+MANIFEST_FILE = "quiz_decks.json"
+DECKS_DIR = "decks"
+MAX_DECK_NAME = 40
+
+
+def deck_directory_name(name):
+    """덱 이름으로 폴더 이름을 만듭니다 (파일 이름에 쓸 수 없는 문자는 _로)."""
+    return re.sub(r'[\\/:*?"<>|\s.]+', "_", name).strip("_") or "deck"
+
+
+class Deck:
+    """덱 하나의 문제 저장소, 답안 기록, 되돌리기 기록입니다.
+
+    덱마다 폴더 하나를 쓰고 그 안의 파일 이름(quiz_data.json 등)은 기존과
+    같으므로, 기본 덱은 데이터 폴더 자체를 그대로 씁니다.
+    """
+
+    def __init__(self, name, directory):
+        self.name = name
+        self.directory = directory
+        self.store = None
+        self.history = None
+        self.undo = UndoHistory()
+
+    def path(self, filename):
+        """덱 폴더 안의 파일 경로"""
+        return os.path.join(self.directory, filename)
+
+    def load(self, settings, persistence, on_changes=None):
+        """문제와 답안 기록 집계를 불러옵니다.
+
+        다른 인스턴스가 바꾼 문제를 반영하면 on_changes(덱, 바뀐 내용)를 부릅니다.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        store = open_question_store(
+            settings, persistence,
+            json_path=self.path("quiz_data.json"),
+            db_path=self.path("quiz_data.db"),
+            journal_path=self.path("quiz_data.journal"),
+            snapshot_path=self.path("quiz_data.snapshot"),
+            bank_path=self.path("quiz_data.qbank"))
+        store.load()
+        if on_changes is not None:
+            store.on_changes = lambda changes: on_changes(self, changes)
+        history = AnswerHistory(self.path("quiz_history.log"), self.path("quiz_history.json"), persistence)
+        history.load()
+        self.store = store
+        self.history = history
+        self.undo = UndoHistory(settings["undo_memory_mb"] * 1024 * 1024)
+
+    def summary(self):
+        """덱 목록에 적어 둘 문제 수와 틀린 횟수 요약 (표가 고쳐 가며 들고 있는 합계라 열을 훑지 않음)"""
+        questions = self.store.questions
+        return {
+            "count": len(questions),
+            "wrong_questions": questions.wrong_questions,
+            "total_wrong": questions.total_wrong
+        }
+
+    def close(self):
+        """답안 기록 집계 저장을 예약하고 저장소를 닫습니다."""
+        self.history.save_summary()
+        self.store.close()
+
+
+class DeckWorkspace:
+    """여러 덱과 덱 목록 파일(quiz_decks.json)을 관리합니다.
+
+    덱 목록에는 덱마다 폴더와 문제 수/틀린 문제 수/틀린 횟수 합계를 적어 두므로
+    덱 파일을 열지 않고도 요약을 보여 줄 수 있습니다. 덱의 문제는 처음 열 때만
+    불러오고, 열린 덱이 max_open개를 넘으면 가장 오래 쓰지 않은 덱부터 닫습니다
+    (현재 덱과 합친 세션에서 쓰는 덱은 닫지 않음).
+
+    open()은 저장을 예약하지 않으므로 작업 스레드에서 불러도 되고, 덱을 닫거나
+    덱 목록을 저장하는 release_unused()와 save_manifest()는 메인 스레드에서 부릅니다.
+    """
+
+    def __init__(self, data_dir, persistence, max_open=3):
+        self.data_dir = data_dir
+        self.persistence = persistence
+        self.max_open = max_open
+        self.manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+        self.entries = {}  # 덱 이름 -> {"dir", "count", "wrong_questions", "total_wrong"}
+        self.current = DEFAULT_DECK
+        self.loaded = OrderedDict()  # 덱 이름 -> Deck (마지막이 가장 최근에 쓴 덱)
+        self.pinned = set()  # 합친 세션에서 쓰고 있어 닫지 않을 덱
+        self.on_changes = None  # 다른 인스턴스가 덱의 문제를 바꿨을 때 부를 함수 (덱, 바뀐 내용)
+
+    def load_manifest(self):
+        """덱 목록을 불러옵니다 (없으면 기존 데이터 폴더를 기본 덱으로 씀)."""
+        self.entries = {DEFAULT_DECK: {"dir": ""}}
+        self.current = DEFAULT_DECK
+        if not os.path.exists(self.manifest_path):
+            return
+        # 덱 목록이 깨졌을 때 기본 덱만으로 덮어쓰면 다른 덱을 잃으므로 오류로 알림
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.entries = {entry.pop("name"): entry for entry in manifest["decks"]}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"덱 목록 파일({MANIFEST_FILE})을 읽을 수 없습니다: {str(e)}")
+        if manifest.get("current") in self.entries:
+            self.current = manifest["current"]
+
+    def names(self):
+        """덱 이름 목록 (만든 순서)"""
+        return list(self.entries)
+
+    def summary(self, name):
+        """덱 목록에 적힌 덱 요약 (열린 덱은 현재 값, 아직 모르면 count가 None)"""
+        deck = self.loaded.get(name)
+        if deck is not None:
+            return deck.summary()
+        entry = self.entries[name]
+        return {key: entry.get(key) for key in ("count", "wrong_questions", "total_wrong")}
+
+    def directory(self, name):
+        return os.path.join(self.data_dir, self.entries[name]["dir"])
+
+    def open(self, name, settings):
+        """덱을 엽니다 (이미 열려 있으면 그대로, 아니면 파일에서 불러옴)."""
+        if name not in self.entries:
+            raise ValueError(f"'{name}' 덱이 없습니다.")
+        deck = self.loaded.get(name)
+        if deck is None:
+            deck = Deck(name, self.directory(name))
+            deck.load(settings, self.persistence, self.on_changes)
+            self.loaded[name] = deck
+        self.loaded.move_to_end(name)
+        return deck
+
+    def release_unused(self):
+        """열린 덱이 max_open개를 넘으면 오래 쓰지 않은 덱부터 닫습니다."""
+        for name in list(self.loaded):
+            if len(self.loaded) <= self.max_open:
+                break
+            if name == self.current or name in self.pinned:
+                continue
+            deck = self.loaded.pop(name)
+            self.entries[name].update(deck.summary())
+            deck.close()
+        self.save_manifest()
+
+    def create(self, name):
+        """빈 덱을 새로 만듭니다."""
+        name = name.strip()
+        if not name:
+            raise ValueError("덱 이름을 입력해주세요.")
+        if len(name) > MAX_DECK_NAME:
+            raise ValueError(f"덱 이름은 {MAX_DECK_NAME}자 이하여야 합니다.")
+        if name in self.entries:
+            raise ValueError(f"'{name}' 덱이 이미 있습니다.")
+        used = {entry["dir"] for entry in self.entries.values()}
+        # 덱 목록에는 운영체제와 무관하게 /로 적음
+        base = f"{DECKS_DIR}/{deck_directory_name(name)}"
+        directory = base
+        suffix = 2
+        while directory in used or os.path.exists(os.path.join(self.data_dir, directory)):
+            directory = f"{base}-{suffix}"
+            suffix += 1
+        self.entries[name] = {"dir": directory, "count": 0, "wrong_questions": 0, "total_wrong": 0}
+        self.save_manifest()
+
+    def save_manifest(self):
+        """덱 목록 저장을 예약합니다 (열린 덱의 요약은 저장할 때 다시 셈)."""
+        self.persistence.request(self.manifest_path, self.manifest_snapshot)
+
+    def manifest_snapshot(self):
+        for name, deck in self.loaded.items():
+            self.entries[name].update(deck.summary())
+        return {
+            "current": self.current,
+            "decks": [dict({"name": name}, **entry) for name, entry in self.entries.items()]
+        }, None
+
+    def flush(self):
+        """열린 덱의 답안 기록 집계와 덱 목록 저장을 예약합니다."""
+        for deck in self.loaded.values():
+            deck.history.save_summary()
+        self.save_manifest()
+
+    def close(self):
+        """열린 덱의 저장소를 모두 닫습니다 (저장을 마친 뒤에 부름)."""
+        for deck in self.loaded.values():
+            deck.store.close()
+        self.loaded.clear()
@@ -0,0 +1,71 @@
+from quiz_matcher import normalize_answer, split_answers
+
+
+# 가져올 때 이미 있는 문제와 같은 문제를 처리하는 방법
+DUPLICATE_POLICIES = {
+    "add": "모두 추가",
+    "skip": "건너뛰기",
+    "merge": "기존 문제에 합치기"
+}
+
+
+def question_key(question_text):
+    """중복 판단에 쓰는 문제 키 (정답 채점과 같은 규칙: 띄어쓰기 무시, 소문자)"""
+    return normalize_answer(question_text)
+
+
+def merge_answer(existing_answer, new_answer):
+    """기존 정답에 없는 새 정답을 '/'로 덧붙인 문자열을 반환합니다 (이미 있으면 None)."""
+    accepted = {normalize_answer(a) for a in split_answers(existing_answer)}
+    if normalize_answer(new_answer) in accepted:
+        return None
+    return f"{existing_answer} / {new_answer}"
+
+
+class DuplicateIndex:
+    """정규화한 문제 텍스트로 문제를 찾는 해시 색인입니다.
+
+    추가/가져오기 때 같은 문제가 이미 있는지 O(1)에 확인합니다.
+    """
+
+    def __init__(self, questions=()):
+        self.by_key = {}  # 문제 키 -> {문제 ID: 문제}
+        self.keys = {}  # 문제 ID -> 문제 키
+        for question in questions:
+            self.add(question)
+
+    def add(self, question):
+        """문제를 색인에 추가합니다."""
+        key = question_key(question["question"])
+        self.keys[question["id"]] = key
+        self.by_key.setdefault(key, {})[question["id"]] = question
+
+    def remove(self, question_id):
+        """문제를 색인에서 뺍니다."""
+        key = self.keys.pop(question_id, None)
+        if key is None:
+            return
+        questions = self.by_key[key]
+        del questions[question_id]
+        if not questions:
+            del self.by_key[key]
+
+    def update(self, question):
+        """문제 텍스트가 바뀌었을 수 있으므로 키를 다시 계산합니다."""
+        self.remove(question["id"])
+        self.add(question)
+
+    def find(self, question_text, exclude_id=None):
+        """같은 문제로 보이는 문제 중 하나를 반환합니다 (없으면 None, exclude_id는 제외)."""
+        for question_id, question in self.by_key.get(question_key(question_text), {}).items():
+            if question_id != exclude_id:
+                return question
+        return None
+
+
+def find_duplicate_groups(questions):
+    """문제 목록에서 서로 중복인 문제 인덱스 묶음을 한 번의 순회로 찾습니다."""
+    groups = {}
+    for index, question in enumerate(questions):
+        groups.setdefault(question_key(question["question"]), []).append(index)
+    return [indices for indices in groups.values() if len(indices) > 1]
@@ -0,0 +1,819 @@
+import json
+import os
+import time
+from array import array
+from contextlib import contextmanager
+
+from quiz_export import QuestionExporter
+from quiz_duplicates import DUPLICATE_POLICIES, DuplicateIndex, find_duplicate_groups, merge_answer, question_key
+from quiz_batch import QuestionBatch
+from quiz_decks import DeckWorkspace
+from quiz_matcher import AnswerMatcher, normalize_answer
+from quiz_media import DEFAULT_MEDIA_CACHE_MB, MEDIA_FIELDS, attach_media
+from quiz_persistence import PersistenceService
+from quiz_search import SearchIndex
+from quiz_scheduler import QuestionScheduler, ReviewQueue, SpacedRepetitionScheduler, WeightedScheduler
+from quiz_undo import DEFAULT_UNDO_MEMORY_MB
+
+
+# 출제 방식과 화면에 표시할 이름
+PRACTICE_MODES = {
+    "random": "랜덤",
+    "sequential": "순차",
+    "spaced": "간격 반복",
+    "weighted": "오답 가중 랜덤"
+}
+
+SEARCH_INDEX_CHUNK = 500  # 검색 색인을 나눠 만들 때 한 번에 색인할 문제 수
+STORAGE_POLL_MS = 1000  # 다른 인스턴스의 변경을 확인하는 간격
+
+DEFAULT_SETTINGS = {
+    "min_wrong_count": 0,
+    "practice_mode": "random",
+    "random_mode": True,  # 이전 버전 설정 파일 호환용 (practice_mode == "random")
+    "current_question_index": 0,
+    "max_typo_distance": 0,  # 정답으로 인정할 오타 글자 수 (0이면 정확히 일치)
+    "max_open_decks": 3,  # 메모리에 함께 둘 덱 수 (넘으면 오래 쓰지 않은 덱을 닫음)
+    "undo_memory_mb": DEFAULT_UNDO_MEMORY_MB,  # 덱마다 되돌리기 기록에 쓸 메모리 상한
+    "media_cache_mb": DEFAULT_MEDIA_CACHE_MB,  # 디코딩한 첨부 이미지를 보관할 메모리 상한
+    "storage_backend": "json",  # "json", "sqlite" 또는 "bank" (블록 압축 문제 은행)
+    "bank_compression": "zlib"  # 문제 은행 블록 압축 방식 ("zlib" 또는 "lzma")
+}
+
+
+def check_typo_distance(value):
+    """오타 허용 글자 수를 0 이상의 정수로 확인합니다 (잘못되었으면 ValueError)."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("오타 허용 글자 수는 숫자로 입력해주세요.")
+    if value < 0:
+        raise ValueError("오타 허용 글자 수는 0 이상이어야 합니다.")
+    return value
+
+
+class PracticeSession:
+    """연습 세션 하나의 상태 (출제 순서, 현재 문제, 오답 수)"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.current_question = None
+        self.answered_count = 0  # 이번 세션에서 답안을 확인한 횟수
+        self.wrong_count = 0  # 이번 세션에서 틀린 문제 수
+        self.answer_checked = False
+        self.question_started = None  # 현재 문제를 꺼낸 시각 (응답 시간 측정용)
+        self.decks = None  # 여러 덱을 합친 세션이면 그 덱 목록
+
+    @property
+    def total(self):
+        """이번 세션의 총 문제 수"""
+        return self.scheduler.total
+
+    @property
+    def drawn_count(self):
+        """지금까지 출제된 문제 수"""
+        return self.scheduler.drawn_count
+
+    def summary(self):
+        """세션 결과 요약 (푼 문제 수, 정답, 오답, 정답률)
+
+        오답 가중 랜덤 모드는 틀린 문제가 다시 나오므로 세션의 문제 수가
+        아니라 실제로 답안을 확인한 횟수를 기준으로 합니다.
+        """
+        correct_count = self.answered_count - self.wrong_count
+        accuracy = (correct_count / self.answered_count) * 100 if self.answered_count > 0 else 0
+        return {
+            "total": self.answered_count,
+            "correct": correct_count,
+            "wrong": self.wrong_count,
+            "accuracy": accuracy
+        }
+
+
+class QuizEngine:
+    """화면과 무관한 퀴즈 핵심 로직입니다.
+
+    문제/설정 데이터, 연습 세션 상태, 저장을 모두 관리하며 tkinter를
+    사용하지 않으므로 GUI(QuizProgram)와 CLI(quiz_cli) 양쪽에서 사용합니다.
+    잘못된 입력은 사용자에게 보여줄 메시지를 담은 ValueError로 알립니다.
+
+    같은 데이터 폴더를 여는 다른 인스턴스가 있어도 되도록, 문제를 바꾸는 작업은
+    editing()으로 덱 저장소를 잠그고 그사이 다른 인스턴스의 변경을 먼저 반영한
+    뒤에 합니다. poll_storage()를 주기적으로 부르면 변경을 반영하고 on_storage_changed로 알립니다.
+    """
+
+    def __init__(self, data_dir=".", call_later=None, on_error=None):
+        self.data_dir = data_dir
+        self.settings_file = self.path("quiz_settings.json")
+        self.settings = dict(DEFAULT_SETTINGS)
+
+        # call_later(예: root.after)가 없으면 flush()/close() 때 한 번에 저장
+        self.call_later = call_later
+        self.persistence = PersistenceService(call_later, on_error=on_error)
+        self.workspace = DeckWorkspace(data_dir, self.persistence)
+        self.workspace.on_changes = self.storage_changed
+        self.on_storage_changed = None  # 다른 인스턴스의 변경을 반영한 뒤 부를 함수 (덱, 바뀐 내용)
+        self.deck = None  # 현재 덱 (문제 저장소와 답안 기록)
+        self.store = None
+        self.history = None
+        self.session = None
+        self.review_queue = None  # 간격 반복 모드를 처음 쓸 때 만듦
+        self.matcher = AnswerMatcher()
+        self.search_index = None  # 처음 검색할 때 만듦
+        self.duplicate_index = None  # 처음 중복을 확인할 때 만듦
+
+    def path(self, filename):
+        """데이터 디렉터리 안의 파일 경로를 반환합니다."""
+        return os.path.join(self.data_dir, filename)
+
+    @property
+    def questions(self):
+        """현재 불러온 문제 목록"""
+        return self.store.questions if self.store else []
+
+    # --- 설정 ---
+
+    def load_settings(self):
+        """설정 파일에서 설정값을 불러옵니다."""
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r', encoding='utf-8') as f:
+                    loaded_settings = json.load(f)
+                self.settings.update(loaded_settings)
+                # 출제 방식이 random_mode만 있던 이전 설정 파일
+                if "practice_mode" not in loaded_settings:
+                    self.settings["practice_mode"] = "random" if self.settings["random_mode"] else "sequential"
+        except Exception as e:
+            print(f"설정 로드 중 오류: {str(e)}")
+        try:
+            self.settings["max_typo_distance"] = check_typo_distance(self.settings["max_typo_distance"])
+        except ValueError as e:
+            print(f"설정 로드 중 오류: {str(e)} (오타를 허용하지 않음)")
+            self.settings["max_typo_distance"] = DEFAULT_SETTINGS["max_typo_distance"]
+        self.matcher.max_distance = self.settings["max_typo_distance"]
+        self.workspace.max_open = self.count_setting("max_open_decks", 1)
+
+    def count_setting(self, key, minimum):
+        """설정 파일에서 읽은 key 값을 minimum 이상의 정수로 확인합니다.
+
+        손으로 고치다 잘못 적은 값이면 기본값으로 되돌리므로(다음 저장 때 고쳐짐)
+        시작이 막히지 않습니다.
+        """
+        value = self.settings[key]
+        if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+            print(f"설정 로드 중 오류: {key} 값이 잘못되어 기본값({DEFAULT_SETTINGS[key]})을 사용합니다: {value!r}")
+            value = self.settings[key] = DEFAULT_SETTINGS[key]
+        return value
+
+    def save_settings(self):
+        """설정값 저장을 예약합니다."""
+        self.persistence.request(self.settings_file, lambda: (dict(self.settings), None))
+
+    def update_settings(self, min_wrong_count, practice_mode, max_typo_distance=None):
+        """연습 설정을 검증한 뒤 반영하고 저장합니다."""
+        try:
+            min_wrong_count = int(min_wrong_count)
+        except ValueError:
+            raise ValueError("틀린 횟수는 숫자로 입력해주세요.")
+        if min_wrong_count < 0:
+            raise ValueError("틀린 횟수는 0 이상이어야 합니다.")
+        if practice_mode not in PRACTICE_MODES:
+            raise ValueError("알 수 없는 출제 방식입니다.")
+        if max_typo_distance is None:
+            max_typo_distance = self.settings["max_typo_distance"]
+        max_typo_distance = check_typo_distance(max_typo_distance)
+
+        self.settings["min_wrong_count"] = min_wrong_count
+        self.settings["practice_mode"] = practice_mode
+        self.settings["random_mode"] = practice_mode == "random"
+        self.settings["max_typo_distance"] = max_typo_distance
+        self.matcher.max_distance = max_typo_distance
+        self.save_settings()
+
+    # --- 문제 데이터 ---
+
+    def load_data(self):
+        """현재 덱의 문제 데이터와 답안 기록을 설정된 저장소(JSON 또는 SQLite)에서 불러옵니다.
+
+        이미 열려 있는 덱이면 파일을 다시 읽지 않습니다.
+        """
+        self.review_queue = None
+        self.search_index = None
+        self.duplicate_index = None
+        self.matcher.clear()
+        self.deck = self.workspace.open(self.workspace.current, self.settings)
+        self.store = self.deck.store
+        self.history = self.deck.history
+        return self.store.questions
+
+    def load(self):
+        """설정, 덱 목록, 현재 덱을 차례로 불러옵니다 (저장 방식이 설정에 있음)."""
+        self.load_settings()
+        self.workspace.load_manifest()
+        return self.load_data()
+
+    # --- 덱 ---
+
+    def deck_names(self):
+        """덱 이름 목록"""
+        return self.workspace.names()
+
+    def deck_summary(self, name):
+        """덱 목록 파일에 적힌 덱 요약 (덱 파일을 열지 않음)"""
+        return self.workspace.summary(name)
+
+    def create_deck(self, name):
+        """빈 덱을 만듭니다."""
+        self.workspace.create(name)
+
+    def open_deck(self, name):
+        """다른 덱으로 바꿉니다 (처음 여는 덱이면 불러옴, 작업 스레드에서 불러도 됨).
+
+        다 바꾼 뒤 메인 스레드에서 release_unused_decks()를 불러야 합니다.
+        """
+        if name not in self.workspace.entries:
+            raise ValueError(f"'{name}' 덱이 없습니다.")
+        if self.session:
+            self.session.scheduler.release()
+            self.session = None
+        self.workspace.pinned = set()
+        previous, self.workspace.current = self.workspace.current, name
+        try:
+            return self.load_data()
+        except Exception:
+            # 불러오지 못했으면 이전 덱을 계속 씀
+            self.workspace.current = previous
+            self.load_data()
+            raise
+
+    def release_unused_decks(self):
+        """너무 많이 열린 덱을 닫고 덱 목록(현재 덱과 요약)을 저장합니다."""
+        self.workspace.release_unused()
+
+    def decks_changed(self):
+        """문제 수나 틀린 횟수가 바뀌었으니 덱 목록의 요약 저장을 예약합니다."""
+        self.workspace.save_manifest()
+
+    @contextmanager
+    def editing(self, deck=None):
+        """덱(기본은 현재 덱) 저장소를 잠그고 다른 인스턴스의 변경을 먼저 반영한 채로 편집합니다.
+
+        잠근 동안 읽고 고치고 기록하므로 인스턴스마다 같은 순서로 변경이 쌓이고,
+        틀린 횟수처럼 이전 값에 더하는 변경도 서로 덮어쓰지 않습니다.
+        """
+        deck = deck or self.deck
+        with deck.store.lock:
+            deck.store.pull_changes()
+            yield deck
+
+    def storage_changed(self, deck, changes):
+        """다른 인스턴스가 바꾼 문제를 반영한 뒤 색인을 고치고 화면에 알립니다."""
+        if deck is self.deck:
+            questions = self.questions
+            for question_id in changes["deleted_ids"]:
+                self.matcher.invalidate(question_id)
+                if self.review_queue is not None:
+                    self.review_queue.remove(question_id)
+                if self.search_index is not None:
+                    self.search_index.remove(question_id)
+                if self.duplicate_index is not None:
+                    self.duplicate_index.remove(question_id)
+            for question in questions.rows_at(questions.positions_of_ids(changes["updated"])):
+                self.matcher.invalidate(question["id"])
+                if self.review_queue is not None:
+                    self.review_queue.push(question)
+                if self.search_index is not None:
+                    self.search_index.update(question)
+                if self.duplicate_index is not None:
+                    self.duplicate_index.update(question)
+            for question in questions.rows_at(changes["added"]):
+                if self.review_queue is not None:
+                    self.review_queue.push(question)
+                if self.search_index is not None:
+                    self.search_index.add(question)
+                if self.duplicate_index is not None:
+                    self.duplicate_index.add(question)
+        self.decks_changed()
+        if self.on_storage_changed is not None:
+            self.on_storage_changed(deck, changes)
+
+    def poll_storage(self):
+        """열린 덱의 문제와 답안 기록에서 다른 인스턴스의 변경을 반영합니다.
+
+        STORAGE_POLL_MS마다 불러 주면 되며, 바뀐 것이 없으면 파일 상태만 확인합니다.
+        """
+        for deck in list(self.workspace.loaded.values()):
+            try:
+                deck.store.pull_changes()
+                deck.history.catch_up()
+            except (OSError, ValueError):
+                pass  # 다른 인스턴스가 파일을 쓰는 중이면 다음 확인 때 다시 읽음
+
+    def deck_of(self, question):
+        """문제가 속한 덱 (합친 세션이면 해당 덱, 아니면 현재 덱)"""
+        decks = self.session.decks if self.session else None
+        if decks:
+            for deck in decks:
+                if question.table is deck.store.questions:
+                    return deck
+        return self.deck
+
+    @staticmethod
+    def validate_question(question_text, answer_text):
+        """문제와 정답이 모두 입력되었는지 확인합니다."""
+        if not question_text or not answer_text:
+            raise ValueError("문제와 정답을 모두 입력해주세요.")
+
+    def media_fields(self, media):
+        """{필드: 파일 경로}를 덱의 media 폴더에 복사하고 문제에 적을 필드로 바꿉니다.
+
+        경로가 비어 있으면 그 첨부 파일을 뺀다는 뜻으로 None을 둡니다.
+        """
+        fields = {}
+        for field, path in (media or {}).items():
+            if field not in MEDIA_FIELDS:
+                raise ValueError(f"알 수 없는 첨부 파일 종류입니다: {field}")
+            fields[field] = attach_media(self.deck.directory, field, self.deck.path(path)) if path else None
+        return fields
+
+    def media_path(self, question, field):
+        """문제에 첨부된 파일(field: "image" 또는 "audio")의 전체 경로. 없으면 None"""
+        name = question.get(field)
+        if not name:
+            return None
+        return self.deck_of(question).path(name)
+
+    def add_question(self, question_text, answer_text, media=None):
+        """새 문제를 추가하고 추가된 문제를 반환합니다 (media는 {필드: 첨부할 파일 경로})."""
+        self.validate_question(question_text, answer_text)
+        extra = {field: name for field, name in self.media_fields(media).items() if name}
+        with self.editing():
+            question = self.store.add(question_text, answer_text, extra)
+        if self.review_queue is not None:
+            self.review_queue.push(question)
+        if self.search_index is not None:
+            self.search_index.add(question)
+        if self.duplicate_index is not None:
+            self.duplicate_index.add(question)
+        self.deck.undo.record("문제 추가", QuestionBatch().delete((question["id"],)))
+        self.decks_changed()
+        return question
+
+    def duplicates(self):
+        """중복 확인용 색인 (처음 쓸 때 한 번 만듦)"""
+        if self.duplicate_index is None:
+            self.duplicate_index = DuplicateIndex(self.questions)
+        return self.duplicate_index
+
+    def find_duplicate(self, question_text, exclude_id=None):
+        """같은 문제(띄어쓰기/대소문자 무시)가 이미 있으면 그 문제를, 없으면 None을 반환합니다."""
+        return self.duplicates().find(question_text, exclude_id)
+
+    def find_duplicates(self):
+        """전체 문제에서 서로 중복인 문제 인덱스 묶음을 찾습니다."""
+        return find_duplicate_groups(self.questions)
+
+    def count_import_duplicates(self, questions):
+        """가져올 문제 중 이미 있는 문제나 앞 줄과 중복인 문제 수"""
+        index = self.duplicates()
+        seen = set()
+        count = 0
+        for question in questions:
+            key = question_key(question["question"])
+            if key in seen or key in index.by_key:
+                count += 1
+            seen.add(key)
+        return count
+
+    def import_questions(self, questions, on_duplicate="add"):
+        """검증된 문제 목록(quiz_import.normalize_row 결과)을 한꺼번에 추가합니다.
+
+        on_duplicate가 "skip"이면 이미 있는 문제(또는 파일 안에서 앞서 나온
+        문제)와 같은 문제를 건너뛰고, "merge"면 다른 정답만 '/'로 덧붙입니다.
+        저장은 한 번만 예약하며 {"added", "merged", "skipped"} 결과를 반환합니다.
+        """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError("알 수 없는 중복 처리 방식입니다.")
+        # 중복 확인과 추가 사이에 다른 인스턴스가 끼어들지 않도록 잠근 채로 함
+        with self.editing():
+            merged = []
+            skipped = 0
+            batch = QuestionBatch()
+            if on_duplicate != "add":
+                index = self.duplicates()
+                new_by_key = {}
+                unique = []
+                for question in questions:
+                    key = question_key(question["question"])
+                    existing = next(iter(index.by_key.get(key, {}).values()), None)
+                    target = existing or new_by_key.get(key)
+                    if target is None:
+                        new_by_key[key] = question
+                        unique.append(question)
+                        continue
+                    if existing is not None:
+                        # 기존 문제의 정답은 batch에 모았다가 추가와 함께 한 번에 고침
+                        current = batch.fields.get(existing["id"], existing)["answer"]
+                    else:
+                        current = target["answer"]
+                    answer = merge_answer(current, question["answer"]) if on_duplicate == "merge" else None
+                    if answer is None:
+                        skipped += 1
+                        continue
+                    if existing is None:
+                        target["answer"] = answer
+                        continue
+                    if existing["id"] not in batch.fields:
+                        merged.append(existing)
+                    batch.set_fields(existing["id"], {"answer": answer})
+                questions = unique
+            # 합친 정답과 새 문제를 한 번에 기록 (되돌리기도 한 단계)
+            result, inverse = self.apply_changes(batch.add(questions))
+        if inverse:
+            self.deck.undo.record("가져오기", inverse)
+        return {"added": result["added"], "merged": merged, "skipped": skipped}
+
+    def update_question(self, index, question_text, answer_text, media=None):
+        """index번째 문제의 문제/정답(과 media의 첨부 파일)을 수정합니다.
+
+        media는 바꿀 첨부 파일만 {필드: 파일 경로}로 주며, 빈 경로는 첨부 파일을 뺍니다.
+        """
+        self.validate_question(question_text, answer_text)
+        fields = {"question": question_text, "answer": answer_text}
+        fields.update(self.media_fields(media))
+        result = self.apply_batch(QuestionBatch().set_fields(self.questions.ids[index], fields), "문제 수정")
+        if not result["updated"]:
+            raise ValueError("다른 창에서 삭제된 문제입니다.")
+
+    def delete_questions(self, indices):
+        """여러 문제를 삭제합니다."""
+        ids = self.questions.ids
+        return self.apply_batch(QuestionBatch().delete(ids[index] for index in indices), "삭제")
+
+    def apply_batch(self, batch, label="일괄 변경"):
+        """QuestionBatch의 변경을 한 번에 적용하고 저장을 한 번만 합니다.
+
+        되돌리기 기록에는 label이라는 이름으로 이 작업을 되돌리는 일괄 작업을
+        남깁니다. {"deleted": 삭제된 문제의 (삭제 전) 인덱스 목록, "updated":
+        바뀐 문제 수, "restored": 되살린 문제의 인덱스 목록, "added": 추가된 행 목록}을
+        반환합니다.
+        """
+        with self.editing():
+            result, inverse = self.apply_changes(batch)
+        if inverse:
+            self.deck.undo.record(label, inverse)
+        return result
+
+    def apply_changes(self, batch):
+        """batch를 적용하고 (결과, 이 변경을 되돌리는 QuestionBatch)를 반환합니다.
+
+        ID 열을 한 번 훑어 대상 행을 찾은 뒤 그 행들만 고치고, 삭제와
+        되살리기, 새 문제 추가는 표에서 한 번에 처리해 저장소에 한 번만 기록합니다. 되돌리기용으로는 바뀐 필드의
+        이전 값과 삭제한 행만 떼어 둡니다.
+        """
+        inverse = QuestionBatch()
+        if not batch:
+            return {"deleted": [], "updated": 0, "restored": [], "added": []}, inverse
+        questions = self.questions
+        ids = questions.ids
+        wrong_counts = questions.wrong_counts
+        new_wrong_counts = dict(zip(batch.wrong_count_ids, batch.wrong_count_values))
+        old_wrong_counts = []  # (문제 ID, 바뀌기 전 틀린 횟수)
+        deleted = []
+        changed = []
+        extra_changed = []  # 기본 열 외의 필드(첨부 파일 등)가 바뀐 행
+        target_ids = batch.question_ids()
+        for position in questions.positions_of_ids(target_ids) if target_ids else ():
+            question_id = ids[position]
+            if question_id in batch.deletes:
+                # 지울 행은 뷰를 만들지 않음 (만든 뷰는 삭제할 때 값을 따로 떼어 보관해야 함)
+                deleted.append(position)
+                self.matcher.invalidate(question_id)
+                if self.review_queue is not None:
+                    self.review_queue.remove(question_id)
+                if self.search_index is not None:
+                    self.search_index.remove(question_id)
+                if self.duplicate_index is not None:
+                    self.duplicate_index.remove(question_id)
+                continue
+            wrong_count = wrong_counts[position]
+            fields = batch.fields.get(question_id)
+            if fields:
+                question = questions[position]
+                # 틀린 횟수는 아래에서 따로 되돌리므로 나머지 필드의 이전 값만 둠
+                inverse.set_fields(question_id, {key: question.get(key) for key in fields if key != "wrong_count"})
+                question.update(fields)
+                if any(key not in questions.columns for key in fields):
+                    # 값이 None인 필드는 없는 필드로 되돌림 (첨부 파일 빼기, 추가 되돌리기)
+                    extra = questions.extras[position]
+                    for key, value in fields.items():
+                        if value is None and key not in questions.columns:
+                            extra.pop(key, None)
+                    questions.extras[position] = extra or None
+                    extra_changed.append(position)
+                if "answer" in fields:
+                    self.matcher.invalidate(question_id)
+                if self.search_index is not None and ("question" in fields or "answer" in fields):
+                    self.search_index.update(question)
+                if self.duplicate_index is not None and "question" in fields:
+                    self.duplicate_index.update(question)
+            # 틀린 횟수만 바뀌는 행은 뷰를 만들지 않고 열을 바로 고침
+            new_wrong_count = wrong_counts[position]
+            if question_id in new_wrong_counts:
+                new_wrong_count = new_wrong_counts[question_id]
+            if question_id in batch.resets:
+                new_wrong_count = 0
+            if question_id in batch.wrong_deltas:
+                new_wrong_count = max(0, new_wrong_count + batch.wrong_deltas[question_id])
+            questions.set_wrong_count(position, new_wrong_count)
+            if new_wrong_count != wrong_count:
+                old_wrong_counts.append((question_id, wrong_count))
+            changed.append(position)
+        if old_wrong_counts:
+            inverse.set_wrong_counts(*zip(*old_wrong_counts))
+        inverse.restore(questions.take(deleted))
+        restored = sorted(batch.restores)
+        added = self.store.commit_batch(changed, deleted, restored, extra_changed, batch.additions)
+        for record in restored:
+            question = questions[record[0]]
+            if self.review_queue is not None:
+                self.review_queue.push(question)
+            if self.search_index is not None:
+                self.search_index.add(question)
+            if self.duplicate_index is not None:
+                self.duplicate_index.add(question)
+        inverse.delete(record[1] for record in restored)
+        for question in added:
+            if self.review_queue is not None:
+                self.review_queue.push(question)
+            if self.duplicate_index is not None:
+                self.duplicate_index.add(question)
+        if self.search_index is not None and added:
+            # 많이 가져와도 화면이 멈추지 않도록 처음 색인할 때처럼 나눠서 색인
+            self.search_index.add_later(added)
+            self.continue_search_indexing()
+        inverse.delete(question["id"] for question in added)
+        self.decks_changed()
+        result = {"deleted": deleted, "updated": len(changed), "restored": [record[0] for record in restored],
+                  "added": added}
+        return result, inverse
+
+    def undo(self):
+        """마지막 편집을 되돌리고 (작업 이름, apply_batch() 결과)를 반환합니다."""
+        history = self.deck.undo
+        if history.undo_label() is None:
+            raise ValueError("되돌릴 작업이 없습니다.")
+        label, batch = history.pop_undo()
+        with self.editing():
+            result, inverse = self.apply_changes(batch)
+        history.push_redo(label, inverse)
+        return label, result
+
+    def redo(self):
+        """되돌린 편집을 다시 실행하고 (작업 이름, apply_batch() 결과)를 반환합니다."""
+        history = self.deck.undo
+        if history.redo_label() is None:
+            raise ValueError("다시 실행할 작업이 없습니다.")
+        label, batch = history.pop_redo()
+        with self.editing():
+            result, inverse = self.apply_changes(batch)
+        history.push_undo(label, inverse)
+        return label, result
+
+    def reset_wrong_counts(self):
+        """모든 문제의 틀린 횟수를 초기화합니다."""
+        with self.editing():
+            # 되돌리기용으로 틀린 횟수가 있던 문제의 ID와 값만 열 단위로 떼어 둠
+            questions = self.questions
+            positions = questions.positions_at_least(1)
+            inverse = QuestionBatch().set_wrong_counts(
+                array('I', map(questions.ids.__getitem__, positions)),
+                array('I', map(questions.wrong_counts.__getitem__, positions)))
+            self.store.reset_wrong_counts()
+        if inverse:
+            self.deck.undo.record("틀린 횟수 초기화", inverse)
+        self.decks_changed()
+
+    def count_filtered(self):
+        """현재 필터(틀린 횟수 ≥ min_wrong_count)에 맞는 문제 수"""
+        return self.store.count_by_wrong_count(self.settings["min_wrong_count"])
+
+    def filtered_questions(self):
+        """현재 필터에 맞는 문제 목록"""
+        return self.store.filter_by_wrong_count(self.settings["min_wrong_count"])
+
+    def exporter(self, path, min_wrong_count=None):
+        """현재 덱의 문제를 path(.csv/.xlsx/.html)로 내보낼 QuestionExporter를 만듭니다.
+
+        연습과 같은 필터(틀린 횟수 ≥ min_wrong_count, 기본은 설정 값)로 틀린 횟수가
+        많은 순서로 쓰며, 작업 스레드는 호출 측이 start()로 시작합니다.
+        """
+        if min_wrong_count is None:
+            min_wrong_count = self.settings["min_wrong_count"]
+        return QuestionExporter(self.questions, path, min_wrong_count, self.workspace.current, self.deck.directory)
+
+    def build_search_index(self):
+        """검색 색인을 만듭니다.
+
+        call_later가 있으면 화면이 멈추지 않도록 SEARCH_INDEX_CHUNK개씩 나눠서
+        만들고, 다 만들기 전의 검색은 남은 문제를 직접 확인합니다.
+        """
+        self.search_index = SearchIndex(self.questions)
+        self.continue_search_indexing()
+
+    def continue_search_indexing(self):
+        """아직 색인하지 않은 문제를 색인합니다 (call_later가 있으면 나눠서)."""
+        if self.call_later is None:
+            self.search_index.index_pending()
+        else:
+            self.index_search_step(self.search_index)
+
+    def index_search_step(self, index):
+        """검색 색인을 한 묶음 만들고 남았으면 다음 묶음을 예약합니다."""
+        # 그사이 데이터를 다시 불러와 색인이 바뀌었으면 중단
+        if index is self.search_index and not index.index_pending(SEARCH_INDEX_CHUNK):
+            self.call_later(1, lambda: self.index_search_step(index))
+
+    def search(self, query):
+        """문제나 정답에 검색어가 들어 있는 문제의 인덱스를 목록 순서대로 반환합니다.
+
+        검색어가 비어 있으면 None(전체 목록)을 반환합니다.
+        """
+        if not query.strip():
+            return None
+        if self.search_index is None:
+            self.build_search_index()
+        matched = self.search_index.search(query)
+        if not matched:
+            return []
+        return self.questions.positions_of_ids(matched)
+
+    def questions_by_id(self):
+        """문제 ID로 문제를 찾는 사전을 만듭니다."""
+        return {q["id"]: q for q in self.questions}
+
+    # --- 연습 세션 ---
+
+    def start_session(self, questions=None):
+        """연습 세션을 시작합니다. questions가 없으면 전체 문제로 진행합니다.
+
+        간격 반복 모드는 전체 문제의 복습 대기열에서 현재 필터에 맞고 지금
+        복습할 때가 된 문제만 꺼내므로 questions를 쓰지 않습니다.
+        """
+        # 중간에 끝난 이전 세션의 문제를 대기열에 돌려놓음
+        if self.session:
+            self.session.scheduler.release()
+
+        mode = self.settings["practice_mode"]
+        if mode == "spaced":
+            if self.review_queue is None:
+                self.review_queue = ReviewQueue(self.questions)
+            min_wrong_count = self.settings["min_wrong_count"]
+            scheduler = SpacedRepetitionScheduler(
+                self.review_queue, lambda q: q["wrong_count"] >= min_wrong_count)
+        else:
+            if questions is None:
+                questions = self.questions
+            if mode == "weighted":
+                scheduler = WeightedScheduler(questions)
+            else:
+                scheduler = QuestionScheduler(questions, mode == "random")
+
+        # 순차 모드일 때 인덱스 초기화
+        if mode == "sequential":
+            self.settings["current_question_index"] = 0
+
+        self.session = PracticeSession(scheduler)
+        self.workspace.pinned = set()
+        return self.session
+
+    def start_merged_session(self, deck_names):
+        """여러 덱의 문제를 합쳐 연습 세션을 시작합니다 (각 덱에서 현재 필터에 맞는 문제).
+
+        열려 있지 않은 덱은 불러오며, 세션 동안은 그 덱들을 닫지 않습니다.
+        """
+        if not deck_names:
+            raise ValueError("연습할 덱을 선택해주세요.")
+        if self.settings["practice_mode"] == "spaced":
+            raise ValueError("간격 반복 모드에서는 덱을 합쳐 연습할 수 없습니다.")
+        # 불러오는 동안 앞서 연 덱이 닫히지 않도록 먼저 고정
+        self.workspace.pinned = set(deck_names)
+        decks = [self.workspace.open(name, self.settings) for name in deck_names]
+        questions = []
+        for deck in decks:
+            questions.extend(deck.store.filter_by_wrong_count(self.settings["min_wrong_count"]))
+        session = self.start_session(questions)
+        session.decks = decks
+        self.workspace.pinned = set(deck_names)
+        self.workspace.release_unused()
+        return session
+
+    def next_review_time(self):
+        """간격 반복 모드에서 가장 이른 복습 예정 시각 (없으면 None)"""
+        return self.review_queue.next_due() if self.review_queue is not None else None
+
+    def next_question(self):
+        """다음 문제를 꺼냅니다. 모든 문제를 풀었으면 None을 반환합니다."""
+        session = self.session
+        if session is None or not session.scheduler.has_next():
+            return None
+        session.current_question = session.scheduler.draw()
+        session.answer_checked = False
+        session.question_started = time.monotonic()
+        return session.current_question
+
+    def upcoming_question(self):
+        """다음에 나올 문제 (첨부 파일을 미리 읽어 두는 용도). 없으면 None"""
+        session = self.session
+        if session is None or not session.scheduler.has_next():
+            return None
+        return session.scheduler.peek()
+
+    def grade(self, question, user_answer):
+        """띄어쓰기와 대소문자를 무시하고 답안을 채점합니다.
+
+        '/'로 구분된 여러 정답을 인정하고, 설정에 따라 오타도 허용합니다.
+        """
+        return self.matcher.match(question, user_answer)
+
+    def check_answer(self, user_answer):
+        """현재 문제의 답안을 확인합니다.
+
+        이미 확인한 문제면 None, 아니면 정답 여부를 반환하고 오답이면
+        틀린 횟수를 늘려 저장합니다.
+        """
+        session = self.session
+        if session is None or session.current_question is None or session.answer_checked:
+            return None
+
+        question = session.current_question
+        deck = self.deck_of(question)
+        correct = self.grade(question, user_answer)
+        session.answer_checked = True
+        session.answered_count += 1
+        # 다른 인스턴스가 늘린 틀린 횟수를 먼저 반영한 뒤 더함
+        with self.editing(deck):
+            if not correct:
+                question["wrong_count"] += 1
+                session.wrong_count += 1
+            # 간격 반복 모드는 맞혀도 다음 복습 시각이 바뀌므로 저장
+            rescheduled = session.scheduler.record(question, correct)
+            if not correct or rescheduled:
+                deck.store.record_answer(question)
+        if not correct or rescheduled:
+            self.decks_changed()
+        deck.history.record(question["id"], correct, time.monotonic() - session.question_started)
+        return correct
+
+    def grade_batch(self, answers, record=True):
+        """(문제, 답안) 쌍을 한꺼번에 채점하고 결과를 (문제, 답안, 정답 여부)로 반환합니다.
+
+        오답으로 늘어난 틀린 횟수는 마지막에 한 번만 저장합니다.
+        """
+        results = []
+        wrong_questions = []
+        with self.editing():
+            for question, user_answer in answers:
+                correct = self.grade(question, user_answer)
+                if not correct and record:
+                    question["wrong_count"] += 1
+                    wrong_questions.append(question)
+                results.append((question, user_answer, correct))
+            if wrong_questions:
+                self.store.record_answers(wrong_questions)
+        if wrong_questions:
+            self.decks_changed()
+        return results
+
+    # --- 결과 분석 ---
+
+    def analytics(self, days=30, limit=20):
+        """누적된 집계로 결과 분석을 만듭니다 (답안 기록 파일을 다시 읽지 않음).
+
+        {"totals": 전체 요약, "daily": 최근 날짜별 (날짜, 시도, 정답률),
+         "hardest": 정답률이 낮은 문제의 (문제, 시도, 정답률, 평균 응답 시간)}
+        """
+        # 삭제된 문제의 기록은 빼고, 고른 문제만 ID 열에서 찾음
+        hardest_ids = self.history.hardest(limit, accept=set(self.questions.ids).__contains__)
+        positions = self.questions.positions_of_ids(set(hardest_ids))
+        by_id = {q["id"]: q for q in self.questions.rows_at(positions)}
+        return {
+            "totals": self.history.totals(),
+            "daily": self.history.daily(days),
+            "hardest": [(by_id[question_id],) + self.history.question_stats(question_id)
+                        for question_id in hardest_ids]
+        }
+
+    # --- 종료 ---
+
+    def flush(self):
+        """예약된 저장을 모두 기록합니다."""
+        self.workspace.flush()
+        self.persistence.flush()
+
+    def close(self):
+        """남은 저장을 모두 마치고 열린 덱의 저장소를 닫습니다."""
+        if self.deck is not None:
+            self.workspace.flush()
+        self.persistence.close()
+        self.workspace.close()
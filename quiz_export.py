@@ -0,0 +1,306 @@
+import csv
+import html
+import itertools
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from array import array
+from pathlib import Path
+
+from quiz_persistence import copy_file_mode
+
+
+EXPORT_CHUNK = 1000  # 한 번에 파일에 쓰는 행 수 (진행 상황도 이만큼마다 갱신)
+
+# 확장자 -> 형식
+EXPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx", ".html": "html", ".htm": "html"}
+
+EXPORT_HEADER = ("ID", "문제", "정답", "틀린 횟수", "그림", "소리")  # 가져오기 머리글과 같은 이름
+
+XLSX_CELL_LIMIT = 32767  # 엑셀 셀 하나에 넣을 수 있는 글자 수
+
+# XML 1.0에 넣을 수 없는 제어 문자
+XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def export_format(path):
+    """확장자로 내보낼 형식을 정합니다."""
+    fmt = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError("내보낼 파일은 .csv, .xlsx, .html 중 하나로 저장해주세요.")
+    return fmt
+
+
+def wrong_count_order(wrong_counts, min_wrong_count):
+    """틀린 횟수 ≥ min_wrong_count인 행 위치를 틀린 횟수가 많은 순서로 하나씩 내놓습니다.
+
+    열을 한 번만 훑어 틀린 횟수 값마다 위치를 array('I')에 모은 뒤 값이 큰
+    순서로 내놓으므로(같은 값끼리는 원래 순서) 내보낼 행마다 4바이트만 더 씁니다.
+    """
+    buckets = {}  # 틀린 횟수 -> 행 위치 배열
+    for position in itertools.compress(range(len(wrong_counts)), map(min_wrong_count.__le__, wrong_counts)):
+        count = wrong_counts[position]
+        bucket = buckets.get(count)
+        if bucket is None:
+            bucket = buckets[count] = array('I')
+        bucket.append(position)
+    for count in sorted(buckets, reverse=True):
+        yield from buckets.pop(count)
+
+
+class QuestionExporter:
+    """문제를 CSV/XLSX/HTML(오답노트) 파일로 작업 스레드에서 내보냅니다.
+
+    만들 때(메인 스레드) 문제 표의 열을 얕게 복사해 두므로 내보내는 동안
+    문제를 고쳐도 섞이지 않습니다. 작업 스레드는 틀린 횟수가 많은 순서로 행을
+    하나씩 꺼내 EXPORT_CHUNK개씩 임시 파일에 쓰고, 끝나면 파일을 교체합니다
+    (중간에 취소하거나 실패하면 기존 파일은 그대로). 진행 상황은
+    QuestionImporter처럼 속성으로 공개합니다.
+    """
+
+    def __init__(self, questions, path, min_wrong_count=0, title="", media_directory=None):
+        self.path = path
+        self.format = export_format(path)
+        self.min_wrong_count = min_wrong_count
+        self.title = title
+        self.media_directory = media_directory  # 첨부 파일 경로의 기준 폴더 (HTML 그림용)
+        # 열 단위 표(QuestionTable)의 열을 얕게 복사 (문자열 자체는 공유)
+        self.ids = array('I', questions.ids)
+        self.wrong_counts = array('I', questions.wrong_counts)
+        self.texts = list(questions.texts)
+        self.answers = list(questions.answers)
+        self.extras = list(questions.extras)
+        self.total = questions.count_at_least(min_wrong_count)
+        self.rows_written = 0
+        self.fraction = 0.0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """작업 스레드를 시작합니다."""
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """내보내기를 중단합니다 (쓰던 파일은 지움)."""
+        self.cancelled = True
+
+    def rows(self):
+        """내보낼 행을 (ID, 문제, 정답, 틀린 횟수, 그림, 소리) 튜플로 하나씩 내놓습니다."""
+        for position in wrong_count_order(self.wrong_counts, self.min_wrong_count):
+            extra = self.extras[position] or {}
+            yield (self.ids[position], self.texts[position], self.answers[position],
+                   self.wrong_counts[position], extra.get("image") or "", extra.get("audio") or "")
+
+    def chunks(self):
+        """행을 EXPORT_CHUNK개씩 묶어 내놓고 진행 상황을 갱신합니다 (취소되면 멈춤)."""
+        chunk = []
+        for row in self.rows():
+            chunk.append(row)
+            if len(chunk) == EXPORT_CHUNK:
+                if self.cancelled:
+                    return
+                yield chunk
+                self.advance(len(chunk))
+                chunk = []
+        if chunk and not self.cancelled:
+            yield chunk
+            self.advance(len(chunk))
+
+    def advance(self, count):
+        self.rows_written += count
+        self.fraction = self.rows_written / self.total if self.total else 1.0
+
+    def run(self):
+        """작업 스레드: 임시 파일에 모두 쓴 뒤 path로 교체합니다."""
+        temp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.splitext(self.path)[1], dir=directory)
+            try:
+                copy_file_mode(fd, self.path)
+            finally:
+                os.close(fd)
+            if self.format == "csv":
+                self.write_csv(temp_path)
+            elif self.format == "xlsx":
+                self.write_xlsx(temp_path)
+            else:
+                self.write_html(temp_path)
+            if self.cancelled:
+                os.remove(temp_path)
+                return
+            os.replace(temp_path, self.path)
+            self.fraction = 1.0
+        except Exception as e:
+            self.error = e
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+        finally:
+            self.done = True
+
+    def wait(self):
+        """작업이 끝날 때까지 기다립니다 (화면 없이 실행할 때)."""
+        self.thread.join()
+        if self.error:
+            raise self.error
+        return self.rows_written
+
+    # --- 형식별 쓰기 ---
+
+    def write_csv(self, path):
+        # BOM을 붙여야 엑셀에서 한글이 깨지지 않음 (가져오기도 BOM을 건너뜀)
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_HEADER)
+            for chunk in self.chunks():
+                writer.writerows(chunk)
+
+    def write_xlsx(self, path):
+        # 엑셀 통합 문서(.xlsx)는 XML 파일을 묶은 zip이므로 시트 XML을 zip 안에 바로 흘려 씀
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+            for name, content in XLSX_PARTS.items():
+                package.writestr(name, content)
+            with package.open("xl/worksheets/sheet1.xml", 'w') as sheet:
+                sheet.write(XLSX_SHEET_START.encode('utf-8'))
+                sheet.write(xlsx_row(1, EXPORT_HEADER).encode('utf-8'))
+                number = 1
+                for chunk in self.chunks():
+                    parts = []
+                    for row in chunk:
+                        number += 1
+                        parts.append(xlsx_row(number, row))
+                    sheet.write("".join(parts).encode('utf-8'))
+                sheet.write(XLSX_SHEET_END.encode('utf-8'))
+
+    def write_html(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            title = f"{self.title} 오답노트" if self.title else "오답노트"
+            f.write(HTML_START.format(
+                title=html.escape(title),
+                summary=html.escape(f"틀린 횟수 {self.min_wrong_count}회 이상 · {self.total:,}문제 · "
+                                    f"{time.strftime('%Y-%m-%d %H:%M')}")))
+            number = 0
+            for chunk in self.chunks():
+                parts = []
+                for question_id, text, answer, wrong_count, image, audio in chunk:
+                    number += 1
+                    media = ""
+                    if image:
+                        media += f'<img src="{html.escape(self.media_uri(image))}" alt="">'
+                    if audio:
+                        media += f'<div class="audio">소리: {html.escape(audio)}</div>'
+                    parts.append(
+                        f'<tr><td class="no">{number}</td><td class="q">{html.escape(text)}{media}</td>'
+                        f'<td class="a">{html.escape(answer)}</td><td class="wrong">{wrong_count}</td></tr>\n')
+                f.write("".join(parts))
+            f.write(HTML_END)
+
+    def media_uri(self, name):
+        """첨부 파일 경로(덱 폴더 기준)를 HTML에서 열 수 있는 file:// 주소로"""
+        if self.media_directory is None:
+            return name
+        return Path(os.path.abspath(os.path.join(self.media_directory, name))).as_uri()
+
+
+def xlsx_text(value):
+    text = XML_ILLEGAL.sub("", str(value))[:XLSX_CELL_LIMIT]
+    return html.escape(text, quote=False)
+
+
+def xlsx_row(number, values):
+    """시트 XML의 행 하나 (숫자는 숫자 셀, 나머지는 인라인 문자열 셀)"""
+    cells = []
+    for column, value in zip("ABCDEF", values):
+        reference = f"{column}{number}"
+        if isinstance(value, int):
+            cells.append(f'<c r="{reference}"><v>{value}</v></c>')
+        elif value != "":
+            cells.append(f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">'
+                         f'{xlsx_text(value)}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="문제" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'),
+}
+
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<cols><col min="1" max="1" width="8" customWidth="1"/><col min="2" max="2" width="60" customWidth="1"/>'
+    '<col min="3" max="3" width="30" customWidth="1"/><col min="4" max="4" width="10" customWidth="1"/></cols>'
+    '<sheetData>')
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+HTML_START = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: "Malgun Gothic", "Apple SD Gothic Neo", sans-serif; margin: 2em; color: #222; }}
+h1 {{ font-size: 1.6em; margin-bottom: 0.2em; }}
+.summary {{ color: #666; margin-bottom: 1.5em; }}
+table {{ width: 100%; border-collapse: collapse; }}
+th, td {{ border: 1px solid #bbb; padding: 6px 8px; vertical-align: top; text-align: left; }}
+th {{ background: #f0f0f0; }}
+td.q, td.a {{ white-space: pre-wrap; }}
+td.no, td.wrong {{ text-align: right; width: 4em; }}
+td.a {{ width: 30%; }}
+img {{ display: block; max-width: 100%; max-height: 12em; margin-top: 6px; }}
+.audio {{ color: #666; font-size: 0.9em; margin-top: 4px; }}
+@media print {{
+  body {{ margin: 0; }}
+  thead {{ display: table-header-group; }}
+  tr {{ page-break-inside: avoid; }}
+}}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="summary">{summary}</div>
+<table>
+<thead><tr><th>번호</th><th>문제</th><th>정답</th><th>틀린 횟수</th></tr></thead>
+<tbody>
+"""
+
+HTML_END = """</tbody>
+</table>
+</body>
+</html>
+"""
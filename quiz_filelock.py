@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """같은 데이터 파일을 여는 여러 QuizMaster 인스턴스 사이의 권고 잠금입니다.
+
+    path에 잠금용 파일을 만들어 POSIX에서는 flock, Windows에서는
+    msvcrt.locking으로 잠급니다. 같은 인스턴스 안에서는 스레드 잠금(RLock)으로
+    작성 스레드와 메인 스레드를 구분하고, 같은 스레드는 중첩해서 잡을 수
+    있습니다 (가장 바깥에서 풀 때 파일 잠금을 풂).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                self.lock_file()
+            except BaseException:
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            self.unlock_file()
+        self.thread_lock.release()
+
+    def lock_file(self):
+        self.file = open(self.path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+                return
+            # msvcrt.LK_LOCK은 1초 간격으로 10번 재시도한 뒤 실패하므로 잡힐 때까지 반복
+            self.file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    time.sleep(0.05)
+        except BaseException:
+            self.file.close()
+            self.file = None
+            raise
+
+    def unlock_file(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+
+
+def file_key(path):
+    """파일의 (inode, 수정 시각, 크기). 파일이 없으면 None
+
+    os.replace로 교체된 파일은 inode가 바뀌므로 같은 크기로 빠르게 다시
+    써도 구분됩니다.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,177 @@
+import datetime
+import heapq
+import json
+import os
+import struct
+import time
+
+from quiz_filelock import FileLock
+
+
+# 답안 기록 한 건: 문제 ID, 시각(초), 응답 시간(ms), 정답 여부 (리틀 엔디안 고정 길이)
+RECORD = struct.Struct("<IIIB")
+
+
+def day_key(timestamp):
+    """기록 시각의 날짜 (현지 시간, YYYY-MM-DD)"""
+    return datetime.date.fromtimestamp(timestamp).isoformat()
+
+
+class AnswerHistory:
+    """모든 답안 기록을 추가 전용 바이너리 파일에 남기고 통계를 누적합니다.
+
+    기록은 고정 길이 레코드라 필요하면 열 단위(array)로 한 번에 읽을 수 있고,
+    문제별(시도, 정답, 응답 시간 합계)과 날짜별(시도, 정답) 집계는 기록할 때마다
+    바로 갱신합니다. 집계는 summary_path에 어느 위치까지 반영했는지와 함께
+    가끔 저장하므로, 다음 실행 때는 그 뒤에 덧붙은 기록만 읽으면 됩니다.
+
+    같은 기록 파일을 쓰는 다른 인스턴스가 있으면 FileLock을 잡고 기록하며,
+    기록하기 전이나 catch_up() 때 그사이 덧붙은 남의 기록을 먼저 집계에 반영합니다.
+    """
+
+    def __init__(self, path, summary_path, persistence, summary_interval=500):
+        self.path = path
+        self.summary_path = summary_path
+        self.persistence = persistence
+        self.summary_interval = summary_interval  # 이만큼 기록할 때마다 집계 저장
+        self.by_question = {}  # 문제 ID -> [시도, 정답, 응답 시간 합계(ms)]
+        self.by_day = {}  # 날짜 -> [시도, 정답]
+        self.total = [0, 0, 0]  # 전체 [시도, 정답, 응답 시간 합계(ms)]
+        self.offset = 0  # 집계에 반영한 기록 파일 크기 (바이트)
+        self.unsaved = 0  # 마지막 집계 저장 이후 기록 수
+        self.lock = FileLock(path + ".lock")
+
+    def load(self):
+        """저장된 집계를 불러오고 그 뒤에 덧붙은 기록만 반영합니다."""
+        self.by_question = {}
+        self.by_day = {}
+        self.total = [0, 0, 0]
+        self.offset = 0
+        self.unsaved = 0
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if os.path.exists(self.summary_path):
+            try:
+                with open(self.summary_path, 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+                offset = summary["offset"]
+                # 기록 파일이 지워졌거나 바뀌었으면 집계를 처음부터 다시 만듦
+                if offset <= size:
+                    self.by_question = {int(question_id): counts
+                                        for question_id, counts in summary["questions"].items()}
+                    self.by_day = summary["days"]
+                    self.offset = offset
+                    for counts in self.by_question.values():
+                        for i in range(3):
+                            self.total[i] += counts[i]
+            except (ValueError, KeyError, TypeError):
+                pass
+        with self.lock:
+            # 집계를 읽는 사이 다른 인스턴스가 덧붙였을 수 있으므로 크기를 다시 확인
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            end = self.read_new(size)
+            # 기록 도중 종료되어 잘린 마지막 레코드는 지움
+            if size > end:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(end)
+
+    def read_new(self, size):
+        """반영한 위치부터 size까지의 완전한 레코드를 집계에 반영하고 반영한 끝 위치를 반환합니다."""
+        end = size - (size - self.offset) % RECORD.size
+        if end > self.offset:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(end - self.offset)
+            for question_id, timestamp, response_ms, correct in RECORD.iter_unpack(data):
+                self.add_to_summary(question_id, timestamp, response_ms, correct)
+            self.unsaved += (end - self.offset) // RECORD.size
+            self.offset = end
+        return end
+
+    def catch_up(self):
+        """다른 인스턴스가 덧붙인 기록을 집계에 반영하고 반영한 기록 수를 반환합니다."""
+        offset = self.offset
+        # 파일 크기만 보고 덧붙은 기록이 없으면 잠그지 않음
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= offset:
+            return 0
+        with self.lock:
+            self.read_new(os.path.getsize(self.path))
+        return (self.offset - offset) // RECORD.size
+
+    def add_to_summary(self, question_id, timestamp, response_ms, correct):
+        counts = self.by_question.get(question_id)
+        if counts is None:
+            counts = self.by_question[question_id] = [0, 0, 0]
+        counts[0] += 1
+        counts[1] += correct
+        counts[2] += response_ms
+        self.total[0] += 1
+        self.total[1] += correct
+        self.total[2] += response_ms
+        day = self.by_day.get(day_key(timestamp))
+        if day is None:
+            day = self.by_day[day_key(timestamp)] = [0, 0]
+        day[0] += 1
+        day[1] += correct
+
+    def record(self, question_id, correct, response_time, timestamp=None):
+        """답안 하나를 기록하고 집계를 갱신합니다 (response_time은 초)."""
+        timestamp = int(time.time() if timestamp is None else timestamp)
+        response_ms = min(int(response_time * 1000), 0xFFFFFFFF)
+        with self.lock:
+            self.catch_up()
+            with open(self.path, 'ab') as f:
+                f.write(RECORD.pack(question_id, timestamp, response_ms, bool(correct)))
+            self.offset += RECORD.size
+        self.add_to_summary(question_id, timestamp, response_ms, bool(correct))
+        self.unsaved += 1
+        if self.unsaved >= self.summary_interval:
+            self.save_summary()
+
+    def save_summary(self):
+        """집계 저장을 예약합니다 (지금까지 반영한 기록 위치와 함께)."""
+        if not self.unsaved:
+            return
+        self.unsaved = 0
+        self.persistence.request(self.summary_path, lambda: ({
+            "offset": self.offset,
+            "questions": {str(question_id): list(counts) for question_id, counts in self.by_question.items()},
+            "days": {day: list(counts) for day, counts in self.by_day.items()}
+        }, None))
+
+    # --- 분석 ---
+
+    def totals(self):
+        """전체 시도 수, 정답 수, 정답률, 평균 응답 시간(초)"""
+        attempts, correct, response_ms = self.total
+        return {
+            "attempts": attempts,
+            "correct": correct,
+            "accuracy": correct / attempts * 100 if attempts else 0,
+            "average_seconds": response_ms / attempts / 1000 if attempts else 0
+        }
+
+    def daily(self, days=30):
+        """최근 days일의 (날짜, 시도, 정답률) 목록 (기록이 있는 날만, 최신순)"""
+        result = []
+        for day in sorted(self.by_day, reverse=True)[:days]:
+            attempts, correct = self.by_day[day]
+            result.append((day, attempts, correct / attempts * 100))
+        return result
+
+    def question_stats(self, question_id):
+        """문제 하나의 (시도, 정답률, 평균 응답 시간(초)) (기록이 없으면 None)"""
+        counts = self.by_question.get(question_id)
+        if counts is None:
+            return None
+        attempts, correct, response_ms = counts
+        return attempts, correct / attempts * 100, response_ms / attempts / 1000
+
+    def hardest(self, limit=20, min_attempts=3, accept=None):
+        """min_attempts번 이상 푼 문제 중 정답률이 낮은 순서로 문제 ID limit개
+
+        accept(문제 ID)가 False인 문제(예: 삭제된 문제)는 뺍니다.
+        """
+        candidates = ((counts[1] / counts[0], -counts[0], question_id)
+                      for question_id, counts in self.by_question.items()
+                      if counts[0] >= min_attempts and (accept is None or accept(question_id)))
+        return [question_id for _, _, question_id in heapq.nsmallest(limit, candidates)]
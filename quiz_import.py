@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+import threading
+
+from quiz_media import MEDIA_FIELDS
+
+
+# 파일 열 이름 -> 문제 필드 (영문/한글 머리글 모두 인정)
+HEADER_ALIASES = {
+    "question": "question", "문제": "question", "질문": "question",
+    "answer": "answer", "정답": "answer", "답": "answer",
+    "wrong_count": "wrong_count", "틀린 횟수": "wrong_count",
+    "image": "image", "이미지": "image", "그림": "image",
+    "audio": "audio", "소리": "audio", "음성": "audio"
+}
+
+
+class ImportRowError(ValueError):
+    """가져올 수 없는 행 (줄 번호와 사유)"""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"{line_number}번째 줄: {message}")
+        self.line_number = line_number
+
+
+def file_format(path):
+    """확장자로 파일 형식을 정합니다 (.jsonl, .tsv, 그 외는 CSV)."""
+    lower = path.lower()
+    if lower.endswith(".jsonl"):
+        return "jsonl"
+    if lower.endswith(".tsv") or lower.endswith(".txt"):
+        return "tsv"
+    return "csv"
+
+
+def iter_question_rows(f, fmt):
+    """열린 텍스트 파일에서 (줄 번호, 레코드) 쌍을 한 줄씩 읽습니다.
+
+    CSV/TSV는 첫 줄이 question/answer(또는 문제/정답) 머리글이면 그 열을 쓰고,
+    아니면 첫 번째 열을 문제, 두 번째 열을 정답으로 봅니다.
+    """
+    if fmt == "jsonl":
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, None
+                continue
+            yield line_number, record
+        return
+
+    reader = csv.reader(f, delimiter="\t" if fmt == "tsv" else ",")
+    columns = None
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        if columns is None:
+            columns = [HEADER_ALIASES.get(cell.strip().lower()) for cell in row]
+            if "question" in columns and "answer" in columns:
+                continue
+            columns = ["question", "answer", "wrong_count"]
+        yield reader.line_num, {field: cell for field, cell in zip(columns, row) if field}
+
+
+def normalize_row(line_number, record):
+    """레코드를 검증하고 문제 dict({question, answer, wrong_count}, 있으면 image/audio)로 정리합니다."""
+    if not isinstance(record, dict):
+        raise ImportRowError(line_number, "형식을 읽을 수 없습니다.")
+    question_text = str(record.get("question") or "").replace("\r\n", "\n").strip()
+    answer_text = str(record.get("answer") or "").strip()
+    if not question_text or not answer_text:
+        raise ImportRowError(line_number, "문제와 정답이 모두 있어야 합니다.")
+
+    wrong_count = record.get("wrong_count") or 0
+    try:
+        wrong_count = int(wrong_count)
+    except (TypeError, ValueError):
+        raise ImportRowError(line_number, "틀린 횟수는 숫자여야 합니다.")
+    if wrong_count < 0:
+        raise ImportRowError(line_number, "틀린 횟수는 0 이상이어야 합니다.")
+
+    question = {"question": question_text, "answer": answer_text, "wrong_count": wrong_count}
+    # 첨부 파일은 덱 폴더 기준 경로만 적어 두고 파일은 보여 줄 때 읽음
+    for field in MEDIA_FIELDS:
+        path = str(record.get(field) or "").strip()
+        if path:
+            question[field] = path.replace("\\", "/")
+    return question
+
+
+class QuestionImporter:
+    """문제 파일을 작업 스레드에서 읽고 검증합니다.
+
+    파일은 한 줄씩 읽으므로 전체 내용을 한 번에 메모리에 올리지 않습니다.
+    진행 상황(읽은 바이트 비율, 행 수)은 속성으로 공개하며 화면 쪽에서 주기적으로
+    읽어 갑니다. 작업이 끝나면 done이 True가 되고, 검증된 문제는 questions,
+    건너뛴 행은 errors에 담깁니다. 저장소에는 아무것도 쓰지 않으므로 결과를
+    반영하는 일(한 번의 저장과 목록 새로고침)은 호출 측이 메인 스레드에서 합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.questions = []
+        self.errors = []  # ImportRowError 목록
+        self.rows_read = 0
+        self.fraction = 0.0  # 읽은 바이트 비율 (0.0 ~ 1.0)
+        self.done = False
+        self.cancelled = False
+        self.error = None  # 파일 자체를 읽지 못한 경우의 예외
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """작업 스레드를 시작합니다."""
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """가져오기를 중단합니다 (읽은 결과는 버림)."""
+        self.cancelled = True
+
+    def run(self):
+        """작업 스레드: 파일을 끝까지 읽으며 행을 검증합니다."""
+        try:
+            total = os.path.getsize(self.path) or 1
+            with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+                for line_number, record in iter_question_rows(f, file_format(self.path)):
+                    if self.cancelled:
+                        return
+                    try:
+                        self.questions.append(normalize_row(line_number, record))
+                    except ImportRowError as e:
+                        self.errors.append(e)
+                    self.rows_read += 1
+                    if self.rows_read % 256 == 0:
+                        # 버퍼 단위로 앞서 읽으므로 대략적인 위치
+                        self.fraction = min(1.0, f.buffer.tell() / total)
+            self.fraction = 1.0
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def wait(self):
+        """작업이 끝날 때까지 기다립니다 (화면 없이 실행할 때)."""
+        self.thread.join()
+        if self.error:
+            raise self.error
+        return self.questions
@@ -0,0 +1,355 @@
+import glob
+import json
+import os
+
+from quiz_filelock import file_key
+
+
+def reduce_records(records):
+    """레코드를 문제별 최종 변경 하나로 합칩니다.
+
+    (틀린 횟수 전체 초기화 여부, {문제 ID: None(삭제) | ("set", 행 dict, 위치) |
+    ("update", 필드 dict)})를 반환합니다. 전체 초기화는 문제별 변경보다 먼저
+    적용하므로, 초기화 앞에 있던 틀린 횟수 변경은 여기서 버립니다.
+    """
+    reset = False
+    states = {}
+    for record in records:
+        op = record.get("op")
+        if op == "reset_wrong_counts":
+            reset = True
+            for state in states.values():
+                if state is None:
+                    continue
+                if state[0] == "set":
+                    state[1]["wrong_count"] = 0
+                else:
+                    state[1].pop("wrong_count", None)
+            continue
+        question_id = record.get("id")
+        if question_id is None:
+            continue
+        if op == "delete":
+            states[question_id] = None
+            continue
+        fields = {key: value for key, value in record.items() if key not in ("id", "op", "position")}
+        if op == "set":
+            fields["id"] = question_id
+            states[question_id] = ("set", fields, record.get("position"))
+            continue
+        state = states.get(question_id, ())
+        if state is None:
+            continue  # 지운 문제의 변경
+        if state:
+            state[1].update(fields)
+        else:
+            states[question_id] = ("update", fields)
+    return reset, states
+
+
+def apply_records(questions, records):
+    """저널 레코드를 문제 표(QuestionTable)에 적용하고 바뀐 내용을 반환합니다.
+
+    행마다 최종 변경만 한 번씩 적용하고 삭제와 추가는 표에서 한 번에 처리합니다.
+    {"updated": 값이 바뀐 문제 ID 집합, "deleted": 삭제된 행의 (삭제 전) 위치 목록,
+    "deleted_ids": 삭제된 문제 ID 목록, "added": 추가된 행의 위치 목록,
+    "reset": 틀린 횟수 전체 초기화 여부}를
+    반환하며, 바뀐 것이 없으면 None을 반환합니다.
+    """
+    reset, states = reduce_records(records)
+    if not reset and not states:
+        return None
+    if reset:
+        questions.reset_wrong_counts()
+    ids = questions.ids
+    existing = questions.positions_of_ids(states)
+    present = set()
+    deleted = []
+    deleted_ids = []
+    updated = set()
+    for position in existing:
+        question_id = ids[position]
+        present.add(question_id)
+        state = states[question_id]
+        if state is None:
+            deleted.append(position)
+            deleted_ids.append(question_id)
+        elif state[0] == "set":
+            questions.set_row(position, state[1])
+            updated.add(question_id)
+        else:
+            questions[position].update(state[1])
+            updated.add(question_id)
+    questions.delete(deleted)
+    inserts = []
+    end = len(questions)
+    for question_id, state in states.items():
+        if state is None or state[0] != "set" or question_id in present:
+            continue
+        row = state[1]
+        position = state[2] if state[2] is not None else end + len(inserts)
+        extra = {key: value for key, value in row.items() if key not in questions.columns}
+        inserts.append((position, question_id, row["question"], row["answer"],
+                        row.get("wrong_count", 0), extra or None))
+    questions.insert(inserts)
+    added = questions.positions_of_ids({record[1] for record in inserts}) if inserts else []
+    if not (reset or updated or deleted or added):
+        return None
+    return {"updated": updated, "deleted": deleted, "deleted_ids": deleted_ids, "added": added, "reset": reset}
+
+
+def diff_records(questions, fresh):
+    """questions(QuestionTable)를 fresh와 같게 만드는 레코드 목록 (다시 불러온 파일과 비교용)"""
+    current = {question_id: position for position, question_id in enumerate(questions.ids)}
+    records = [{"op": "delete", "id": question_id}
+               for question_id in current.keys() - set(fresh.ids)]
+    columns = (questions.texts, questions.answers, questions.wrong_counts, questions.extras)
+    fresh_columns = (fresh.texts, fresh.answers, fresh.wrong_counts, fresh.extras)
+    for position, question_id in enumerate(fresh.ids):
+        old_position = current.get(question_id)
+        if old_position is None:
+            records.append(row_record(fresh[position], position))
+        elif any(column[old_position] != fresh_column[position]
+                 for column, fresh_column in zip(columns, fresh_columns)):
+            records.append(row_record(fresh[position]))
+    return records
+
+
+def row_record(question, position=None):
+    """문제 한 행 전체를 기록하는 레코드 (추가, 되살리기용)"""
+    record = {"op": "set"}
+    record.update(question.items())
+    if position is not None:
+        record["position"] = position
+    return record
+
+
+def parse_lines(data):
+    """저널 바이트열의 완전한 줄들을 레코드로 바꿉니다 (깨진 줄은 건너뜀)."""
+    records = []
+    for line in data.decode('utf-8', errors='replace').splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+class AnswerJournal:
+    """문제 변경을 문제 단위 레코드로만 기록하는 추가 전용 저널입니다.
+
+    전체 문제 파일을 매번 다시 쓰지 않도록 한 줄짜리 JSON 레코드를 덧붙이고,
+    일정 개수가 쌓이면 호출 측에서 전체 저장(압축)을 수행합니다. 레코드는
+    필드 변경({"id": 문제 ID, 필드: 새 값}), 행 전체({"op": "set", ...}, 추가와
+    되살리기), 삭제({"op": "delete", "id"}), 틀린 횟수 전체 초기화
+    ({"op": "reset_wrong_counts"})이며 모두 새 값을 그대로 적으므로 여러 번
+    적용해도 결과가 같습니다.
+
+    전체 저장은 백그라운드에서 끝나므로, 스냅샷을 뜨는 시점에 checkpoint()로
+    지금까지의 기록을 번호가 붙은 조각 파일로 봉인하고, 저장이 끝나면 어디까지
+    반영했는지를 압축 표시 파일(.compacted)에 남깁니다. 같은 파일을 여는 다른
+    인스턴스가 아직 읽지 못했을 수 있으므로 조각은 한 번 더 압축한 뒤에 지웁니다.
+
+    여러 인스턴스가 함께 쓰므로 기록, 봉인, 다른 인스턴스 기록 읽기는 모두
+    호출 측이 같은 FileLock을 잡은 채로 합니다. 파일마다 어디까지 읽었는지를
+    조각 번호(아직 봉인되지 않은 파일은 봉인될 번호)로 기억해 두고, 새로
+    덧붙은 부분만 read_new()로 읽습니다.
+    """
+
+    def __init__(self, path, compact_threshold=200):
+        self.path = path
+        self.marker_path = path + ".compacted"
+        self.compact_threshold = compact_threshold
+        self.pending = 0  # 마지막 압축 이후 이 인스턴스가 쌓은 레코드 수
+        self.offsets = {}  # 조각 번호 -> 읽은 바이트 수
+        self.complete = set()  # 끝까지 읽은 봉인된 조각 번호
+        self.backlog = []  # 기록하면서 먼저 읽어 둔 다른 인스턴스의 레코드
+        self.missed = False  # 기록하면서 읽어 보니 놓친 기록이 있었는지 (다음 read_new()가 알림)
+        self.stamp = None  # 마지막으로 읽을 때 저널 파일과 압축 표시 파일의 상태
+
+    def append(self, question_id, fields):
+        """문제 하나의 변경된 필드 값을 저널 끝에 기록합니다."""
+        record = {"id": question_id}
+        record.update(fields)
+        self.append_records([record])
+
+    def append_records(self, records):
+        """레코드 여러 개를 한 번에 덧붙입니다 (다른 인스턴스 기록은 backlog로 먼저 읽어 둠).
+
+        그사이 놓친 기록이 있었으면 missed를 세워 두므로 호출 측은 덧붙인 뒤
+        문제 파일을 다시 읽어야 합니다 (JsonQuestionStore.write_records 참고).
+        """
+        if not records:
+            return
+        new_records, missed = self.read_new()
+        self.backlog.extend(new_records)
+        self.missed = missed
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        with open(self.path, 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            if end:
+                # 다른 인스턴스가 쓰다 만 줄에 이어 붙지 않도록 줄을 바꿈
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            self.offsets[self.live_number()] = end + len(data)
+        self.pending += len(records)
+
+    def modified(self):
+        """마지막으로 읽은 뒤 저널 파일이나 압축 표시 파일이 바뀌었는지 (잠그지 않고 상태만 비교)
+
+        기록은 파일 크기를, 봉인과 압축은 파일 자체를 바꾸므로 읽을 것이 생기면
+        반드시 바뀝니다.
+        """
+        return (bool(self.backlog) or self.missed
+                or (file_key(self.path), file_key(self.marker_path)) != self.stamp)
+
+    def needs_compaction(self):
+        """전체 저장으로 저널을 정리할 때가 되었는지 확인합니다."""
+        return self.pending >= self.compact_threshold
+
+    def sealed_segments(self):
+        """봉인된 조각 파일을 (번호, 경로) 순서대로 반환합니다."""
+        segments = []
+        for segment_path in glob.glob(glob.escape(self.path) + ".*"):
+            suffix = segment_path[len(self.path) + 1:]
+            if suffix.isdigit():
+                segments.append((int(suffix), segment_path))
+        segments.sort()
+        return segments
+
+    def read_marker(self):
+        """마지막 압축 정보 {"through": 반영한 조각 번호, "source": 그때 쓴 문제 파일, "previous"}"""
+        try:
+            with open(self.marker_path, 'r', encoding='utf-8') as f:
+                marker = json.load(f)
+            return marker if isinstance(marker, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def live_number(self, segments=None):
+        """지금 기록 중인 파일이 봉인될 때 받을 번호 (디스크 상태로만 정하므로 인스턴스마다 같음)"""
+        if segments is None:
+            segments = self.sealed_segments()
+        last = segments[-1][0] if segments else 0
+        return max(last, self.read_marker().get("through", 0)) + 1
+
+    def replay(self, questions, source_path):
+        """불러온 문제 파일에 반영되지 않은 레코드를 다시 적용하고 적용한 레코드 수를 반환합니다.
+
+        압축 표시가 지금 문제 파일을 가리키면 그때 반영한 조각은 건너뜁니다
+        (가리키지 않으면 남은 조각을 모두 적용하며, 레코드가 새 값을 그대로
+        적으므로 이미 반영된 조각을 다시 적용해도 결과가 같습니다).
+        """
+        self.pending = 0
+        self.offsets = {}
+        self.complete = set()
+        self.backlog = []
+        self.stamp = (file_key(self.path), file_key(self.marker_path))
+        marker = self.read_marker()
+        included = 0
+        if marker.get("source") and tuple(marker["source"]) == file_key(source_path):
+            included = marker.get("through", 0)
+        segments = self.sealed_segments()
+        records = []
+        for number, segment_path in segments + [(self.live_number(segments), self.path)]:
+            try:
+                with open(segment_path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                if segment_path != self.path:
+                    continue
+                data = b""  # 아직 기록이 없어도 봉인되면 이어 읽도록 번호는 기억해 둠
+            end = data.rfind(b"\n") + 1
+            if number > included:
+                records.extend(parse_lines(data[:end]))
+            self.offsets[number] = end
+            if segment_path != self.path and end == len(data):
+                self.complete.add(number)
+        apply_records(questions, records)
+        self.pending = len(records)
+        return self.pending
+
+    def read_new(self):
+        """마지막으로 읽은 뒤 덧붙은 레코드를 읽어 (레코드 목록, 놓친 기록이 있는지)를 반환합니다.
+
+        다른 인스턴스가 봉인한 파일은 봉인 전 번호로 이어서 읽습니다. 끝까지
+        읽지 못한 파일이 그사이 지워졌으면 놓친 기록이 있는 것이므로 호출 측이
+        문제 파일을 다시 읽어야 합니다.
+        """
+        records, self.backlog = self.backlog, []
+        missed, self.missed = self.missed, False
+        self.stamp = (file_key(self.path), file_key(self.marker_path))
+        segments = self.sealed_segments()
+        seen = set()
+        for number, segment_path in segments + [(self.live_number(segments), self.path)]:
+            offset = self.offsets.get(number, 0)
+            try:
+                with open(segment_path, 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                if segment_path != self.path:
+                    continue
+                data = b""
+            seen.add(number)
+            end = data.rfind(b"\n") + 1
+            records.extend(parse_lines(data[:end]))
+            self.offsets[number] = offset + end
+            if segment_path != self.path and end == len(data):
+                self.complete.add(number)
+        for number in list(self.offsets):
+            if number not in seen:
+                if number not in self.complete:
+                    missed = True
+                del self.offsets[number]
+                self.complete.discard(number)
+        return records, missed
+
+    def checkpoint(self):
+        """지금까지의 기록을 조각 파일로 봉인하고, 여기까지 봉인된 마지막 번호를 반환합니다."""
+        self.pending = 0
+        segments = self.sealed_segments()
+        number = self.live_number(segments)
+        if os.path.exists(self.path):
+            os.replace(self.path, f"{self.path}.{number}")
+            return number
+        return number - 1
+
+    def commit_compaction(self, sequence, temp_path, source_path):
+        """sequence번 조각까지 반영한 문제 파일(temp_path)로 교체합니다.
+
+        그사이 다른 인스턴스가 더 나중 조각까지 반영해 압축했으면 교체하지 않고
+        None을, 교체했으면 직전 압축이 반영한 조각 번호(이제 지워도 되는 조각)를
+        반환합니다. 압축 표시를 먼저 남겨 두므로 교체 직후에 종료되어도 다음
+        실행 때 반영한 조각을 다시 적용하지 않습니다.
+
+        temp_path가 None이면 문제 파일을 그 자리에서 이미 고친 것으로 보고 압축
+        표시만 남깁니다 (고친 뒤 표시 전에 종료되면 표시가 지금 파일을 가리키지
+        않으므로 남은 조각을 모두 다시 적용함).
+        """
+        marker = self.read_marker()
+        if marker.get("through", 0) > sequence:
+            return None
+        new_marker = {"through": sequence, "source": file_key(temp_path or source_path),
+                      "previous": marker.get("through", 0)}
+        temp_marker = self.marker_path + ".tmp"
+        with open(temp_marker, 'w', encoding='utf-8') as f:
+            json.dump(new_marker, f)
+        os.replace(temp_marker, self.marker_path)
+        if temp_path is not None:
+            os.replace(temp_path, source_path)
+        return new_marker["previous"]
+
+    def discard_through(self, sequence):
+        """sequence 번호까지의 조각 파일을 지웁니다."""
+        for number, segment_path in self.sealed_segments():
+            if number <= sequence and os.path.exists(segment_path):
+                os.remove(segment_path)
@@ -0,0 +1,118 @@
+"""실행 중인 quiz_server에 여러 학습자가 동시에 답안을 보내는 부하를 걸어 봅니다.
+
+학습자마다 keep-alive 연결 하나로 세션을 시작한 뒤 /next와 /answer를 번갈아
+보내고, 끝나면 초당 답안 수와 요청 지연 시간 분포(p50/p95/p99)를 출력합니다.
+외부 패키지 없이 asyncio만 씁니다.
+
+사용 예:
+    python quiz_server.py --port 8765
+    python quiz_loadtest.py --port 8765 --learners 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from quiz_profiling import LatencyHistogram
+
+
+class LoadTestClient:
+    """학습자 한 명 역할을 하는 keep-alive HTTP 연결입니다."""
+
+    def __init__(self, reader, writer, host, histogram):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+        self.histogram = histogram
+
+    async def request(self, method, path, payload=None):
+        """요청 하나를 보내고 (상태 코드, 응답 객체)를 반환합니다."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+        start = time.perf_counter()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("서버가 연결을 닫았습니다.")
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        self.histogram.record(time.perf_counter() - start)
+        return status, json.loads(data)
+
+
+async def run_learner(args, number, histogram, deadline, counts, known_answers):
+    """학습자 하나: 세션을 시작하고 마감 시각까지 문제를 받아 답합니다."""
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    client = LoadTestClient(reader, writer, f"{args.host}:{args.port}", histogram)
+    learner = f"{args.prefix}{number}"
+    try:
+        status, result = await client.request("POST", "/session", {"learner": learner})
+        if status != 200:
+            raise RuntimeError(result.get("error"))
+        while time.perf_counter() < deadline:
+            status, question = await client.request("POST", "/next", {"learner": learner})
+            if question.get("done"):
+                await client.request("POST", "/session", {"learner": learner})
+                continue
+            # 채점 결과로 알게 된 정답은 다음부터 wrong_ratio를 뺀 비율로 맞힘
+            # (처음 보는 문제는 틀리므로 학습자별 틀린 횟수 기록과 저장도 함께 부하를 받음)
+            answer = known_answers.get(question["id"])
+            if answer is None or random.random() < args.wrong_ratio:
+                answer = "모르겠음"
+            status, result = await client.request("POST", "/answer", {"learner": learner, "answer": answer})
+            counts["answers"] += 1
+            if status != 200:
+                counts["errors"] += 1
+            else:
+                known_answers[question["id"]] = result["answer"]
+    finally:
+        writer.close()
+
+
+async def run_load_test(args):
+    histogram = LatencyHistogram()
+    counts = {"answers": 0, "errors": 0}
+    known_answers = {}  # 문제 ID -> 정답 (모든 학습자가 공유)
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(run_learner(args, number, histogram, deadline, counts, known_answers)
+                           for number in range(args.learners)))
+    elapsed = time.perf_counter() - start
+    print(f"학습자 {args.learners}명, {elapsed:.1f}초 동안 답안 {counts['answers']:,}개 "
+          f"({counts['answers'] / elapsed:,.0f}개/초), 오류 {counts['errors']}개")
+    print(f"요청 {histogram.count:,}개 ({histogram.count / elapsed:,.0f}개/초) 지연 시간: "
+          f"p50 {histogram.percentile(0.5) * 1000:.2f}ms | p95 {histogram.percentile(0.95) * 1000:.2f}ms | "
+          f"p99 {histogram.percentile(0.99) * 1000:.2f}ms | 최대 {histogram.max * 1000:.2f}ms")
+    return 1 if counts["errors"] else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="퀴즈 서버 부하 테스트")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--learners", type=int, default=100, help="동시에 연습하는 학습자 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="실행 시간(초)")
+    parser.add_argument("--wrong-ratio", type=float, default=0.3, help="정답을 아는 문제도 틀린 답을 보내는 비율")
+    parser.add_argument("--prefix", default="loadtest-", help="학습자 이름 앞에 붙일 문자열")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(run_load_test(args))
+    except (OSError, RuntimeError) as e:
+        print(f"부하 테스트 실패: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
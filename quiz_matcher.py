@@ -0,0 +1,93 @@
+def normalize_answer(answer):
+    """답안을 정규화합니다 (띄어쓰기 제거, 소문자 변환)."""
+    return ''.join(answer.split()).lower()
+
+
+def split_answers(answer):
+    """정답 문자열에서 인정할 답 목록을 만듭니다.
+
+    '/'로 구분된 여러 답(동의어, 한/영 표기 등)을 각각 인정하고,
+    "TCP/IP"처럼 '/'가 답의 일부인 경우를 위해 전체 문자열도 인정합니다.
+    """
+    answers = [answer]
+    if "/" in answer:
+        answers.extend(part for part in answer.split("/") if part.strip())
+    return answers
+
+
+def within_distance(source, target, limit):
+    """두 문자열의 편집 거리가 limit 이하인지 확인합니다.
+
+    대각선 주변 폭 2*limit+1 구간만 계산하고, 한 행의 최솟값이 limit을
+    넘으면 바로 중단하므로 O(limit * 길이)입니다.
+    """
+    if source == target:
+        return True
+    if abs(len(source) - len(target)) > limit:
+        return False
+    if len(source) > len(target):
+        source, target = target, source
+
+    too_far = limit + 1
+    width = len(target)
+    previous = [j if j <= limit else too_far for j in range(width + 1)]
+    for i, source_char in enumerate(source, 1):
+        current = [too_far] * (width + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        for j in range(max(1, i - limit), min(width, i + limit) + 1):
+            cost = 0 if source_char == target[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current[j] = value if value < too_far else too_far
+            if value < row_min:
+                row_min = value
+        # 이 행에서 이미 limit을 넘었으면 더 볼 필요 없음
+        if row_min > limit:
+            return False
+        previous = current
+    return previous[width] <= limit
+
+
+class AnswerMatcher:
+    """문제별로 정규화한 정답 집합을 미리 만들어 두고 채점합니다.
+
+    정답 집합은 문제 ID별로 캐시하며, 문제를 수정하면 invalidate()로
+    지웁니다. max_distance가 1 이상이면 그 편집 거리 안의 오타도 정답으로
+    인정하되, 짧은 답은 길이의 1/3까지만 허용합니다.
+    """
+
+    def __init__(self, max_distance=0):
+        self.max_distance = max_distance
+        self.cache = {}  # 문제 ID -> (원본 정답 문자열, 정규화된 정답 집합)
+
+    def accepted_answers(self, question):
+        """문제의 정규화된 정답 집합을 반환합니다 (캐시 사용)."""
+        answer = question["answer"]
+        cached = self.cache.get(question["id"])
+        if cached is None or cached[0] is not answer:
+            normalized = frozenset(normalize_answer(a) for a in split_answers(answer))
+            cached = (answer, normalized - {""})
+            self.cache[question["id"]] = cached
+        return cached[1]
+
+    def match(self, question, user_answer):
+        """답안이 정답 중 하나와 같거나 허용 오타 범위 안인지 확인합니다."""
+        normalized = normalize_answer(user_answer)
+        accepted = self.accepted_answers(question)
+        if normalized in accepted:
+            return True
+        if self.max_distance and normalized:
+            for answer in accepted:
+                limit = min(self.max_distance, len(answer) // 3)
+                if limit and within_distance(normalized, answer, limit):
+                    return True
+        return False
+
+    def invalidate(self, question_id):
+        """수정되거나 삭제된 문제의 캐시를 지웁니다."""
+        self.cache.pop(question_id, None)
+
+    def clear(self):
+        """캐시를 모두 지웁니다."""
+        self.cache.clear()
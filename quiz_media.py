@@ -0,0 +1,191 @@
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+
+
+MEDIA_DIR = "media"  # 덱 폴더 안에서 첨부 파일을 복사해 둘 폴더
+MEDIA_FIELDS = ("image", "audio")  # 문제에 첨부 파일 경로(덱 폴더 기준)를 적는 필드
+
+# tkinter.PhotoImage가 추가 라이브러리 없이 읽을 수 있는 형식
+IMAGE_EXTENSIONS = (".png", ".gif", ".ppm", ".pgm")
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".m4a")
+
+DEFAULT_MEDIA_CACHE_MB = 32
+
+
+def check_media_file(field, path):
+    """첨부할 수 있는 파일인지 확장자로 확인합니다."""
+    extensions = IMAGE_EXTENSIONS if field == "image" else AUDIO_EXTENSIONS
+    if not path.lower().endswith(extensions):
+        kind = "이미지" if field == "image" else "소리"
+        raise ValueError(f"{kind} 파일은 {', '.join(extensions)} 형식만 첨부할 수 있습니다.")
+    if not os.path.isfile(path):
+        raise ValueError(f"파일을 찾을 수 없습니다: {path}")
+
+
+def attach_media(deck_directory, field, source_path):
+    """파일을 덱의 media 폴더로 복사하고 문제에 적을 상대 경로를 반환합니다.
+
+    이미 덱 폴더 안에 있는 파일은 복사하지 않고 그 경로를 그대로 씁니다.
+    같은 이름의 다른 파일이 있으면 이름 뒤에 -2, -3...을 붙입니다.
+    """
+    check_media_file(field, source_path)
+    deck_directory = os.path.abspath(deck_directory)
+    source_path = os.path.abspath(source_path)
+    if os.path.commonpath([deck_directory, source_path]) == deck_directory:
+        return os.path.relpath(source_path, deck_directory).replace(os.sep, "/")
+    media_directory = os.path.join(deck_directory, MEDIA_DIR)
+    base, extension = os.path.splitext(os.path.basename(source_path))
+    name = base + extension
+    suffix = 2
+    while os.path.exists(os.path.join(media_directory, name)):
+        if same_file_content(source_path, os.path.join(media_directory, name)):
+            return f"{MEDIA_DIR}/{name}"
+        name = f"{base}-{suffix}{extension}"
+        suffix += 1
+    try:
+        os.makedirs(media_directory, exist_ok=True)
+        shutil.copyfile(source_path, os.path.join(media_directory, name))
+    except OSError as e:
+        raise ValueError(f"첨부 파일을 복사할 수 없습니다: {e}")
+    return f"{MEDIA_DIR}/{name}"
+
+
+def same_file_content(path, other_path):
+    """두 파일의 내용이 같은지 확인합니다 (같은 파일을 여러 번 첨부할 때 복사하지 않도록)."""
+    if os.path.getsize(path) != os.path.getsize(other_path):
+        return False
+    with open(path, 'rb') as f, open(other_path, 'rb') as other:
+        while True:
+            chunk = f.read(1 << 16)
+            if chunk != other.read(1 << 16):
+                return False
+            if not chunk:
+                return True
+
+
+def play_audio(path):
+    """소리 파일을 운영체제 기본 방법으로 재생합니다 (재생을 기다리지 않음)."""
+    if not os.path.isfile(path):
+        raise ValueError(f"소리 파일을 찾을 수 없습니다: {path}")
+    if sys.platform == "win32":
+        if path.lower().endswith(".wav"):
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        else:
+            os.startfile(path)
+        return
+    if sys.platform == "darwin":
+        players = (["afplay"],)
+    else:
+        players = (["paplay"], ["aplay", "-q"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"])
+    for player in players:
+        if shutil.which(player[0]):
+            subprocess.Popen(player + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+    raise ValueError("소리를 재생할 프로그램을 찾을 수 없습니다.")
+
+
+class MediaCache:
+    """문제에 첨부된 이미지를 필요할 때만 읽고, 디코딩한 이미지를 LRU로 보관합니다.
+
+    get()은 화면에 보여 줄 때 부르며, 캐시에 없으면 그 자리에서 읽어
+    decode(데이터)로 디코딩합니다. 디코딩한 이미지의 크기(size_of)의 합이
+    max_bytes를 넘으면 가장 오래 쓰지 않은 이미지부터 버립니다.
+
+    prefetch()는 다음에 보여 줄 파일을 작업 스레드에서 미리 읽어 prepare(원본
+    바이트)까지 해 둡니다. 디코딩은 tkinter처럼 메인 스레드에서만 할 수 있는
+    경우가 있으므로 decode_prefetched()를 메인 스레드에서 불러 미리 읽은
+    파일을 캐시에 올립니다.
+    """
+
+    def __init__(self, decode, size_of, max_bytes=DEFAULT_MEDIA_CACHE_MB * 1024 * 1024, prepare=None):
+        self.decode = decode
+        self.size_of = size_of
+        self.max_bytes = max_bytes
+        self.prepare = prepare
+        self.images = OrderedDict()  # 경로 -> (이미지, 크기), 끝이 가장 최근에 쓴 이미지
+        self.size = 0
+        self.prefetched = {}  # 경로 -> 미리 읽은 데이터 (작업 스레드가 채움)
+        self.requested = set()  # 미리 읽기를 요청했지만 아직 디코딩하지 않은 경로
+        self.lock = threading.Lock()
+        self.jobs = queue.Queue()
+        self.thread = None
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.prepare(data) if self.prepare else data
+
+    def get(self, path):
+        """path의 이미지를 반환합니다 (캐시에 없으면 읽어서 디코딩, 읽지 못하면 OSError)."""
+        entry = self.images.get(path)
+        if entry is not None:
+            self.images.move_to_end(path)
+            return entry[0]
+        with self.lock:
+            data = self.prefetched.pop(path, None)
+            self.requested.discard(path)
+        if data is None:
+            data = self.read(path)
+        return self.add(path, self.decode(data))
+
+    def add(self, path, image):
+        size = self.size_of(image)
+        self.images[path] = (image, size)
+        self.size += size
+        # 방금 넣은 이미지는 남기고 오래된 이미지부터 버림
+        while self.size > self.max_bytes and len(self.images) > 1:
+            _, (_, old_size) = self.images.popitem(last=False)
+            self.size -= old_size
+        return image
+
+    def prefetch(self, path):
+        """path를 작업 스레드에서 미리 읽습니다 (이미 캐시에 있거나 요청했으면 무시)."""
+        with self.lock:
+            if path in self.images or path in self.requested:
+                return
+            self.requested.add(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.prefetch_loop, daemon=True)
+            self.thread.start()
+        self.jobs.put(path)
+
+    def prefetch_loop(self):
+        while True:
+            path = self.jobs.get()
+            try:
+                data = self.read(path)
+            except OSError:
+                data = None  # 보여 줄 때 다시 읽어 오류를 알림
+            with self.lock:
+                if data is not None and path in self.requested:
+                    self.prefetched[path] = data
+                else:
+                    self.requested.discard(path)
+
+    def decode_prefetched(self):
+        """미리 읽어 둔 파일을 디코딩해 캐시에 올리고, 아직 읽는 중인 파일이 남았는지 반환합니다."""
+        with self.lock:
+            ready, self.prefetched = self.prefetched, {}
+            self.requested.difference_update(ready)
+            waiting = bool(self.requested)
+        for path, data in ready.items():
+            if path not in self.images:
+                try:
+                    self.add(path, self.decode(data))
+                except Exception:
+                    pass  # 깨진 파일은 보여 줄 때 다시 읽어 오류를 알림
+        return waiting
+
+    def clear(self):
+        """캐시를 비웁니다 (덱을 바꾸거나 첨부 파일이 바뀌었을 때)."""
+        with self.lock:
+            self.prefetched.clear()
+            self.requested.clear()
+        self.images.clear()
+        self.size = 0
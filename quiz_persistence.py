@@ -0,0 +1,134 @@
+import json
+import os
+import queue
+import stat
+import tempfile
+import threading
+import uuid
+
+
+def new_file_mode(directory):
+    """directory에 open()으로 새 파일을 만들 때 받을 권한을 확인합니다.
+
+    umask는 바꿔야만 읽을 수 있고 바꾸면 다른 스레드가 만드는 파일에도 영향을
+    주므로, 0666으로 빈 파일을 하나 만들어 실제로 받은 권한을 읽고 지웁니다.
+    """
+    probe = os.path.join(directory, f".tmp-mode-{uuid.uuid4().hex}")
+    fd = os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        return stat.S_IMODE(os.fstat(fd).st_mode)
+    finally:
+        os.close(fd)
+        os.remove(probe)
+
+
+def copy_file_mode(fd, path):
+    """mkstemp가 0600으로 만든 임시 파일에 path의 권한을 줍니다.
+
+    path가 아직 없으면 open()으로 새로 만들 때와 같은 권한(0666에서 umask를 뺀 값)을 줍니다.
+    """
+    if not hasattr(os, "fchmod"):  # Windows에서는 권한 비트를 쓰지 않음
+        return
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = new_file_mode(os.path.dirname(os.path.abspath(path)))
+    os.fchmod(fd, mode)
+
+
+def write_json_atomic(path, data, replace=None):
+    """임시 파일에 쓴 뒤 os.replace로 교체하여 파일이 잘리지 않도록 저장합니다.
+
+    replace(임시 경로, path)를 주면 교체를 그 함수에 맡기고, False를 반환하면
+    (교체하지 않기로 했으면) 임시 파일을 지우고 False를 반환합니다.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        copy_file_mode(fd, path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        if replace is None:
+            os.replace(temp_path, path)
+        elif replace(temp_path, path) is False:
+            os.remove(temp_path)
+            return False
+        return True
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class PersistenceService:
+    """저장 요청을 모아 백그라운드 스레드에서 원자적으로 기록합니다.
+
+    같은 파일에 대한 요청은 디바운스 구간 동안 하나로 합쳐지고, 구간이 끝나면
+    메인 스레드에서 prepare()로 스냅샷을 떠서 작성 스레드에 넘깁니다.
+    prepare()는 (저장할 데이터, 기록 후 콜백 또는 None)을 반환하며, 파일 교체를
+    직접 하려면 세 번째 값으로 replace(임시 경로, 경로)를 덧붙입니다
+    (write_json_atomic 참고, 기록 후 콜백은 교체했을 때만 부름). JSON이 아닌
+    형식으로 쓰려면 request()에 write_json_atomic과 같은 모양의 write를 줍니다.
+    call_later가 None이면(화면 없이 실행할 때) 요청을 모아 두었다가
+    flush()나 close() 때 한 번에 기록합니다.
+    """
+
+    def __init__(self, call_later, debounce_ms=300, on_error=None):
+        self.call_later = call_later  # 예: root.after, 없으면 None
+        self.debounce_ms = debounce_ms
+        self.on_error = on_error
+        self.pending = {}  # 경로 -> (prepare 함수, 쓰기 함수)
+        self.timer_scheduled = False
+
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def request(self, path, prepare, write=None):
+        """path 저장을 예약합니다. 디바운스 구간 안의 요청은 하나로 합쳐집니다.
+
+        write가 None이면 기록할 때 write_json_atomic을 모듈 전역 이름으로 찾습니다
+        (계측 도구가 바꿔 끼운 함수를 쓰도록).
+        """
+        self.pending[path] = (prepare, write)
+        if self.call_later and not self.timer_scheduled:
+            self.timer_scheduled = True
+            self.call_later(self.debounce_ms, self._dispatch)
+
+    def _dispatch(self):
+        """예약된 저장의 스냅샷을 만들어 작성 스레드로 넘깁니다 (메인 스레드)."""
+        self.timer_scheduled = False
+        pending, self.pending = self.pending, {}
+        for path, (prepare, write) in pending.items():
+            data, on_written, *replace = prepare()
+            self.jobs.put((path, data, on_written, replace[0] if replace else None, write))
+
+    def _writer_loop(self):
+        """작성 스레드: 큐에 들어온 순서대로 파일을 기록합니다."""
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                path, data, on_written, replace, write = job
+                if (write or write_json_atomic)(path, data, replace) and on_written:
+                    on_written()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                self.jobs.task_done()
+
+    def flush(self):
+        """예약된 저장을 즉시 내보내고 모두 기록될 때까지 기다립니다."""
+        if self.pending:
+            self._dispatch()
+        self.jobs.join()
+
+    def close(self):
+        """남은 저장을 모두 마치고 작성 스레드를 종료합니다."""
+        self.flush()
+        self.jobs.put(None)
+        self.thread.join()
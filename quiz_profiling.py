@@ -0,0 +1,225 @@
+"""핵심 경로의 지연 시간과 파일 입출력 양을 재는 선택적 계측 도구입니다.
+
+환경 변수 QUIZ_PROFILE로 켭니다 (설정하지 않으면 아무것도 감싸지 않으므로
+비용이 없습니다).
+    QUIZ_PROFILE=1         함수별 지연 시간 분포(p50/p95/p99)와 입출력 바이트 수를
+                           종료할 때 출력
+    QUIZ_PROFILE=cprofile  cProfile로 전체 실행을 기록해 종료할 때 파일로 저장
+QUIZ_PROFILE_OUTPUT으로 보고서/cProfile 파일 경로를 바꿀 수 있습니다
+(기본: quiz_profile.txt, quiz_profile.prof).
+"""
+import atexit
+import cProfile
+import functools
+import math
+import os
+import sys
+import threading
+import time
+
+import quiz_persistence
+from quiz_journal import AnswerJournal
+from quiz_storage import BankQuestionStore, JsonQuestionStore, SqliteQuestionStore
+
+
+ENV_VAR = "QUIZ_PROFILE"
+OUTPUT_ENV_VAR = "QUIZ_PROFILE_OUTPUT"
+
+# 엔진에서 시간을 잴 메서드 (화면 쪽 목록은 호출하는 곳에서 정함)
+ENGINE_HOT_PATHS = ("load", "load_data", "start_session", "next_question", "check_answer",
+                    "grade_batch", "filtered_questions", "count_filtered", "search",
+                    "import_questions", "reset_wrong_counts", "analytics")
+
+
+class LatencyHistogram:
+    """로그 간격 구간(약 19%)에 횟수만 세는 지연 시간 분포입니다.
+
+    표본을 모두 보관하지 않으므로 오래 실행해도 메모리가 늘지 않습니다.
+    """
+
+    BASE = 2 ** 0.25
+    MIN_SECONDS = 1e-6
+
+    def __init__(self):
+        self.buckets = {}  # 구간 번호 -> 횟수
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        bucket = 0 if seconds <= self.MIN_SECONDS else math.ceil(math.log(seconds / self.MIN_SECONDS, self.BASE))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """fraction(0~1) 분위수의 근삿값 (해당 구간의 상한, 최댓값 이하)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.max, self.MIN_SECONDS * self.BASE ** bucket)
+        return self.max
+
+
+class Profiler:
+    """지연 시간 분포와 입출력 바이트 수를 모으고 종료할 때 보고합니다."""
+
+    def __init__(self, mode, output_path=None):
+        self.mode = mode
+        self.output_path = output_path
+        self.histograms = {}
+        self.io_bytes = {}  # 종류 -> 바이트 수
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.profile = None
+        if mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def record(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def add_bytes(self, kind, count):
+        with self.lock:
+            self.io_bytes[kind] = self.io_bytes.get(kind, 0) + count
+
+    def timed(self, name, func):
+        """func를 호출할 때마다 걸린 시간을 name으로 기록하는 함수를 반환합니다."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    def instrument(self, cls, names):
+        """클래스의 메서드들을 시간 재는 함수로 바꿉니다 (객체를 만들기 전에 호출)."""
+        if self.mode != "timing":
+            return
+        for name in names:
+            setattr(cls, name, self.timed(f"{cls.__name__}.{name}", getattr(cls, name)))
+
+    def install_io_hooks(self):
+        """파일 읽기/쓰기 지점을 감싸 시간과 바이트 수를 기록합니다."""
+        profiler = self
+        write_json_atomic = quiz_persistence.write_json_atomic
+
+        def timed_write(path, data, replace=None):
+            start = time.perf_counter()
+            written = write_json_atomic(path, data, replace)
+            profiler.record("파일 쓰기 (write_json_atomic)", time.perf_counter() - start)
+            profiler.add_bytes(f"쓰기 {os.path.basename(path)}", os.path.getsize(path))
+            return written
+        # 작성 스레드는 호출할 때마다 모듈 전역 이름으로 찾으므로 모듈 속성을 바꿈
+        quiz_persistence.write_json_atomic = timed_write
+
+        append_records = AnswerJournal.append_records
+
+        def timed_append(journal, records):
+            before = os.path.getsize(journal.path) if os.path.exists(journal.path) else 0
+            start = time.perf_counter()
+            append_records(journal, records)
+            profiler.record("저널 기록 (AnswerJournal.append_records)", time.perf_counter() - start)
+            if os.path.exists(journal.path):
+                profiler.add_bytes("쓰기 저널", max(0, os.path.getsize(journal.path) - before))
+        AnswerJournal.append_records = timed_append
+
+        write_file = BankQuestionStore.write_file
+
+        def timed_write_file(store, path, data, replace=None):
+            before = os.path.getsize(path) if os.path.exists(path) else 0
+            start = time.perf_counter()
+            written = write_file(store, path, data, replace)
+            profiler.record("파일 쓰기 (BankQuestionStore.write_file)", time.perf_counter() - start)
+            if written and os.path.exists(path):
+                # 바뀐 블록만 덧붙였으면 늘어난 만큼, 새로 썼으면 파일 전체
+                size = os.path.getsize(path)
+                profiler.add_bytes(f"쓰기 {os.path.basename(path)}", size if data["rewrite"] else max(0, size - before))
+            return written
+        BankQuestionStore.write_file = timed_write_file
+
+        for cls in (JsonQuestionStore, BankQuestionStore):
+            self.instrument(cls, ("save",))
+        for cls in (JsonQuestionStore, SqliteQuestionStore):
+            self.instrument(cls, ("load",))
+            load = cls.load
+
+            def counted_load(store, load=load):
+                questions = load(store)
+                if os.path.exists(store.path):
+                    profiler.add_bytes(f"읽기 {os.path.basename(store.path)}", os.path.getsize(store.path))
+                return questions
+            cls.load = functools.wraps(load)(counted_load)
+
+        self.instrument(quiz_persistence.PersistenceService, ("_dispatch",))
+
+    def watch_event_loop(self, root, interval_ms=50):
+        """Tk 이벤트 루프가 예정보다 늦게 도는 정도(처리기 + 다시 그리기)를 기록합니다."""
+        if self.mode != "timing":
+            return
+        expected = [time.perf_counter() + interval_ms / 1000]
+
+        def probe():
+            now = time.perf_counter()
+            self.record("Tk 이벤트 루프 지연", max(0.0, now - expected[0]))
+            expected[0] = now + interval_ms / 1000
+            root.after(interval_ms, probe)
+        root.after(interval_ms, probe)
+
+    def report(self):
+        """지연 시간 분포와 입출력 양을 표로 만듭니다."""
+        lines = [f"퀴즈마스터 계측 보고서 (실행 시간 {time.perf_counter() - self.started:.1f}초)", ""]
+        lines.append(f"{'항목':<44} {'횟수':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'최대':>9} (ms)")
+        with self.lock:
+            histograms = sorted(self.histograms.items(), key=lambda item: -item[1].total)
+            io_bytes = sorted(self.io_bytes.items())
+        for name, histogram in histograms:
+            values = [histogram.percentile(0.5), histogram.percentile(0.95),
+                      histogram.percentile(0.99), histogram.max]
+            lines.append(f"{name:<44} {histogram.count:>7} " + " ".join(f"{v * 1000:>9.2f}" for v in values))
+        if io_bytes:
+            lines.append("")
+            lines.append("파일 입출력:")
+            for kind, count in io_bytes:
+                lines.append(f"  {kind:<40} {count:>14,} bytes")
+        return "\n".join(lines)
+
+    def finish(self):
+        """종료할 때 보고서를 출력/저장하거나 cProfile 기록을 저장합니다."""
+        if self.profile is not None:
+            self.profile.disable()
+            path = self.output_path or "quiz_profile.prof"
+            self.profile.dump_stats(path)
+            print(f"cProfile 기록을 저장했습니다: {path} (python -m pstats {path})", file=sys.stderr)
+            return
+        report = self.report()
+        print(report, file=sys.stderr)
+        path = self.output_path or "quiz_profile.txt"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(report + "\n")
+
+
+def start_profiling(engine_class=None):
+    """QUIZ_PROFILE이 설정되어 있으면 계측을 시작하고 Profiler를, 아니면 None을 반환합니다."""
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "off", "false"):
+        return None
+    mode = "cprofile" if value == "cprofile" else "timing"
+    profiler = Profiler(mode, os.environ.get(OUTPUT_ENV_VAR))
+    if mode == "timing":
+        profiler.install_io_hooks()
+        if engine_class is not None:
+            profiler.instrument(engine_class, ENGINE_HOT_PATHS)
+    atexit.register(profiler.finish)
+    return profiler
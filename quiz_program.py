@@ -1,8 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import json
-import random
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import base64
 import os
+import threading
+import time
+
+from quiz_batch import QuestionBatch
+from quiz_engine import PRACTICE_MODES, STORAGE_POLL_MS, QuizEngine
+from quiz_import import QuestionImporter
+from quiz_media import AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, MediaCache, check_media_file, play_audio
+from quiz_profiling import start_profiling
+from quiz_question_list import VirtualQuestionList
 
 class QuizProgram:
     def __init__(self, root):
@@ -11,68 +19,121 @@ class QuizProgram:
         self.root.geometry("800x600")
         self.root.resizable(True, True)
         
-        # 문제 데이터 저장소
-        self.questions = []
-        self.data_file = "quiz_data.json"
-        self.settings_file = "quiz_settings.json"
-        
-        # 설정값
-        self.settings = {
-            "min_wrong_count": 0,
-            "random_mode": True,
-            "current_question_index": 0
-        }
+        # 퀴즈 로직과 데이터는 엔진이 관리하고, 이 클래스는 화면만 담당
+        # (저장은 디바운스 후 백그라운드 스레드에서 원자적으로 수행)
+        self.engine = QuizEngine(call_later=self.root.after, on_error=self.on_save_error)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # 현재 화면 관리
         self.current_frame = None
+        self.home_visible = False
         
-        # 데이터 로드
-        self.load_data()
-        self.load_settings()
+        # 첨부 이미지는 보여 줄 때 읽고 디코딩한 이미지를 LRU로 보관 (처음 쓸 때 만듦)
+        self.media = None
+        self.media_polling = False
+        
+        # 홈 화면에서 문제 편집 되돌리기/다시 실행 (글자 입력 칸에서는 무시)
+        self.root.bind("<Control-z>", lambda event: self.on_undo_key(event, self.engine.undo, "되돌림"))
+        self.root.bind("<Control-y>", lambda event: self.on_undo_key(event, self.engine.redo, "다시 실행"))
+        
+        # 같은 데이터를 연 다른 창의 변경을 주기적으로 확인해 바뀐 행만 반영
+        self.engine.on_storage_changed = self.on_storage_changed
+        self.root.after(STORAGE_POLL_MS, self.poll_storage)
         
-        # 메인 화면 표시
+        # 메인 화면을 먼저 그리고 데이터는 백그라운드에서 로드
+        self.loading = True
         self.show_home_screen()
+        self.load_data()
+    
+    @property
+    def questions(self):
+        """엔진이 관리하는 문제 목록"""
+        return self.engine.questions
+    
+    @property
+    def settings(self):
+        """엔진이 관리하는 설정값"""
+        return self.engine.settings
     
     def load_data(self):
-        """JSON 파일에서 문제 데이터를 불러옵니다."""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    self.questions = json.load(f)
-            else:
-                self.questions = []
-        except Exception as e:
-            messagebox.showerror("오류", f"데이터 로드 중 오류가 발생했습니다: {str(e)}")
-            self.questions = []
+        """설정과 문제 데이터를 작업 스레드에서 불러옵니다 (그동안 화면은 계속 응답)."""
+        self.run_loading(self.engine.load)
     
-    def load_settings(self):
-        """설정 파일에서 설정값을 불러옵니다."""
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
-                    self.settings.update(loaded_settings)
-        except Exception as e:
-            print(f"설정 로드 중 오류: {str(e)}")
+    def open_deck(self, name):
+        """다른 덱으로 바꿉니다 (처음 여는 덱은 작업 스레드에서 불러옴)."""
+        if name == self.engine.workspace.current:
+            return
+        self.loading = True
+        self.show_home_screen()
+        self.run_loading(lambda: self.engine.open_deck(name))
     
-    def save_settings(self):
-        """설정값을 JSON 파일에 저장합니다."""
-        try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            messagebox.showerror("오류", f"설정 저장 중 오류가 발생했습니다: {str(e)}")
+    def run_loading(self, load):
+        """load를 작업 스레드에서 실행하고 끝나면 메인 화면을 다시 그립니다."""
+        self.loading = True
+        result = {}
+        
+        def run():
+            try:
+                load()
+            except Exception as e:
+                result["error"] = e
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.root.after(50, lambda: self.poll_loading(thread, result))
     
-    def save_data(self):
-        """문제 데이터를 JSON 파일에 저장합니다."""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.questions, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            messagebox.showerror("오류", f"데이터 저장 중 오류가 발생했습니다: {str(e)}")
+    def poll_loading(self, thread, result):
+        """로드가 끝났는지 확인하고, 끝났으면 메인 화면을 다시 그립니다."""
+        if thread.is_alive():
+            self.root.after(50, lambda: self.poll_loading(thread, result))
+            return
+        self.loading = False
+        if self.engine.deck is not None:
+            # 너무 많이 열린 덱을 닫고 현재 덱을 덱 목록에 기록 (메인 스레드에서)
+            self.engine.release_unused_decks()
+        self.show_home_screen()
+        if "error" in result:
+            messagebox.showerror("오류", f"데이터 로드 중 오류가 발생했습니다: {str(result['error'])}")
+        if self.engine.deck is not None:
+            # 검색 색인은 화면을 그린 뒤 조금씩 만듦
+            self.engine.build_search_index()
+    
+    def poll_storage(self):
+        """다른 창(인스턴스)의 변경을 확인합니다 (불러오는 중에는 건너뜀)."""
+        if not self.loading:
+            self.engine.poll_storage()
+        self.root.after(STORAGE_POLL_MS, self.poll_storage)
+    
+    def on_storage_changed(self, deck, changes):
+        """다른 창에서 바뀐 문제를 홈 화면 목록에 반영합니다 (보이는 행 중 바뀐 행만 다시 표시)."""
+        if self.loading or not self.home_visible or deck is not self.engine.deck:
+            return
+        self.deck_summary_label.config(text=self.deck_summary_text())
+        if self.question_list.rows is not None:
+            # 검색 중이면 검색 결과를 다시 구함
+            self.update_search_results()
+            return
+        if changes["deleted"]:
+            self.question_list.delete_rows(changes["deleted"])
+        if changes["added"]:
+            self.question_list.insert_rows(changes["added"])
+        if changes["reset"]:
+            self.question_list.refresh()
+        elif changes["updated"]:
+            self.question_list.update_ids(changes["updated"])
+    
+    def on_save_error(self, error):
+        """저장 스레드에서 발생한 오류를 메인 스레드에서 알립니다."""
+        self.root.after(0, lambda: messagebox.showerror("오류", f"저장 중 오류가 발생했습니다: {str(error)}"))
+    
+    def on_close(self):
+        """창을 닫기 전에 남은 저장을 모두 기록합니다."""
+        self.engine.close()
+        self.root.destroy()
     
     def clear_frame(self):
         """현재 화면을 지웁니다."""
+        self.home_visible = False
         if self.current_frame:
             self.current_frame.destroy()
     
@@ -87,6 +148,34 @@ class QuizProgram:
                               font=("Arial", 20, "bold"))
         title_label.pack(pady=(0, 20))
         
+        # 덱 선택 (덱 목록 파일의 요약만 읽으므로 덱 파일을 열지 않음)
+        deck_frame = tk.Frame(self.current_frame)
+        deck_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Label(deck_frame, text="덱:", font=("Arial", 11, "bold")).pack(side=tk.LEFT)
+        
+        self.deck_var = tk.StringVar(value=self.engine.workspace.current)
+        deck_combo = ttk.Combobox(deck_frame, textvariable=self.deck_var, 
+                                  values=self.engine.deck_names(), state="readonly", width=20)
+        deck_combo.pack(side=tk.LEFT, padx=(5, 10))
+        deck_combo.bind("<<ComboboxSelected>>", lambda event: self.open_deck(self.deck_var.get()))
+        
+        self.deck_summary_label = tk.Label(deck_frame, text=self.deck_summary_text(), 
+                                           font=("Arial", 10), fg="#666666")
+        self.deck_summary_label.pack(side=tk.LEFT)
+        
+        # 덱 합쳐 연습 버튼
+        merge_btn = tk.Button(deck_frame, text="덱 합쳐 연습", 
+                             command=self.start_merged_practice, 
+                             bg="#3F51B5", fg="white", font=("Arial", 10, "bold"))
+        merge_btn.pack(side=tk.RIGHT)
+        
+        # 새 덱 버튼
+        new_deck_btn = tk.Button(deck_frame, text="새 덱", 
+                                command=self.create_deck, 
+                                bg="#00BCD4", fg="white", font=("Arial", 10, "bold"))
+        new_deck_btn.pack(side=tk.RIGHT, padx=(0, 10))
+        
         # 문제 관리 프레임
         management_frame = tk.LabelFrame(self.current_frame, text="문제 관리", 
                                        font=("Arial", 12, "bold"))
@@ -108,90 +197,239 @@ class QuizProgram:
                               bg="#f44336", fg="white", font=("Arial", 10, "bold"))
         delete_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        # 문제 가져오기 버튼
+        import_btn = tk.Button(button_frame, text="가져오기", 
+                              command=self.import_questions, 
+                              bg="#607D8B", fg="white", font=("Arial", 10, "bold"))
+        import_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # 중복 찾기 버튼
+        duplicates_btn = tk.Button(button_frame, text="중복 찾기", 
+                                  command=self.show_duplicates, 
+                                  bg="#795548", fg="white", font=("Arial", 10, "bold"))
+        duplicates_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # 내보내기 버튼
+        export_btn = tk.Button(button_frame, text="내보내기", 
+                              command=self.export_questions, 
+                              bg="#009688", fg="white", font=("Arial", 10, "bold"))
+        export_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         # 설정 버튼
         settings_btn = tk.Button(button_frame, text="설정", 
                                 command=self.show_settings, 
                                 bg="#9C27B0", fg="white", font=("Arial", 10, "bold"))
         settings_btn.pack(side=tk.RIGHT, padx=(0, 10))
         
+        # 결과 분석 버튼
+        analytics_btn = tk.Button(button_frame, text="결과 분석", 
+                                 command=self.show_analytics_screen, 
+                                 bg="#009688", fg="white", font=("Arial", 10, "bold"))
+        analytics_btn.pack(side=tk.RIGHT, padx=(0, 10))
+        
         # 연습하기 버튼
         practice_btn = tk.Button(button_frame, text="연습하기", 
                                 command=self.start_practice, 
                                 bg="#2196F3", fg="white", font=("Arial", 10, "bold"))
         practice_btn.pack(side=tk.RIGHT)
         
-        # 문제 리스트 표시
-        self.create_question_list(management_frame)
-    
-    def create_question_list(self, parent):
-        """문제 리스트를 표 형식으로 표시합니다."""
-        # 스크롤바가 있는 프레임
-        list_frame = tk.Frame(parent)
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-        
-        # 트리뷰 생성
-        columns = ("번호", "문제", "정답", "틀린 횟수")
-        self.question_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=15)
-        
-        # 더블클릭 이벤트 바인딩
-        self.question_tree.bind('<Double-1>', self.edit_question)
+        # 검색 (입력할 때마다 문제/정답에서 찾아 목록에 표시)
+        search_frame = tk.Frame(management_frame)
+        search_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
         
-        # 컬럼 설정
-        self.question_tree.heading("번호", text="번호")
-        self.question_tree.heading("문제", text="문제")
-        self.question_tree.heading("정답", text="정답")
-        self.question_tree.heading("틀린 횟수", text="틀린 횟수")
+        tk.Label(search_frame, text="검색:", font=("Arial", 10)).pack(side=tk.LEFT)
         
-        self.question_tree.column("번호", width=50, anchor="center")
-        self.question_tree.column("문제", width=400)
-        self.question_tree.column("정답", width=150)
-        self.question_tree.column("틀린 횟수", width=80, anchor="center")
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=("Arial", 10))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 10))
         
-        # 스크롤바
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.question_tree.yview)
-        self.question_tree.configure(yscrollcommand=scrollbar.set)
+        self.search_result_label = tk.Label(search_frame, text="", font=("Arial", 10), fg="#666666")
+        self.search_result_label.pack(side=tk.RIGHT)
         
-        # 배치
-        self.question_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # 문제 리스트 표시
+        self.create_question_list(management_frame)
         
-        # 데이터 로드
-        self.refresh_question_list()
+        # 로드 중에는 빈 목록만 보여 주고 버튼과 검색을 잠금
+        if self.loading:
+            for widget in (add_btn, delete_btn, import_btn, duplicates_btn, export_btn, settings_btn, analytics_btn,
+                           practice_btn, search_entry, deck_combo, merge_btn, new_deck_btn):
+                widget.config(state=tk.DISABLED)
+            self.search_result_label.config(text="문제를 불러오는 중...")
+        self.home_visible = True
+    
+    def deck_summary_text(self):
+        """현재 덱의 문제 수와 틀린 문제 수"""
+        if self.engine.deck is None:
+            return ""
+        summary = self.engine.deck_summary(self.engine.workspace.current)
+        return f"문제 {summary['count']}개 | 틀린 문제 {summary['wrong_questions']}개"
+    
+    def create_deck(self):
+        """새 덱을 만들고 그 덱으로 바꿉니다."""
+        name = simpledialog.askstring("새 덱", "덱 이름을 입력하세요:", parent=self.root)
+        if name is None:
+            return
+        try:
+            self.engine.create_deck(name)
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            return
+        self.open_deck(name.strip())
+    
+    def start_merged_practice(self):
+        """여러 덱을 골라 합쳐서 연습합니다."""
+        dialog = MergeDecksDialog(self.root, self.engine)
+        if dialog.result:
+            self.show_practice_screen(deck_names=dialog.result)
+    
+    def create_question_list(self, parent):
+        """문제 리스트를 표 형식으로 표시합니다."""
+        # 보이는 구간의 행만 만드는 가상 목록 (더블클릭 시 수정)
+        self.question_list = VirtualQuestionList(parent, self.questions, self.edit_question)
+        self.question_tree = self.question_list.tree
+        self.search_var.trace_add("write", lambda *args: self.update_search_results())
+        
+        # 오른쪽 클릭 메뉴 (선택한 문제를 한꺼번에 변경)
+        self.list_menu = tk.Menu(self.root, tearoff=0)
+        self.list_menu.add_command(label="정답 바꾸기...", command=self.edit_selected_answers)
+        self.list_menu.add_command(label="틀린 횟수 초기화", 
+                                   command=lambda: self.apply_to_selected(
+                                       lambda ids: QuestionBatch().reset_wrong_counts(ids), "틀린 횟수 초기화"))
+        self.list_menu.add_command(label="틀린 횟수 +1", 
+                                   command=lambda: self.apply_to_selected(
+                                       lambda ids: QuestionBatch().adjust_wrong_counts(ids, 1), "틀린 횟수 +1"))
+        self.list_menu.add_command(label="틀린 횟수 -1", 
+                                   command=lambda: self.apply_to_selected(
+                                       lambda ids: QuestionBatch().adjust_wrong_counts(ids, -1), "틀린 횟수 -1"))
+        self.list_menu.add_separator()
+        self.list_menu.add_command(label="선택 문제 삭제", command=self.delete_question)
+        self.question_tree.bind('<Button-3>', self.show_list_menu)
+    
+    def show_list_menu(self, event):
+        """오른쪽 클릭한 행이 선택되어 있지 않으면 그 행만 선택하고 메뉴를 엽니다."""
+        if self.loading:
+            return
+        item = self.question_tree.identify_row(event.y)
+        if item:
+            index = self.question_list.index_of(item)
+            if index not in self.question_list.selected:
+                self.question_list.selected = {index}
+                self.question_list.render()
+        self.list_menu.tk_popup(event.x_root, event.y_root)
+    
+    def selected_question_ids(self):
+        """선택한 문제들의 ID 목록 (목록 위치는 다른 창의 변경으로 밀릴 수 있으므로 묻기 전에 ID로 떼어 둠)"""
+        ids = self.questions.ids
+        return [ids[index] for index in self.question_list.selected_indices()]
+    
+    def apply_to_selected(self, make_batch, label, question_ids=None):
+        """선택한 문제들에 일괄 작업을 적용하고 목록을 한 번만 새로고침합니다 (Ctrl+Z로 label 되돌리기).
+        
+        question_ids를 주면 지금 선택 대신 그 문제들에 적용합니다 (확인 창을 띄우기 전에 떼어 둔 ID).
+        실패하거나 선택한 문제가 없으면 경고를 보여 주고 None을 반환합니다.
+        """
+        if question_ids is None:
+            question_ids = self.selected_question_ids()
+        if not question_ids:
+            messagebox.showwarning("경고", "변경할 문제를 선택해주세요.")
+            return None
+        try:
+            result = self.engine.apply_batch(make_batch(question_ids), label)
+        except ValueError as e:
+            messagebox.showwarning("경고", str(e))
+            return None
+        if result["deleted"]:
+            self.question_list.delete_rows(result["deleted"])
+            if self.question_list.rows is not None:
+                self.search_result_label.config(text=f"{len(self.question_list.rows)}개 찾음")
+        else:
+            self.question_list.refresh()
+        return result
+    
+    def edit_selected_answers(self):
+        """선택한 문제들의 정답을 한꺼번에 바꿉니다."""
+        question_ids = self.selected_question_ids()
+        count = len(question_ids)
+        if not count:
+            messagebox.showwarning("경고", "변경할 문제를 선택해주세요.")
+            return
+        answer = simpledialog.askstring("정답 바꾸기", f"선택한 {count}개 문제의 새 정답을 입력하세요:", 
+                                        parent=self.root)
+        if answer is None:
+            return
+        self.apply_to_selected(lambda ids: QuestionBatch().edit_answers({question_id: answer for question_id in ids}),
+                               "정답 바꾸기", question_ids)
+    
+    def on_undo_key(self, event, action, verb):
+        """Ctrl+Z/Ctrl+Y: 검색창이나 답 입력칸에서 누른 것이면 문제 편집을 되돌리지 않습니다."""
+        if isinstance(event.widget, (tk.Entry, ttk.Entry, tk.Text)):
+            return
+        self.undo_edit(action, verb)
+    
+    def undo_edit(self, action, verb):
+        """engine.undo 또는 engine.redo를 실행하고 바뀐 행만 목록에 반영합니다."""
+        if self.loading or not self.home_visible:
+            return
+        try:
+            label, result = action()
+        except ValueError:
+            # 되돌릴(다시 실행할) 작업이 없음
+            self.root.bell()
+            return
+        if result["deleted"]:
+            self.question_list.delete_rows(result["deleted"])
+        if self.question_list.rows is not None:
+            self.update_search_results()
+        elif result["restored"]:
+            # 되살린 문제를 선택해서 보여 줌
+            self.question_list.selected = set(result["restored"])
+            self.question_list.see(result["restored"][0])
+        else:
+            self.question_list.refresh()
+        if self.question_list.rows is None:
+            self.search_result_label.config(text=f"{verb}: {label}")
+    
+    def update_search_results(self):
+        """검색어에 맞는 문제만 목록에 표시합니다 (검색어가 없으면 전체)."""
+        rows = self.engine.search(self.search_var.get())
+        self.question_list.set_rows(rows)
+        if rows is None:
+            self.search_result_label.config(text="")
+        else:
+            self.search_result_label.config(text=f"{len(rows)}개 찾음")
     
     def refresh_question_list(self):
         """문제 리스트를 새로고침합니다."""
-        # 기존 데이터 삭제
-        for item in self.question_tree.get_children():
-            self.question_tree.delete(item)
-        
-        # 새 데이터 추가
-        for i, question in enumerate(self.questions, 1):
-            self.question_tree.insert("", "end", values=(
-                i,
-                question["question"][:50] + "..." if len(question["question"]) > 50 else question["question"],
-                question["answer"],
-                question["wrong_count"]
-            ))
+        self.question_list.refresh()
     
     def add_question(self):
         """새 문제를 추가합니다."""
         dialog = QuestionDialog(self.root, "문제 추가")
         if dialog.result:
-            question_text = dialog.result["question"]
-            answer_text = dialog.result["answer"]
-            
-            if question_text and answer_text:
-                new_question = {
-                    "question": question_text,
-                    "answer": answer_text,
-                    "wrong_count": 0
-                }
-                self.questions.append(new_question)
-                self.save_data()
-                self.refresh_question_list()
-                messagebox.showinfo("성공", "문제가 추가되었습니다!")
-            else:
-                messagebox.showwarning("경고", "문제와 정답을 모두 입력해주세요.")
+            if not self.confirm_duplicate(dialog.result["question"]):
+                return
+            try:
+                self.engine.add_question(dialog.result["question"], dialog.result["answer"],
+                                         dialog.result["media"])
+            except ValueError as e:
+                messagebox.showwarning("경고", str(e))
+                return
+            index = len(self.questions) - 1
+            self.question_list.insert_row(index)
+            # 검색 중이면 새 문제가 검색어에 맞을 때만 목록에 나타남
+            if self.question_list.rows is not None:
+                self.update_search_results()
+                self.question_list.see(index)
+            messagebox.showinfo("성공", "문제가 추가되었습니다!")
+    
+    def confirm_duplicate(self, question_text, exclude_id=None):
+        """같은 문제가 이미 있으면 그래도 저장할지 묻습니다 (저장해도 되면 True)."""
+        existing = self.engine.find_duplicate(question_text, exclude_id)
+        if existing is None:
+            return True
+        return messagebox.askyesno(
+            "중복 확인",
+            f"같은 문제가 이미 있습니다.\n\n문제: {existing['question']}\n정답: {existing['answer']}\n\n그래도 저장하시겠습니까?")
     
     def edit_question(self, event):
         """선택된 문제를 수정합니다."""
@@ -200,34 +438,37 @@ class QuizProgram:
             return
         
         item = selection[0]
-        index = self.question_tree.index(item)
+        index = self.question_list.index_of(item)
         question = self.questions[index]
         
         # 수정 다이얼로그 표시
         dialog = QuestionDialog(self.root, "문제 수정", question)
         if dialog.result:
-            question_text = dialog.result["question"]
-            answer_text = dialog.result["answer"]
-            
-            if question_text and answer_text:
-                # 문제 수정
-                self.questions[index]["question"] = question_text
-                self.questions[index]["answer"] = answer_text
-                self.save_data()
-                self.refresh_question_list()
-                messagebox.showinfo("성공", "문제가 수정되었습니다!")
-            else:
-                messagebox.showwarning("경고", "문제와 정답을 모두 입력해주세요.")
+            if not self.confirm_duplicate(dialog.result["question"], question["id"]):
+                return
+            # 대화 상자가 열린 동안 다른 창의 변경으로 위치가 바뀌었을 수 있으므로 ID로 다시 찾음
+            question_id = question["id"]
+            positions = self.questions.positions_of_ids({question_id})
+            try:
+                if not positions:
+                    raise ValueError("다른 창에서 삭제된 문제입니다.")
+                self.engine.update_question(positions[0], dialog.result["question"], dialog.result["answer"],
+                                            dialog.result["media"])
+            except ValueError as e:
+                messagebox.showwarning("경고", str(e))
+                return
+            self.question_list.update_ids({question_id})
+            messagebox.showinfo("성공", "문제가 수정되었습니다!")
     
     def delete_question(self):
         """선택된 문제를 삭제합니다."""
-        selection = self.question_tree.selection()
-        if not selection:
+        question_ids = self.selected_question_ids()
+        if not question_ids:
             messagebox.showwarning("경고", "삭제할 문제를 선택해주세요.")
             return
         
         # 선택된 문제 개수에 따른 메시지
-        count = len(selection)
+        count = len(question_ids)
         if count == 1:
             confirm_msg = "선택한 문제를 삭제하시겠습니까?"
             success_msg = "문제가 삭제되었습니다!"
@@ -236,28 +477,104 @@ class QuizProgram:
             success_msg = f"{count}개의 문제가 삭제되었습니다!"
         
         if messagebox.askyesno("확인", confirm_msg):
-            # 선택된 모든 문제의 인덱스를 구하고 내림차순으로 정렬 (뒤에서부터 삭제)
-            indices = []
-            for item in selection:
-                index = self.question_tree.index(item)
-                indices.append(index)
-            indices.sort(reverse=True)  # 뒤에서부터 삭제해야 인덱스가 꼬이지 않음
-            
-            # 선택된 모든 문제 삭제
-            for index in indices:
-                del self.questions[index]
-            
-            self.save_data()
-            self.refresh_question_list()
-            messagebox.showinfo("성공", success_msg)
+            # 확인 창을 띄운 동안 목록이 바뀌었어도 물어본 문제만 지움
+            result = self.apply_to_selected(lambda ids: QuestionBatch().delete(ids), "삭제", question_ids)
+            if result is not None:
+                messagebox.showinfo("성공", success_msg)
+    
+    def import_questions(self):
+        """CSV/TSV/JSONL 파일에서 문제를 한꺼번에 가져옵니다."""
+        path = filedialog.askopenfilename(
+            title="문제 가져오기",
+            filetypes=[("문제 파일", "*.csv *.tsv *.txt *.jsonl"), ("모든 파일", "*.*")])
+        if not path:
+            return
+        
+        # 파일 읽기와 검증은 작업 스레드에서 (진행 막대 표시)
+        importer = ImportDialog(self.root, path).importer
+        if importer.cancelled:
+            return
+        if importer.error:
+            messagebox.showerror("오류", f"파일을 읽는 중 오류가 발생했습니다: {str(importer.error)}")
+            return
+        
+        skipped_msg = ""
+        if importer.errors:
+            skipped_msg = f"\n\n건너뛴 줄: {len(importer.errors)}개\n" + "\n".join(str(e) for e in importer.errors[:5])
+        if not importer.questions:
+            messagebox.showwarning("경고", "가져올 문제가 없습니다." + skipped_msg)
+            return
+        
+        # 이미 있는 문제와 같은 문제가 있으면 처리 방법을 물어봄
+        on_duplicate = "add"
+        duplicate_count = self.engine.count_import_duplicates(importer.questions)
+        if duplicate_count:
+            answer = messagebox.askyesnocancel(
+                "중복 확인",
+                f"이미 있는 문제와 같은 문제가 {duplicate_count}개 있습니다.\n\n"
+                "예: 기존 문제에 합치기 (다른 정답만 '/'로 추가)\n"
+                "아니오: 그래도 모두 추가\n"
+                "취소: 가져오기 취소")
+            if answer is None:
+                return
+            on_duplicate = "merge" if answer else "add"
+        
+        # 저장과 목록 새로고침은 한 번만
+        result = self.engine.import_questions(importer.questions, on_duplicate)
+        if self.question_list.rows is not None:
+            self.update_search_results()
+        else:
+            self.question_list.refresh()
+        message = f"{len(result['added'])}개의 문제를 가져왔습니다!"
+        if result["merged"] or result["skipped"]:
+            message += f"\n정답을 합친 문제: {len(result['merged'])}개, 건너뛴 중복 문제: {result['skipped']}개"
+        messagebox.showinfo("성공", message + skipped_msg)
+    
+    def export_questions(self):
+        """연습 대상 문제를 틀린 횟수가 많은 순서로 CSV/XLSX/HTML 오답노트로 내보냅니다."""
+        path = filedialog.asksaveasfilename(
+            title="오답노트 내보내기",
+            defaultextension=".html",
+            initialfile=f"{self.engine.workspace.current} 오답노트.html",
+            filetypes=[("인쇄용 오답노트", "*.html"), ("엑셀", "*.xlsx"), ("CSV", "*.csv")])
+        if not path:
+            return
+        try:
+            exporter = self.engine.exporter(path)
+        except ValueError as e:
+            messagebox.showerror("오류", str(e))
+            return
+        if not exporter.total:
+            messagebox.showwarning("경고", f"틀린 횟수가 {exporter.min_wrong_count}회 이상인 문제가 없습니다.")
+            return
+        
+        # 파일 쓰기는 작업 스레드에서 (진행 막대 표시)
+        ExportDialog(self.root, exporter)
+        if exporter.cancelled:
+            return
+        if exporter.error:
+            messagebox.showerror("오류", f"파일을 쓰는 중 오류가 발생했습니다: {str(exporter.error)}")
+            return
+        messagebox.showinfo("성공", f"{exporter.rows_written:,}개의 문제를 내보냈습니다!\n{path}")
+    
+    def show_duplicates(self):
+        """서로 중복인 문제만 목록에 모아 보여줍니다."""
+        groups = self.engine.find_duplicates()
+        if not groups:
+            messagebox.showinfo("알림", "중복된 문제가 없습니다.")
+            return
+        
+        # 검색어를 지우고(전체 목록으로 돌아감) 중복 문제만 표시
+        self.search_var.set("")
+        rows = sorted(index for indices in groups for index in indices)
+        self.question_list.set_rows(rows)
+        self.search_result_label.config(text=f"중복 {len(groups)}묶음 ({len(rows)}개)")
     
     def show_settings(self):
         """설정 화면을 표시합니다."""
-        dialog = SettingsDialog(self.root, self.settings, self.save_settings, self)
+        dialog = SettingsDialog(self.root, self.engine, self)
         # 설정이 저장되었으면 연습 시작
         if dialog.result:
-            # 설정을 메인 클래스에 반영
-            self.settings.update(dialog.settings)
             self.start_practice()
     
     def start_practice(self):
@@ -266,45 +583,55 @@ class QuizProgram:
             messagebox.showwarning("경고", "문제가 없습니다. 먼저 문제를 추가해주세요.")
             return
         
-        # 필터링된 문제 목록 생성
-        filtered_questions = [q for q in self.questions if q["wrong_count"] >= self.settings["min_wrong_count"]]
-        
-        if not filtered_questions:
+        # 조건에 맞는 문제가 있는지 먼저 확인 (SQLite 저장소는 wrong_count 인덱스로 조회)
+        if not self.engine.count_filtered():
             messagebox.showwarning("경고", f"틀린 횟수가 {self.settings['min_wrong_count']}회 이상인 문제가 없습니다.")
             return
         
-        self.show_practice_screen(filtered_questions)
+        # 필터링된 문제 목록 생성 (간격 반복 모드는 엔진이 복습 대기열에서 직접 고름)
+        if self.settings["practice_mode"] == "spaced":
+            self.show_practice_screen()
+        else:
+            self.show_practice_screen(self.engine.filtered_questions())
     
-    def show_practice_screen(self, practice_questions=None):
+    def show_practice_screen(self, practice_questions=None, deck_names=None):
         """연습 화면을 표시합니다."""
+        # 연습 세션 초기화 (문제 목록이 없으면 전체 문제, deck_names가 있으면 그 덱들을 합침)
+        if deck_names:
+            try:
+                self.session = self.engine.start_merged_session(deck_names)
+            except Exception as e:
+                messagebox.showerror("오류", str(e))
+                return
+            if not self.session.total:
+                messagebox.showwarning("경고", "선택한 덱에 조건에 맞는 문제가 없습니다.")
+                return
+        else:
+            self.session = self.engine.start_session(practice_questions)
+        
+        # 간격 반복 모드에서 지금 복습할 문제가 없는 경우
+        if not self.session.total:
+            next_due = self.engine.next_review_time()
+            message = "지금 복습할 문제가 없습니다."
+            if next_due:
+                message += f"\n다음 복습 예정: {time.strftime('%Y-%m-%d %H:%M', time.localtime(next_due))}"
+            messagebox.showinfo("알림", message)
+            return
+        
         self.clear_frame()
         self.current_frame = tk.Frame(self.root)
         self.current_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # 연습할 문제 목록 설정
-        if practice_questions is None:
-            self.practice_questions = self.questions
-        else:
-            self.practice_questions = practice_questions
-        
-        # 연습 세션 초기화
-        self.used_questions = []  # 이미 출제된 문제들
-        self.wrong_count_session = 0  # 이번 세션에서 틀린 문제 수
-        self.total_questions = len(self.practice_questions)  # 총 문제 수
-        
-        # 순차 모드일 때 인덱스 초기화
-        if not self.settings["random_mode"]:
-            self.settings["current_question_index"] = 0
-        
         # 제목
         title_label = tk.Label(self.current_frame, text="연습하기", 
                               font=("Arial", 20, "bold"))
         title_label.pack(pady=(0, 10))
         
         # 설정 정보 표시
-        mode_text = "랜덤" if self.settings["random_mode"] else "순차"
+        mode_text = PRACTICE_MODES[self.settings["practice_mode"]]
         filter_text = f"틀린 횟수 ≥ {self.settings['min_wrong_count']}회"
-        info_text = f"출제 방식: {mode_text} | 필터: {filter_text} | 문제 수: {len(self.practice_questions)}개"
+        deck_text = ", ".join(deck_names) if deck_names else self.engine.workspace.current
+        info_text = f"덱: {deck_text} | 출제 방식: {mode_text} | 필터: {filter_text} | 문제 수: {self.session.total}개"
         info_label = tk.Label(self.current_frame, text=info_text, 
                              font=("Arial", 10), fg="gray")
         info_label.pack(pady=(0, 10))
@@ -323,6 +650,11 @@ class QuizProgram:
                                       font=("Arial", 14), wraplength=700, justify="left")
         self.question_label.pack(padx=10, pady=10)
         
+        # 첨부 이미지와 소리 (첨부된 문제에서만 보임)
+        self.image_label = tk.Label(question_frame)
+        self.audio_btn = tk.Button(question_frame, text="▶ 듣기", command=self.play_question_audio,
+                                   font=("Arial", 10))
+        
         # 답안 입력 프레임
         answer_frame = tk.LabelFrame(self.current_frame, text="답안 입력", 
                                     font=("Arial", 12, "bold"))
@@ -365,35 +697,21 @@ class QuizProgram:
     
     def next_question(self):
         """다음 문제를 표시합니다."""
-        if not hasattr(self, 'practice_questions') or not self.practice_questions:
+        if not self.session.total:
             return
         
-        # 아직 출제되지 않은 문제들만 필터링
-        available_questions = [q for q in self.practice_questions if q not in self.used_questions]
-        
-        # 모든 문제를 다 풀었는지 확인
-        if not available_questions:
+        # 엔진이 출제 방식(랜덤/순차)에 맞춰 다음 문제를 꺼냄 (모두 풀었으면 None)
+        question = self.engine.next_question()
+        if question is None:
             self.show_completion_dialog()
             return
         
-        # 랜덤 모드와 순차 모드에 따라 문제 선택
-        if self.settings["random_mode"]:
-            self.current_question = random.choice(available_questions)
-        else:
-            # 순차 모드 - 아직 출제되지 않은 문제 중에서 순서대로
-            remaining_indices = [i for i, q in enumerate(self.practice_questions) if q not in self.used_questions]
-            if remaining_indices:
-                next_index = min(remaining_indices)
-                self.current_question = self.practice_questions[next_index]
-        
-        # 출제된 문제 목록에 추가
-        self.used_questions.append(self.current_question)
-        
         # 진행 상황 업데이트
-        progress_text = f"진행: {len(self.used_questions)}/{self.total_questions} (틀린 문제: {self.wrong_count_session}개)"
+        progress_text = f"진행: {self.session.drawn_count}/{self.session.total} (틀린 문제: {self.session.wrong_count}개)"
         self.progress_label.config(text=progress_text)
         
-        self.question_label.config(text=self.current_question["question"])
+        self.question_label.config(text=question["question"])
+        self.show_question_media(question)
         self.answer_entry.delete(0, tk.END)
         self.result_label.config(text="")
         self.answer_entry.focus()
@@ -401,9 +719,6 @@ class QuizProgram:
         # 버튼 상태 초기화
         self.submit_btn.config(state="normal")
         self.next_btn.config(state="disabled")
-        
-        # 답안 확인 상태 초기화 (버그 수정)
-        self.answer_checked = False
     
     def on_enter_key(self, event):
         """엔터 키 이벤트 핸들러"""
@@ -414,76 +729,188 @@ class QuizProgram:
             # 다음 문제 버튼이 활성화되어 있으면 다음 문제로
             self.next_question()
     
-    def normalize_answer(self, answer):
-        """답안을 정규화합니다 (띄어쓰기 제거, 소문자 변환)."""
-        return ''.join(answer.split()).lower()
-    
     def check_answer(self):
         """답안을 확인합니다."""
-        if not hasattr(self, 'current_question'):
-            return
-        
-        # 이미 답안을 확인한 상태라면 무시 (버그 수정)
-        if hasattr(self, 'answer_checked') and self.answer_checked:
+        try:
+            # 이미 답안을 확인한 상태라면 None (버그 수정)
+            correct = self.engine.check_answer(self.answer_entry.get())
+        except Exception as e:
+            messagebox.showerror("오류", f"데이터 저장 중 오류가 발생했습니다: {str(e)}")
+            correct = False
+        if correct is None:
             return
         
-        user_answer = self.answer_entry.get().strip()
-        correct_answer = self.current_question["answer"].strip()
-        
-        # 띄어쓰기를 무시하고 비교
-        if self.normalize_answer(user_answer) == self.normalize_answer(correct_answer):
+        if correct:
             self.result_label.config(text="✅ 정답입니다!", fg="green")
-            # 답안 확인 상태로 설정 (버그 수정)
-            self.answer_checked = True
-            # 다음 문제 버튼 활성화
-            self.next_btn.config(state="normal")
-            self.submit_btn.config(state="disabled")
         else:
             # 틀렸을 때는 정답을 보여주고 멈춤
+            correct_answer = self.session.current_question["answer"].strip()
             self.result_label.config(text=f"❌ 틀렸습니다!\n정답: {correct_answer}", fg="red")
-            # 틀린 횟수 증가
-            self.current_question["wrong_count"] += 1
-            self.wrong_count_session += 1
-            self.save_data()
-            
-            # 답안 확인 상태로 설정 (버그 수정)
-            self.answer_checked = True
-            # 다음 문제 버튼 활성화
-            self.next_btn.config(state="normal")
-            self.submit_btn.config(state="disabled")
+        
+        # 다음 문제 버튼 활성화
+        self.next_btn.config(state="normal")
+        self.submit_btn.config(state="disabled")
+        
+        # 틀리면 출제 순서가 바뀔 수 있으므로 다음 문제의 이미지를 다시 미리 읽음
+        self.prefetch_next_media()
+    
+    def media_cache(self):
+        """첨부 이미지 캐시 (처음 쓸 때 만듦)"""
+        if self.media is None:
+            # 파일 읽기와 base64 변환은 작업 스레드에서, PhotoImage 디코딩은 메인 스레드에서 함
+            self.media = MediaCache(
+                decode=lambda data: tk.PhotoImage(data=data),
+                size_of=lambda image: image.width() * image.height() * 4,
+                max_bytes=self.settings["media_cache_mb"] * 1024 * 1024,
+                prepare=base64.b64encode)
+        return self.media
+    
+    def show_question_media(self, question):
+        """문제에 첨부된 이미지를 보여 주고 소리가 있으면 듣기 버튼을 보여 줍니다."""
+        self.image_label.pack_forget()
+        self.audio_btn.pack_forget()
+        image_path = self.engine.media_path(question, "image")
+        if image_path:
+            try:
+                image = self.media_cache().get(image_path)
+                self.image_label.config(image=image, text="")
+            except (OSError, tk.TclError):
+                image = None
+                self.image_label.config(image="", text="(이미지를 열 수 없습니다)", fg="gray")
+            # 캐시에서 밀려나도 보이는 동안은 PhotoImage가 지워지지 않도록 참조를 둠
+            self.image_label.image = image
+            self.image_label.pack(padx=10, pady=(0, 10))
+        if self.engine.media_path(question, "audio"):
+            self.audio_btn.pack(pady=(0, 10))
+        self.prefetch_next_media()
+    
+    def prefetch_next_media(self):
+        """다음 문제의 이미지를 작업 스레드에서 미리 읽어 둡니다."""
+        question = self.engine.upcoming_question()
+        image_path = self.engine.media_path(question, "image") if question is not None else None
+        if not image_path:
+            return
+        self.media_cache().prefetch(image_path)
+        if not self.media_polling:
+            self.media_polling = True
+            self.root.after(50, self.decode_prefetched_media)
+    
+    def decode_prefetched_media(self):
+        """미리 읽은 이미지를 메인 스레드에서 디코딩해 캐시에 올립니다 (다 읽을 때까지 반복)."""
+        if self.media.decode_prefetched():
+            self.root.after(50, self.decode_prefetched_media)
+        else:
+            self.media_polling = False
+    
+    def play_question_audio(self):
+        """현재 문제에 첨부된 소리를 재생합니다."""
+        question = self.session.current_question
+        path = self.engine.media_path(question, "audio") if question is not None else None
+        if not path:
+            return
+        try:
+            play_audio(path)
+        except (OSError, ValueError) as e:
+            messagebox.showwarning("경고", str(e))
     
     def show_completion_dialog(self):
         """모든 문제 완료 시 결과를 표시합니다."""
-        correct_count = self.total_questions - self.wrong_count_session
-        accuracy = (correct_count / self.total_questions) * 100 if self.total_questions > 0 else 0
+        summary = self.session.summary()
         
         result_message = f"""모든 퀴즈를 풀었습니다!
 
 📊 결과 요약:
-• 총 문제 수: {self.total_questions}개
-• 정답: {correct_count}개
-• 오답: {self.wrong_count_session}개
-• 정답률: {accuracy:.1f}%
+• 총 문제 수: {summary['total']}개
+• 정답: {summary['correct']}개
+• 오답: {summary['wrong']}개
+• 정답률: {summary['accuracy']:.1f}%
 
-{'🎉 완벽합니다!' if self.wrong_count_session == 0 else '👍 잘했습니다!' if accuracy >= 80 else '💪 더 연습해보세요!'}"""
+{'🎉 완벽합니다!' if summary['wrong'] == 0 else '👍 잘했습니다!' if summary['accuracy'] >= 80 else '💪 더 연습해보세요!'}"""
         
         messagebox.showinfo("퀴즈 완료", result_message)
         
         # 홈 화면으로 돌아가기
         self.show_home_screen()
+    
+    def show_analytics_screen(self):
+        """답안 기록의 누적 집계로 결과 분석 화면을 표시합니다."""
+        analytics = self.engine.analytics()
+        totals = analytics["totals"]
+        
+        self.clear_frame()
+        self.current_frame = tk.Frame(self.root)
+        self.current_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # 제목
+        title_label = tk.Label(self.current_frame, text="결과 분석", 
+                              font=("Arial", 20, "bold"))
+        title_label.pack(pady=(0, 10))
+        
+        # 전체 요약
+        if totals["attempts"]:
+            summary_text = (f"총 {totals['attempts']}회 풀이 | 정답률: {totals['accuracy']:.1f}% | "
+                            f"평균 응답 시간: {totals['average_seconds']:.1f}초")
+        else:
+            summary_text = "아직 답안 기록이 없습니다. 연습하기에서 문제를 풀어보세요."
+        summary_label = tk.Label(self.current_frame, text=summary_text, 
+                                font=("Arial", 11), fg="blue")
+        summary_label.pack(pady=(0, 10))
+        
+        # 날짜별 정답률
+        daily_frame = tk.LabelFrame(self.current_frame, text="날짜별 정답률 (최근 30일)", 
+                                   font=("Arial", 12, "bold"))
+        daily_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        daily_tree = ttk.Treeview(daily_frame, columns=("day", "attempts", "accuracy"), 
+                                 show="headings", height=6)
+        daily_tree.heading("day", text="날짜")
+        daily_tree.heading("attempts", text="푼 문제")
+        daily_tree.heading("accuracy", text="정답률")
+        daily_tree.column("day", width=150, anchor="center")
+        daily_tree.column("attempts", width=100, anchor="center")
+        daily_tree.column("accuracy", width=100, anchor="center")
+        for day, attempts, accuracy in analytics["daily"]:
+            daily_tree.insert("", tk.END, values=(day, f"{attempts}회", f"{accuracy:.1f}%"))
+        daily_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # 정답률이 낮은 문제
+        hardest_frame = tk.LabelFrame(self.current_frame, text="정답률이 낮은 문제 (3회 이상 푼 문제)", 
+                                     font=("Arial", 12, "bold"))
+        hardest_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        hardest_tree = ttk.Treeview(hardest_frame, columns=("question", "attempts", "accuracy", "seconds"), 
+                                   show="headings", height=6)
+        hardest_tree.heading("question", text="문제")
+        hardest_tree.heading("attempts", text="시도")
+        hardest_tree.heading("accuracy", text="정답률")
+        hardest_tree.heading("seconds", text="평균 응답")
+        hardest_tree.column("question", width=400)
+        hardest_tree.column("attempts", width=70, anchor="center")
+        hardest_tree.column("accuracy", width=80, anchor="center")
+        hardest_tree.column("seconds", width=80, anchor="center")
+        for question, attempts, accuracy, seconds in analytics["hardest"]:
+            hardest_tree.insert("", tk.END, values=(
+                question["question"].replace("\n", " "), f"{attempts}회", f"{accuracy:.1f}%", f"{seconds:.1f}초"))
+        hardest_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # 홈으로 버튼
+        home_btn = tk.Button(self.current_frame, text="홈으로", 
+                            command=self.show_home_screen, 
+                            bg="#FF9800", fg="white", font=("Arial", 10, "bold"))
+        home_btn.pack(side=tk.RIGHT)
 
 
 class SettingsDialog:
-    def __init__(self, parent, settings, save_callback, quiz_app=None):
-        self.settings = settings.copy()
-        self.save_callback = save_callback
+    def __init__(self, parent, engine, quiz_app=None):
+        self.engine = engine
+        self.settings = engine.settings
         self.quiz_app = quiz_app
         self.result = False
         
         # 다이얼로그 창 생성
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("설정")
-        self.dialog.geometry("400x300")
+        self.dialog.geometry("460x430")
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
         self.dialog.grab_set()
@@ -513,20 +940,44 @@ class SettingsDialog:
         # 출제 방식 설정
         mode_frame = tk.LabelFrame(self.dialog, text="출제 방식", 
                                   font=("Arial", 12, "bold"))
-        mode_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+        mode_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
         
-        self.random_mode_var = tk.BooleanVar(value=self.settings["random_mode"])
+        self.practice_mode_var = tk.StringVar(value=self.settings["practice_mode"])
         
         random_radio = tk.Radiobutton(mode_frame, text="랜덤 출제", 
-                                     variable=self.random_mode_var, value=True,
+                                     variable=self.practice_mode_var, value="random",
                                      font=("Arial", 10))
         random_radio.pack(anchor="w", padx=10, pady=5)
         
         sequential_radio = tk.Radiobutton(mode_frame, text="순차 출제", 
-                                         variable=self.random_mode_var, value=False,
+                                         variable=self.practice_mode_var, value="sequential",
                                          font=("Arial", 10))
         sequential_radio.pack(anchor="w", padx=10, pady=5)
         
+        spaced_radio = tk.Radiobutton(mode_frame, text="간격 반복 (복습할 때가 된 문제만, 많이 틀린 문제 먼저)", 
+                                     variable=self.practice_mode_var, value="spaced",
+                                     font=("Arial", 10))
+        spaced_radio.pack(anchor="w", padx=10, pady=5)
+        
+        weighted_radio = tk.Radiobutton(mode_frame, text="오답 가중 랜덤 (많이 틀린 문제일수록 자주, 틀리면 다시 출제)", 
+                                       variable=self.practice_mode_var, value="weighted",
+                                       font=("Arial", 10))
+        weighted_radio.pack(anchor="w", padx=10, pady=5)
+        
+        # 채점 설정
+        grading_frame = tk.LabelFrame(self.dialog, text="채점", 
+                                     font=("Arial", 12, "bold"))
+        grading_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
+        
+        tk.Label(grading_frame, text="오타 허용", font=("Arial", 10)).pack(side=tk.LEFT, padx=10, pady=10)
+        
+        self.max_typo_var = tk.StringVar(value=str(self.settings["max_typo_distance"]))
+        max_typo_entry = tk.Entry(grading_frame, textvariable=self.max_typo_var, 
+                                 font=("Arial", 10), width=10)
+        max_typo_entry.pack(side=tk.LEFT, padx=(0, 10), pady=10)
+        
+        tk.Label(grading_frame, text="글자까지 (정답은 '/'로 여러 개 입력)", font=("Arial", 10)).pack(side=tk.LEFT, pady=10)
+        
         # 버튼 프레임
         button_frame = tk.Frame(self.dialog)
         button_frame.pack(fill=tk.X, padx=20, pady=(0, 20))
@@ -558,36 +1009,25 @@ class SettingsDialog:
     def start_practice(self):
         """설정을 저장하고 연습을 시작합니다."""
         try:
-            # 틀린 횟수 검증
-            min_wrong_count = int(self.wrong_count_var.get())
-            if min_wrong_count < 0:
-                messagebox.showwarning("경고", "틀린 횟수는 0 이상이어야 합니다.")
-                return
-            
-            # 설정 업데이트
-            self.settings["min_wrong_count"] = min_wrong_count
-            self.settings["random_mode"] = self.random_mode_var.get()
-            self.save_callback()
-            
-            self.result = True
-            self.dialog.destroy()
-                
-        except ValueError:
-            messagebox.showwarning("경고", "틀린 횟수는 숫자로 입력해주세요.")
+            # 틀린 횟수 검증 후 설정 업데이트
+            self.engine.update_settings(self.wrong_count_var.get(), self.practice_mode_var.get(),
+                                        self.max_typo_var.get())
+        except ValueError as e:
+            messagebox.showwarning("경고", str(e))
+            return
+        
+        self.result = True
+        self.dialog.destroy()
     
     def reset_wrong_counts(self):
         """틀린횟수를 초기화합니다."""
         if messagebox.askyesno("확인", "모든 문제의 틀린횟수가 초기화 됩니다.\n정말 초기화하시겠습니까?"):
+            # 모든 문제의 틀린횟수 초기화
+            self.engine.reset_wrong_counts()
+            # 홈 화면의 리스트 새로고침
             if self.quiz_app:
-                # 모든 문제의 틀린횟수 초기화
-                for question in self.quiz_app.questions:
-                    question["wrong_count"] = 0
-                self.quiz_app.save_data()
-                # 홈 화면의 리스트 새로고침
                 self.quiz_app.refresh_question_list()
-                messagebox.showinfo("완료", "모든 문제의 틀린횟수가 초기화되었습니다!")
-            else:
-                messagebox.showerror("오류", "문제 데이터에 접근할 수 없습니다.")
+            messagebox.showinfo("완료", "모든 문제의 틀린횟수가 초기화되었습니다!")
             
             self.dialog.destroy()
     
@@ -603,10 +1043,12 @@ class QuestionDialog:
         # 다이얼로그 창 생성
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry("500x300")
+        self.dialog.geometry("500x380")
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
         self.dialog.grab_set()
+        self.media = {}  # 바꾼 첨부 파일 {필드: 새 파일 경로 (빼면 "")}
+        self.media_labels = {}
         
         # 중앙 정렬
         self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
@@ -619,7 +1061,21 @@ class QuestionDialog:
         # 정답 입력
         tk.Label(self.dialog, text="정답:", font=("Arial", 12, "bold")).pack(anchor="w", padx=10, pady=(0, 5))
         self.answer_entry = tk.Entry(self.dialog, font=("Arial", 12))
-        self.answer_entry.pack(fill=tk.X, padx=10, pady=(0, 20))
+        self.answer_entry.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        # 첨부 파일 (이미지, 소리)
+        for field, kind in (("image", "이미지"), ("audio", "소리")):
+            media_frame = tk.Frame(self.dialog)
+            media_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+            tk.Label(media_frame, text=f"{kind}:", font=("Arial", 10, "bold"), width=6, anchor="w").pack(side=tk.LEFT)
+            name = existing_question.get(field) if existing_question else None
+            label = tk.Label(media_frame, text=name or "없음", font=("Arial", 10), fg="gray", anchor="w")
+            label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            self.media_labels[field] = label
+            tk.Button(media_frame, text="빼기",
+                      command=lambda field=field: self.set_media(field, "")).pack(side=tk.RIGHT)
+            tk.Button(media_frame, text="선택...",
+                      command=lambda field=field: self.choose_media(field)).pack(side=tk.RIGHT, padx=(0, 5))
         
         # 기존 문제 데이터가 있으면 미리 채워넣기
         if existing_question:
@@ -628,7 +1084,7 @@ class QuestionDialog:
         
         # 버튼 프레임
         button_frame = tk.Frame(self.dialog)
-        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        button_frame.pack(fill=tk.X, padx=10, pady=(10, 10))
         
         # 확인 버튼
         ok_btn = tk.Button(button_frame, text="확인", command=self.ok_clicked, 
@@ -651,20 +1107,224 @@ class QuestionDialog:
         question = self.question_text.get("1.0", tk.END).strip()
         answer = self.answer_entry.get().strip()
         
-        if question and answer:
-            self.result = {"question": question, "answer": answer}
-            self.dialog.destroy()
+        try:
+            QuizEngine.validate_question(question, answer)
+        except ValueError as e:
+            messagebox.showwarning("경고", str(e))
+            return
+        
+        self.result = {"question": question, "answer": answer, "media": self.media}
+        self.dialog.destroy()
+    
+    def choose_media(self, field):
+        """첨부할 파일 선택"""
+        if field == "image":
+            filetypes = [("이미지 파일", " ".join("*" + ext for ext in IMAGE_EXTENSIONS)), ("모든 파일", "*.*")]
         else:
-            messagebox.showwarning("경고", "문제와 정답을 모두 입력해주세요.")
+            filetypes = [("소리 파일", " ".join("*" + ext for ext in AUDIO_EXTENSIONS)), ("모든 파일", "*.*")]
+        path = filedialog.askopenfilename(parent=self.dialog, title="첨부할 파일 선택", filetypes=filetypes)
+        if not path:
+            return
+        try:
+            check_media_file(field, path)
+        except ValueError as e:
+            messagebox.showwarning("경고", str(e), parent=self.dialog)
+            return
+        self.set_media(field, path)
+    
+    def set_media(self, field, path):
+        """첨부 파일 바꾸기 (빈 경로는 빼기)"""
+        self.media[field] = path
+        self.media_labels[field].config(text=os.path.basename(path) if path else "없음")
     
     def cancel_clicked(self):
         """취소 버튼 클릭"""
         self.dialog.destroy()
 
 
+class MergeDecksDialog:
+    def __init__(self, parent, engine):
+        self.result = None
+        self.names = engine.deck_names()
+        
+        # 다이얼로그 창 생성
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("덱 합쳐 연습")
+        self.dialog.geometry("400x320")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # 중앙 정렬
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        tk.Label(self.dialog, text="함께 연습할 덱을 선택하세요:", 
+                font=("Arial", 12, "bold")).pack(anchor="w", padx=10, pady=(10, 5))
+        
+        # 덱 목록 (요약은 덱 목록 파일에서 읽음)
+        self.deck_listbox = tk.Listbox(self.dialog, selectmode=tk.MULTIPLE, font=("Arial", 10), height=10)
+        for name in self.names:
+            summary = engine.deck_summary(name)
+            if summary["count"] is None:
+                self.deck_listbox.insert(tk.END, name)
+            else:
+                self.deck_listbox.insert(tk.END, f"{name} (문제 {summary['count']}개, 틀린 문제 {summary['wrong_questions']}개)")
+        self.deck_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        # 버튼 프레임
+        button_frame = tk.Frame(self.dialog)
+        button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        # 확인 버튼
+        ok_btn = tk.Button(button_frame, text="연습 시작", command=self.ok_clicked, 
+                          bg="#4CAF50", fg="white", font=("Arial", 10, "bold"))
+        ok_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        
+        # 취소 버튼
+        cancel_btn = tk.Button(button_frame, text="취소", command=self.cancel_clicked, 
+                              bg="#f44336", fg="white", font=("Arial", 10, "bold"))
+        cancel_btn.pack(side=tk.RIGHT)
+        
+        # 대기
+        self.dialog.wait_window()
+    
+    def ok_clicked(self):
+        """확인 버튼 클릭"""
+        selected = [self.names[i] for i in self.deck_listbox.curselection()]
+        if not selected:
+            messagebox.showwarning("경고", "연습할 덱을 선택해주세요.")
+            return
+        self.result = selected
+        self.dialog.destroy()
+    
+    def cancel_clicked(self):
+        """취소 버튼 클릭"""
+        self.dialog.destroy()
+
+
+class ImportDialog:
+    def __init__(self, parent, path):
+        self.importer = QuestionImporter(path)
+        
+        # 다이얼로그 창 생성
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("문제 가져오기")
+        self.dialog.geometry("400x150")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel_clicked)
+        
+        # 중앙 정렬
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 100))
+        
+        self.status_label = tk.Label(self.dialog, text="파일을 읽는 중...", font=("Arial", 10))
+        self.status_label.pack(pady=(20, 10))
+        
+        self.progress_bar = ttk.Progressbar(self.dialog, mode="determinate", maximum=100, length=340)
+        self.progress_bar.pack(padx=20)
+        
+        # 취소 버튼
+        cancel_btn = tk.Button(self.dialog, text="취소", command=self.cancel_clicked, 
+                              bg="#f44336", fg="white", font=("Arial", 10, "bold"))
+        cancel_btn.pack(pady=15)
+        
+        # 작업 시작 후 진행 상황을 주기적으로 확인
+        self.poll_job = None
+        self.importer.start()
+        self.poll()
+        
+        # 대기
+        self.dialog.wait_window()
+    
+    def poll(self):
+        """작업 스레드의 진행 상황을 화면에 반영합니다."""
+        if self.importer.done:
+            self.dialog.destroy()
+            return
+        self.progress_bar["value"] = self.importer.fraction * 100
+        self.status_label.config(text=f"파일을 읽는 중... {self.importer.rows_read:,}줄")
+        self.poll_job = self.dialog.after(50, self.poll)
+    
+    def cancel_clicked(self):
+        """취소 버튼 클릭"""
+        if self.poll_job:
+            self.dialog.after_cancel(self.poll_job)
+        self.importer.cancel()
+        self.dialog.destroy()
+
+
+class ExportDialog:
+    def __init__(self, parent, exporter):
+        self.exporter = exporter
+        
+        # 다이얼로그 창 생성
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("오답노트 내보내기")
+        self.dialog.geometry("400x150")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel_clicked)
+        
+        # 중앙 정렬
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 100))
+        
+        self.status_label = tk.Label(self.dialog, text="내보내는 중...", font=("Arial", 10))
+        self.status_label.pack(pady=(20, 10))
+        
+        self.progress_bar = ttk.Progressbar(self.dialog, mode="determinate", maximum=100, length=340)
+        self.progress_bar.pack(padx=20)
+        
+        # 취소 버튼
+        cancel_btn = tk.Button(self.dialog, text="취소", command=self.cancel_clicked, 
+                              bg="#f44336", fg="white", font=("Arial", 10, "bold"))
+        cancel_btn.pack(pady=15)
+        
+        # 작업 시작 후 진행 상황을 주기적으로 확인
+        self.poll_job = None
+        self.exporter.start()
+        self.poll()
+        
+        # 대기
+        self.dialog.wait_window()
+    
+    def poll(self):
+        """작업 스레드의 진행 상황을 화면에 반영합니다."""
+        if self.exporter.done:
+            self.dialog.destroy()
+            return
+        self.progress_bar["value"] = self.exporter.fraction * 100
+        self.status_label.config(
+            text=f"내보내는 중... {self.exporter.rows_written:,}/{self.exporter.total:,}문제")
+        self.poll_job = self.dialog.after(50, self.poll)
+    
+    def cancel_clicked(self):
+        """취소 버튼 클릭"""
+        if self.poll_job:
+            self.dialog.after_cancel(self.poll_job)
+        self.exporter.cancel()
+        self.dialog.destroy()
+
+
+# QUIZ_PROFILE을 켰을 때 시간을 잴 화면 쪽 메서드 (Tk 이벤트 처리기 포함)
+GUI_HOT_PATHS = ("load_data", "open_deck", "show_home_screen", "refresh_question_list", "update_search_results",
+                 "show_analytics_screen", "add_question", "edit_question", "delete_question", "import_questions",
+                 "export_questions", "start_practice", "show_practice_screen", "next_question", "check_answer",
+                 "on_enter_key")
+
+
 def main():
+    # 계측은 객체를 만들기 전에 클래스에 적용 (꺼져 있으면 아무것도 하지 않음)
+    profiler = start_profiling(QuizEngine)
+    if profiler:
+        profiler.instrument(QuizProgram, GUI_HOT_PATHS)
+        profiler.instrument(VirtualQuestionList, ("render",))
+    
     root = tk.Tk()
     app = QuizProgram(root)
+    if profiler:
+        profiler.watch_event_loop(root)
     root.mainloop()
 
 
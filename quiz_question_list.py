@@ -0,0 +1,234 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualQuestionList:
+    """보이는 구간의 행만 만들어 문제 목록을 표시하는 가상 트리뷰입니다.
+
+    트리뷰에는 화면에 보이는 개수만큼의 행 아이템만 두고, 스크롤할 때마다
+    같은 아이템에 해당 구간의 값을 다시 채웁니다. 선택 상태는 문제 인덱스로
+    따로 관리하므로 화면 밖으로 스크롤된 행의 선택도 유지됩니다.
+
+    검색 중에는 rows(검색된 문제 인덱스 목록, 오름차순)의 문제만 표시하며,
+    offset과 화면 위치는 rows 안의 위치를 뜻합니다.
+    """
+
+    COLUMNS = ("번호", "문제", "정답", "틀린 횟수")
+    QUESTION_PREVIEW = 50  # 목록에 보여줄 문제 글자 수
+
+    def __init__(self, parent, questions, on_activate=None):
+        self.questions = questions
+        self.rows = None  # 검색 결과로 표시할 문제 인덱스 목록 (None이면 전체)
+        self.offset = 0  # 화면 첫 행의 위치
+        self.visible_rows = 15
+        self.row_items = []  # 재사용하는 행 아이템
+        self.selected = set()  # 선택된 문제 인덱스
+
+        # 스크롤바가 있는 프레임
+        self.frame = tk.Frame(parent)
+        self.frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        # 트리뷰 생성 (스크롤은 직접 처리)
+        self.tree = ttk.Treeview(self.frame, columns=self.COLUMNS, show="headings",
+                                 height=self.visible_rows)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column)
+        self.tree.column("번호", width=50, anchor="center")
+        self.tree.column("문제", width=400)
+        self.tree.column("정답", width=150)
+        self.tree.column("틀린 횟수", width=80, anchor="center")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.on_scroll)
+
+        # 배치
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # 이벤트 바인딩
+        if on_activate:
+            self.tree.bind('<Double-1>', on_activate)
+        self.tree.bind('<Button-1>', self.on_click)
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_by(3))
+
+        self.render()
+
+    def row_count(self):
+        """표시할 행 수"""
+        return len(self.questions) if self.rows is None else len(self.rows)
+
+    def question_index(self, position):
+        """목록에서 position번째 행의 문제 인덱스"""
+        return position if self.rows is None else self.rows[position]
+
+    def position_of(self, index):
+        """문제 인덱스가 표시되는 행 위치 (검색 결과에 없으면 None)"""
+        if self.rows is None:
+            return index
+        position = bisect.bisect_left(self.rows, index)
+        if position < len(self.rows) and self.rows[position] == index:
+            return position
+        return None
+
+    def row_values(self, index):
+        """index번째 문제의 표시 값을 만듭니다."""
+        question = self.questions[index]
+        text = question["question"]
+        if len(text) > self.QUESTION_PREVIEW:
+            text = text[:self.QUESTION_PREVIEW] + "..."
+        return (index + 1, text, question["answer"], question["wrong_count"])
+
+    def render(self):
+        """현재 스크롤 위치의 행만 다시 채웁니다."""
+        total = self.row_count()
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        count = min(self.visible_rows, total - self.offset)
+
+        # 필요한 개수만큼만 행 아이템 유지
+        while len(self.row_items) < count:
+            self.row_items.append(self.tree.insert("", "end"))
+        while len(self.row_items) > count:
+            self.tree.delete(self.row_items.pop())
+
+        selection = []
+        for position, item in enumerate(self.row_items):
+            index = self.question_index(self.offset + position)
+            self.tree.item(item, values=self.row_values(index))
+            if index in self.selected:
+                selection.append(item)
+        self.tree.selection_set(selection)
+
+        # 스크롤바 위치 갱신
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def is_visible(self, index):
+        """index번째 문제가 현재 화면에 보이는지 확인합니다."""
+        position = self.position_of(index)
+        return position is not None and self.offset <= position < self.offset + len(self.row_items)
+
+    def index_of(self, item):
+        """행 아이템에 해당하는 문제 인덱스를 반환합니다."""
+        return self.question_index(self.offset + self.row_items.index(item))
+
+    def selected_indices(self):
+        """선택된 문제 인덱스를 오름차순으로 반환합니다."""
+        return sorted(self.selected)
+
+    def scroll_by(self, rows):
+        """rows 행만큼 스크롤합니다."""
+        self.offset += rows
+        self.render()
+
+    def see(self, index):
+        """index번째 문제가 보이도록 스크롤합니다."""
+        position = self.position_of(index)
+        if position is None:
+            position = self.offset
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible_rows:
+            self.offset = position - self.visible_rows + 1
+        self.render()
+
+    def on_scroll(self, *args):
+        """스크롤바 조작을 처리합니다."""
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.row_count())
+            self.render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows
+            self.scroll_by(amount)
+
+    def on_mouse_wheel(self, event):
+        """마우스 휠 스크롤 (Windows/macOS)"""
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-3 * step)
+        return "break"
+
+    def on_resize(self, event):
+        """트리뷰 높이에 맞춰 보이는 행 수를 다시 계산합니다."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # 헤더 높이만큼 제외
+        rows = max(1, (event.height - row_height - 4) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
+
+    def on_click(self, event):
+        """수정 키 없이 클릭하면 화면 밖의 선택도 해제합니다."""
+        if self.tree.identify_row(event.y) and not event.state & 0x0005:  # Shift, Control
+            self.selected.clear()
+
+    def on_select(self, event):
+        """트리뷰의 선택 상태를 문제 인덱스 선택 집합에 반영합니다."""
+        selection = set(self.tree.selection())
+        for position, item in enumerate(self.row_items):
+            index = self.question_index(self.offset + position)
+            if item in selection:
+                self.selected.add(index)
+            else:
+                self.selected.discard(index)
+
+    # --- 변경분 반영 ---
+
+    def insert_row(self, index):
+        """새 문제가 추가되었을 때 해당 행이 보이도록 반영합니다."""
+        self.selected = {i + 1 if i >= index else i for i in self.selected}
+        self.see(index)
+
+    def update_row(self, index):
+        """수정된 문제 한 행만 다시 표시합니다."""
+        if self.is_visible(index):
+            item = self.row_items[self.position_of(index) - self.offset]
+            self.tree.item(item, values=self.row_values(index))
+
+    def update_ids(self, ids):
+        """보이는 행 중 문제 ID가 ids에 있는 행만 다시 표시합니다."""
+        question_ids = self.questions.ids
+        for position, item in enumerate(self.row_items):
+            index = self.question_index(self.offset + position)
+            if question_ids[index] in ids:
+                self.tree.item(item, values=self.row_values(index))
+
+    def insert_rows(self, indices):
+        """다른 곳에서 추가된 문제 인덱스들을 반영합니다 (보던 구간과 선택은 유지)."""
+        for index in sorted(indices):
+            self.selected = {i + 1 if i >= index else i for i in self.selected}
+            if index < self.offset:
+                self.offset += 1
+        self.render()
+
+    def delete_rows(self, indices):
+        """삭제된 문제 인덱스들을 반영합니다."""
+        if self.rows is None:
+            # 화면 위쪽에서 지워진 만큼 당겨서 보던 구간을 유지
+            self.offset -= sum(1 for index in indices if index < self.offset)
+        else:
+            # 검색 결과에서 지워진 문제를 빼고, 남은 인덱스를 지워진 수만큼 당김
+            deleted = set(indices)
+            ordered = sorted(deleted)
+            self.offset -= sum(1 for index in self.rows[:self.offset] if index in deleted)
+            self.rows = [index - bisect.bisect_left(ordered, index)
+                         for index in self.rows if index not in deleted]
+        self.selected.clear()
+        self.render()
+
+    def set_rows(self, rows):
+        """검색 결과(문제 인덱스 목록)만 표시합니다. None이면 전체를 표시합니다."""
+        self.rows = rows
+        self.offset = 0
+        self.selected.clear()
+        self.render()
+
+    def refresh(self):
+        """보이는 구간을 다시 표시합니다."""
+        self.render()
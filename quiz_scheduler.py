@@ -0,0 +1,370 @@
+import heapq
+import random
+import time
+
+
+class QuestionScheduler:
+    """연습 세션의 출제 순서를 관리합니다.
+
+    세션 시작 시 문제 인덱스 덱을 한 번만 만들어 두고 커서로 꺼내므로
+    출제와 진행 상황 계산이 모두 O(1)입니다.
+    """
+
+    def __init__(self, questions, random_mode=True):
+        self.questions = questions
+        # 랜덤 모드는 미리 섞어 둔 덱, 순차 모드는 원래 순서 그대로
+        self.deck = list(range(len(questions)))
+        if random_mode:
+            random.shuffle(self.deck)
+        self.cursor = 0
+
+    @property
+    def total(self):
+        """이번 세션의 총 문제 수"""
+        return len(self.deck)
+
+    @property
+    def drawn_count(self):
+        """지금까지 출제된 문제 수"""
+        return self.cursor
+
+    def has_next(self):
+        """아직 출제되지 않은 문제가 남아 있는지 확인합니다."""
+        return self.cursor < len(self.deck)
+
+    def draw(self):
+        """다음 문제를 꺼냅니다. 덱이 비었으면 None을 반환합니다."""
+        if not self.has_next():
+            return None
+        index = self.deck[self.cursor]
+        self.cursor += 1
+        return self.questions[index]
+
+    def peek(self):
+        """다음에 꺼낼 문제를 꺼내지 않고 반환합니다 (없으면 None, 첨부 파일 미리 읽기용)."""
+        return self.questions[self.deck[self.cursor]] if self.has_next() else None
+
+    def record(self, question, correct):
+        """답안 결과를 반영합니다. 랜덤/순차 모드는 출제 순서가 바뀌지 않습니다."""
+        return False
+
+    def release(self):
+        """세션을 끝낼 때 정리할 것이 없습니다."""
+
+
+class LazyShuffleScheduler(QuestionScheduler):
+    """덱을 미리 만들지 않고 꺼낼 때마다 한 칸씩 섞는 스케줄러입니다.
+
+    Fisher-Yates 섞기를 출제할 때마다 한 단계씩 진행하고 자리를 바꾼 칸만
+    dict에 기록하므로, 세션 시작이 O(1)이고 메모리는 꺼낸 문제 수에만
+    비례합니다. 서버처럼 큰 문제 은행에서 학습자마다 세션을 만들 때 씁니다.
+    """
+
+    def __init__(self, questions, random_mode=True):
+        self.questions = questions
+        self.random_mode = random_mode
+        self.swapped = {}  # 덱 위치 -> 그 자리로 옮겨 온 문제 인덱스
+        self.cursor = 0
+        self.upcoming = None  # peek()로 미리 고른 다음 문제 인덱스
+
+    @property
+    def total(self):
+        """이번 세션의 총 문제 수"""
+        return len(self.questions)
+
+    def has_next(self):
+        """아직 출제되지 않은 문제가 남아 있는지 확인합니다."""
+        return self.cursor < len(self.questions)
+
+    def draw(self):
+        """다음 문제를 꺼냅니다. 덱이 비었으면 None을 반환합니다."""
+        if not self.has_next():
+            return None
+        index = self.upcoming if self.upcoming is not None else self.choose()
+        self.upcoming = None
+        self.cursor += 1
+        return self.questions[index]
+
+    def peek(self):
+        """다음에 꺼낼 문제를 미리 골라 반환합니다 (draw()가 같은 문제를 꺼냄)."""
+        if not self.has_next():
+            return None
+        if self.upcoming is None:
+            self.upcoming = self.choose()
+        return self.questions[self.upcoming]
+
+    def choose(self):
+        """현재 칸에 올 문제 인덱스를 정합니다 (섞기 한 단계)."""
+        index = self.cursor
+        if self.random_mode:
+            # 남은 칸 중 하나를 골라 현재 칸과 맞바꿈 (현재 칸은 다시 쓰지 않으므로 기록을 지움)
+            chosen = random.randrange(self.cursor, len(self.questions))
+            current = self.swapped.pop(self.cursor, self.cursor)
+            if chosen == self.cursor:
+                index = current
+            else:
+                index = self.swapped.get(chosen, chosen)
+                self.swapped[chosen] = current
+        return index
+
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+
+
+def schedule_review(question, correct, now):
+    """SM-2 방식으로 다음 복습 간격과 시각을 정합니다.
+
+    맞히면 간격을 늘리되 틀린 횟수가 많을수록 천천히 늘리고(ease 감소),
+    틀리면 10분 뒤 다시 복습하도록 간격을 되돌립니다.
+    """
+    if correct:
+        interval = question.get("interval", 0)
+        ease = max(1.3, 2.5 - 0.2 * question["wrong_count"])
+        interval = DAY if interval < DAY else int(interval * ease)
+    else:
+        interval = 10 * MINUTE
+    question["interval"] = interval
+    question["due"] = int(now) + interval
+
+
+class ReviewQueue:
+    """간격 반복 모드의 복습 대기열입니다.
+
+    (복습 예정 시각, -틀린 횟수, 문제 ID)를 키로 하는 힙이라 다음 복습 문제를
+    O(log n)에 꺼냅니다. 예정 시각이 없는 새 문제는 바로 복습 대상이며, 그중
+    많이 틀린 문제가 먼저 나옵니다. 삭제되었거나 다시 예약된 문제의 항목은
+    꺼낼 때 걸러 냅니다.
+    """
+
+    def __init__(self, questions):
+        self.by_id = {q["id"]: q for q in questions}
+        self.heap = [self.entry(q) for q in questions]
+        heapq.heapify(self.heap)
+
+    @staticmethod
+    def entry(question):
+        return (question.get("due", 0), -question["wrong_count"], question["id"])
+
+    def push(self, question):
+        """문제를 (다시) 대기열에 넣습니다."""
+        self.by_id[question["id"]] = question
+        heapq.heappush(self.heap, self.entry(question))
+
+    def remove(self, question_id):
+        """삭제된 문제를 대기열에서 뺍니다 (힙 항목은 꺼낼 때 버림)."""
+        self.by_id.pop(question_id, None)
+
+    def valid_question(self, entry):
+        """힙 항목이 아직 유효하면 해당 문제를, 아니면 None을 반환합니다."""
+        question = self.by_id.get(entry[2])
+        if question is None or question.get("due", 0) != entry[0]:
+            return None
+        return question
+
+    def pop_due(self, now, accept=None):
+        """now까지 복습 예정인 문제를 예정 순서대로 꺼냅니다.
+
+        accept(문제)가 False인 문제는 대기열에 그대로 남겨 둡니다.
+        """
+        due_questions = []
+        skipped = []
+        seen = set()
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            question = self.valid_question(entry)
+            if question is None or question["id"] in seen:
+                continue
+            seen.add(question["id"])
+            if accept is None or accept(question):
+                due_questions.append(question)
+            else:
+                skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        return due_questions
+
+    def next_due(self):
+        """가장 이른 복습 예정 시각 (대기열이 비었으면 None)"""
+        while self.heap and self.valid_question(self.heap[0]) is None:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+
+class SpacedRepetitionScheduler:
+    """복습 대기열에서 지금 복습할 문제만 꺼내 출제하는 간격 반복 스케줄러입니다.
+
+    세션 시작 시 복습 예정인 문제를 대기열에서 꺼내 두고, 답안을 확인할
+    때마다 다음 복습 시각을 정해 대기열에 다시 넣습니다.
+    """
+
+    def __init__(self, review_queue, accept=None, now=None):
+        self.review_queue = review_queue
+        self.now = time.time() if now is None else now
+        self.deck = review_queue.pop_due(self.now, accept)
+        self.cursor = 0
+
+    @property
+    def total(self):
+        """이번 세션의 총 문제 수"""
+        return len(self.deck)
+
+    @property
+    def drawn_count(self):
+        """지금까지 출제된 문제 수"""
+        return self.cursor
+
+    def has_next(self):
+        """아직 출제되지 않은 문제가 남아 있는지 확인합니다."""
+        return self.cursor < len(self.deck)
+
+    def draw(self):
+        """다음 문제를 꺼냅니다. 덱이 비었으면 None을 반환합니다."""
+        if not self.has_next():
+            return None
+        question = self.deck[self.cursor]
+        self.cursor += 1
+        return question
+
+    def peek(self):
+        """다음에 꺼낼 문제를 꺼내지 않고 반환합니다 (없으면 None)."""
+        return self.deck[self.cursor] if self.has_next() else None
+
+    def record(self, question, correct):
+        """다음 복습 시각을 정해 대기열에 다시 넣고 True를 반환합니다 (저장 필요)."""
+        schedule_review(question, correct, time.time())
+        # 세션 중에 삭제된 문제는 대기열에 되살리지 않음
+        if question["id"] in self.review_queue.by_id:
+            self.review_queue.push(question)
+        return True
+
+    def release(self):
+        """세션을 중간에 끝내면 아직 답하지 않은 문제를 대기열에 돌려놓습니다."""
+        for question in self.deck:
+            # 다시 예약되지 않았고 그사이 삭제되지도 않은 문제만
+            if question.get("due", 0) <= self.now and question["id"] in self.review_queue.by_id:
+                self.review_queue.push(question)
+        self.deck = []
+        self.cursor = 0
+
+
+class FenwickTree:
+    """정수 가중치의 누적합 트리입니다.
+
+    가중치 갱신과 가중치에 비례한 인덱스 추출이 모두 O(log n)입니다.
+    """
+
+    def __init__(self, weights):
+        self.weights = list(weights)
+        self.size = len(self.weights)
+        self.total = sum(self.weights)
+        # O(n) 구성: 각 노드의 값을 바로 위 부모 노드에 더해 올림
+        self.tree = [0] + self.weights
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i]
+
+    def update(self, index, weight):
+        """index의 가중치를 weight로 바꿉니다."""
+        delta = weight - self.weights[index]
+        if not delta:
+            return
+        self.weights[index] = weight
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, value):
+        """누적 가중치가 value를 처음 넘는 인덱스를 찾습니다 (0 <= value < total)."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            following = position + step
+            if following <= self.size and self.tree[following] <= value:
+                position = following
+                value -= self.tree[following]
+            step >>= 1
+        return position
+
+    def sample(self):
+        """가중치에 비례하여 인덱스 하나를 고릅니다."""
+        return self.find(random.randrange(self.total))
+
+
+class WeightedScheduler:
+    """틀린 횟수가 많은 문제일수록 자주 나오는 가중 랜덤 스케줄러입니다.
+
+    문제마다 (틀린 횟수 + 1)의 가중치를 FenwickTree에 두고 가중치에 비례해
+    뽑습니다. 뽑은 문제는 가중치를 0으로 빼 두었다가, 틀리면 늘어난 틀린
+    횟수로 다시 넣어 같은 세션에서 다시 나올 수 있게 합니다. 모든 문제를
+    한 번씩 맞히면 세션이 끝납니다.
+    """
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.tree = FenwickTree(self.weight(q) for q in questions)
+        self.remaining = len(questions)  # 아직 맞히지 않은 문제 수
+        self.current_index = None
+        self.upcoming = None  # peek()로 미리 뽑은 다음 문제 인덱스
+
+    @staticmethod
+    def weight(question):
+        return question["wrong_count"] + 1
+
+    @property
+    def total(self):
+        """이번 세션의 총 문제 수"""
+        return len(self.questions)
+
+    @property
+    def drawn_count(self):
+        """맞혔거나 지금 풀고 있는 문제 수"""
+        return self.total - self.remaining
+
+    def has_next(self):
+        """아직 맞히지 않은 문제가 남아 있는지 확인합니다."""
+        return self.remaining > 0
+
+    def draw(self):
+        """가중치에 비례하여 다음 문제를 뽑습니다. 남은 문제가 없으면 None을 반환합니다.
+
+        지금 문제의 답을 확인하지 않고 넘기면 맞힌 것이 아니므로 원래 가중치로 되돌려 둡니다.
+        """
+        if self.current_index is not None:
+            self.tree.update(self.current_index, self.weight(self.questions[self.current_index]))
+            self.remaining += 1
+            self.current_index = None
+        if not self.has_next():
+            return None
+        index = self.upcoming if self.upcoming is not None else self.tree.sample()
+        self.upcoming = None
+        self.tree.update(index, 0)
+        self.remaining -= 1
+        self.current_index = index
+        return self.questions[index]
+
+    def peek(self):
+        """다음 문제를 미리 뽑아 반환합니다 (draw()가 같은 문제를 꺼냄, 남은 문제가 없으면 None).
+
+        지금 문제를 틀리면 가중치가 바뀌므로 미리 뽑은 문제는 버려집니다.
+        """
+        if not self.has_next() or not self.tree.total:
+            return None
+        if self.upcoming is None:
+            self.upcoming = self.tree.sample()
+        return self.questions[self.upcoming]
+
+    def record(self, question, correct):
+        """틀린 문제는 늘어난 가중치로 다시 넣습니다 (추가로 저장할 필드는 없음)."""
+        if not correct and self.current_index is not None:
+            self.tree.update(self.current_index, self.weight(question))
+            self.remaining += 1
+            self.upcoming = None
+        self.current_index = None
+        return False
+
+    def release(self):
+        """세션을 끝낼 때 정리할 것이 없습니다."""
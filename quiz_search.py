@@ -0,0 +1,121 @@
+from quiz_matcher import normalize_answer
+
+
+def search_text(question):
+    """검색에 쓸 문제+정답 문자열을 만듭니다 (띄어쓰기 무시, 소문자).
+
+    두 필드 사이에 구분 문자를 넣어 문제 끝과 정답 앞이 이어져 검색되지 않게 합니다.
+    """
+    return normalize_answer(question["question"]) + "\0" + normalize_answer(question["answer"])
+
+
+def bigrams(text):
+    """문자열의 글자 2-gram 집합 (형태소 분석 없이 한글도 검색 가능)"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class SearchIndex:
+    """문제/정답 텍스트의 글자 2-gram 역색인입니다.
+
+    검색어의 2-gram 목록(posting)을 짧은 것부터 교집합한 뒤 실제 부분 문자열인지
+    확인하므로 문제 수가 많아도 후보가 금방 줄어듭니다. 한 글자 검색어는 2-gram이
+    없으므로 저장해 둔 텍스트를 차례로 확인합니다. 문제 추가/수정/삭제 때는
+    해당 문제의 항목만 고칩니다.
+
+    처음 받은 문제들은 pending에 두었다가 index_pending()으로 조금씩 색인할 수
+    있으며, 그동안의 검색은 색인하지 않은 문제를 직접 확인합니다.
+    """
+
+    def __init__(self, questions=()):
+        self.postings = {}  # 2-gram -> 문제 ID 집합
+        self.texts = {}  # 문제 ID -> 검색용 문자열
+        self.pending = {q["id"]: q for q in questions}  # 아직 색인하지 않은 문제
+
+    def add_later(self, questions):
+        """여러 문제를 나중에 색인하도록 pending에 넣습니다."""
+        self.pending.update((q["id"], q) for q in questions)
+
+    def index_pending(self, limit=None):
+        """색인하지 않은 문제를 최대 limit개 색인하고, 모두 끝났으면 True를 반환합니다."""
+        count = 0
+        while self.pending and (limit is None or count < limit):
+            question_id = next(iter(self.pending))
+            self.add(self.pending.pop(question_id))
+            count += 1
+        return not self.pending
+
+    def add(self, question):
+        """문제를 색인에 추가합니다."""
+        text = search_text(question)
+        question_id = question["id"]
+        self.texts[question_id] = text
+        for gram in bigrams(text):
+            ids = self.postings.get(gram)
+            if ids is None:
+                self.postings[gram] = {question_id}
+            else:
+                ids.add(question_id)
+
+    def remove(self, question_id):
+        """문제를 색인에서 뺍니다."""
+        self.pending.pop(question_id, None)
+        text = self.texts.pop(question_id, None)
+        if text is None:
+            return
+        for gram in bigrams(text):
+            ids = self.postings[gram]
+            ids.discard(question_id)
+            if not ids:
+                del self.postings[gram]
+
+    def update(self, question):
+        """수정된 문제를 다시 색인합니다 (바뀐 2-gram만 고침)."""
+        question_id = question["id"]
+        self.pending.pop(question_id, None)
+        old_text = self.texts.get(question_id)
+        text = search_text(question)
+        if old_text == text:
+            return
+        if old_text is None:
+            self.add(question)
+            return
+        old_grams = bigrams(old_text)
+        new_grams = bigrams(text)
+        for gram in old_grams - new_grams:
+            ids = self.postings[gram]
+            ids.discard(question_id)
+            if not ids:
+                del self.postings[gram]
+        for gram in new_grams - old_grams:
+            self.postings.setdefault(gram, set()).add(question_id)
+        self.texts[question_id] = text
+
+    def search(self, query):
+        """검색어를 포함하는 문제 ID 집합을 반환합니다."""
+        query = normalize_answer(query)
+        # 아직 색인하지 않은 문제는 직접 확인
+        matched = {question_id for question_id, question in self.pending.items()
+                   if query in search_text(question)}
+        if len(query) <= 1:
+            matched.update(question_id for question_id, text in self.texts.items() if query in text)
+            return matched
+        return matched | self.search_indexed(query)
+
+    def search_indexed(self, query):
+        """색인한 문제 중 정규화된 검색어(2글자 이상)를 포함하는 문제 ID 집합"""
+        postings = []
+        for gram in bigrams(query):
+            ids = self.postings.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return candidates
+        # 2-gram이 모두 있어도 순서가 다를 수 있으므로 실제로 포함하는지 확인
+        if len(query) > 2:
+            candidates = {question_id for question_id in candidates if query in self.texts[question_id]}
+        return candidates
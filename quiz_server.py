@@ -0,0 +1,337 @@
+"""여러 학습자가 하나의 문제 은행으로 동시에 연습하는 로컬 HTTP/JSON 서버입니다.
+
+문제 은행(quiz_data.json 또는 SQLite)은 한 번 불러와 모든 학습자가 읽기 전용으로
+공유하고, 학습자마다 틀린 횟수(문제 ID -> 횟수, 틀린 문제만 보관)와 연습 세션을
+따로 둡니다. 학습자별 틀린 횟수는 quiz_learners.json에 디바운스해서 저장하므로
+문제 은행 파일은 바뀌지 않습니다. tkinter와 외부 패키지를 쓰지 않습니다.
+
+사용 예:
+    python quiz_server.py --port 8765
+    curl -X POST localhost:8765/session -d '{"learner": "kim", "min_wrong_count": 1}'
+    curl -X POST localhost:8765/next -d '{"learner": "kim"}'
+    curl -X POST localhost:8765/answer -d '{"learner": "kim", "answer": "정답"}'
+    curl 'localhost:8765/progress?learner=kim'
+
+요청과 응답 본문은 모두 JSON이며, 잘못된 요청은 {"error": 메시지}와 400으로
+답합니다. 연결은 HTTP/1.1 keep-alive로 재사용할 수 있습니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+from quiz_engine import QuizEngine, check_typo_distance
+from quiz_scheduler import LazyShuffleScheduler
+
+
+# 서버에서 지원하는 출제 방식 (간격 반복/오답 가중은 문제마다 학습자별 일정이 필요해 제외)
+SERVER_PRACTICE_MODES = ("random", "sequential")
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_LEARNER_NAME = 64
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large"}
+
+
+class LearnerProgress:
+    """학습자 한 명의 틀린 횟수와 현재 연습 세션입니다."""
+
+    def __init__(self, name, wrong_counts=None):
+        self.name = name
+        self.wrong_counts = wrong_counts or {}  # 문제 ID -> 틀린 횟수 (0인 문제는 없음)
+        self.scheduler = None  # 문제 위치를 꺼내는 LazyShuffleScheduler
+        self.current = None  # 현재 문제 위치
+        self.answer_checked = False
+        self.answered_count = 0
+        self.wrong_count = 0
+
+    def summary(self):
+        """현재 세션 결과 요약 (엔진의 PracticeSession.summary와 같은 형식)"""
+        correct_count = self.answered_count - self.wrong_count
+        accuracy = (correct_count / self.answered_count) * 100 if self.answered_count > 0 else 0
+        return {
+            "total": self.answered_count,
+            "correct": correct_count,
+            "wrong": self.wrong_count,
+            "accuracy": accuracy
+        }
+
+
+class QuizServer:
+    """공유 문제 은행과 학습자별 진행 상황을 관리하고 HTTP 요청을 처리합니다.
+
+    모든 요청은 이벤트 루프 스레드 하나에서 처리하므로 잠금이 필요 없고,
+    파일 쓰기만 엔진의 저장 스레드에서 합니다.
+    """
+
+    def __init__(self, engine, learners_path):
+        self.engine = engine
+        self.questions = engine.questions
+        self.learners_path = learners_path
+        self.learners = {}
+        self.answers_served = 0
+        self.routes = {
+            ("POST", "/session"): self.start_session,
+            ("POST", "/next"): self.next_question,
+            ("POST", "/answer"): self.check_answer,
+            ("GET", "/progress"): self.progress,
+            ("GET", "/stats"): self.stats
+        }
+        self.load_learners()
+
+    # --- 학습자 ---
+
+    def load_learners(self):
+        """저장된 학습자별 틀린 횟수를 불러옵니다."""
+        if not os.path.exists(self.learners_path):
+            return
+        with open(self.learners_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        for name, wrong_counts in saved.items():
+            self.learners[name] = LearnerProgress(
+                name, {int(question_id): count for question_id, count in wrong_counts.items()})
+
+    def save_learners(self):
+        """학습자별 틀린 횟수 저장을 예약합니다 (디바운스 후 저장 스레드에서 기록)."""
+        self.engine.persistence.request(self.learners_path, lambda: (
+            {name: dict(learner.wrong_counts) for name, learner in self.learners.items()
+             if learner.wrong_counts}, None))
+
+    def learner(self, params, create=False):
+        """요청의 learner 이름으로 학습자를 찾습니다 (create면 없을 때 만듦)."""
+        name = params.get("learner")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("learner(학습자 이름)를 입력해주세요.")
+        name = name.strip()
+        if len(name) > MAX_LEARNER_NAME:
+            raise ValueError(f"학습자 이름은 {MAX_LEARNER_NAME}자 이하여야 합니다.")
+        learner = self.learners.get(name)
+        if learner is None:
+            if not create:
+                raise ValueError("먼저 /session으로 연습을 시작해주세요.")
+            learner = self.learners[name] = LearnerProgress(name)
+        return learner
+
+    # --- 요청 처리 ---
+
+    def start_session(self, params):
+        """학습자의 연습 세션을 시작합니다 (min_wrong_count는 그 학습자의 틀린 횟수 기준)."""
+        learner = self.learner(params, create=True)
+        mode = params.get("mode", "random")
+        if mode not in SERVER_PRACTICE_MODES:
+            raise ValueError("출제 방식은 random 또는 sequential이어야 합니다.")
+        try:
+            min_wrong_count = int(params.get("min_wrong_count", 0))
+        except (TypeError, ValueError):
+            raise ValueError("틀린 횟수는 숫자로 입력해주세요.")
+        if min_wrong_count < 0:
+            raise ValueError("틀린 횟수는 0 이상이어야 합니다.")
+
+        if min_wrong_count == 0:
+            positions = range(len(self.questions))
+        else:
+            # 틀린 문제만 보관하므로 전체 문제가 아니라 학습자의 기록만 훑음
+            ids = {question_id for question_id, count in learner.wrong_counts.items()
+                   if count >= min_wrong_count}
+            positions = self.questions.positions_of_ids(ids) if ids else []
+        # 학습자마다 전체 덱을 섞어 두지 않도록 꺼낼 때마다 섞음
+        learner.scheduler = LazyShuffleScheduler(positions, mode == "random")
+        learner.current = None
+        learner.answer_checked = False
+        learner.answered_count = 0
+        learner.wrong_count = 0
+        return {"total": learner.scheduler.total}
+
+    def next_question(self, params):
+        """다음 문제를 꺼냅니다. 다 풀었으면 done과 결과 요약을 반환합니다."""
+        learner = self.learner(params)
+        scheduler = learner.scheduler
+        if scheduler is None or not scheduler.has_next():
+            learner.current = None
+            return {"done": True, "summary": learner.summary()}
+        learner.current = scheduler.draw()
+        learner.answer_checked = False
+        question = self.questions[learner.current]
+        return {
+            "done": False,
+            "id": question["id"],
+            "question": question["question"],
+            "drawn": scheduler.drawn_count,
+            "total": scheduler.total
+        }
+
+    def check_answer(self, params):
+        """현재 문제의 답안을 채점하고 틀리면 그 학습자의 틀린 횟수만 늘립니다."""
+        learner = self.learner(params)
+        if learner.current is None:
+            raise ValueError("먼저 /next로 문제를 받아주세요.")
+        if learner.answer_checked:
+            raise ValueError("이미 답안을 확인한 문제입니다.")
+        user_answer = params.get("answer")
+        if not isinstance(user_answer, str):
+            raise ValueError("answer(답안)를 입력해주세요.")
+
+        question = self.questions[learner.current]
+        correct = self.engine.grade(question, user_answer)
+        learner.answer_checked = True
+        learner.answered_count += 1
+        self.answers_served += 1
+        question_id = question["id"]
+        if not correct:
+            learner.wrong_count += 1
+            learner.wrong_counts[question_id] = learner.wrong_counts.get(question_id, 0) + 1
+            self.save_learners()
+        return {
+            "correct": correct,
+            "answer": question["answer"],
+            "wrong_count": learner.wrong_counts.get(question_id, 0)
+        }
+
+    def progress(self, params):
+        """학습자의 현재 세션 결과와 틀린 문제 수"""
+        learner = self.learner(params)
+        return {
+            "learner": learner.name,
+            "summary": learner.summary(),
+            "wrong_questions": len(learner.wrong_counts)
+        }
+
+    def stats(self, params):
+        """서버 전체 현황"""
+        return {
+            "questions": len(self.questions),
+            "learners": len(self.learners),
+            "answers": self.answers_served
+        }
+
+    def dispatch(self, method, target, body):
+        """요청 하나를 처리하고 (상태 코드, 응답 객체)를 반환합니다."""
+        url = urlsplit(target)
+        if not any(path == url.path for _, path in self.routes):
+            return 404, {"error": "알 수 없는 경로입니다."}
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            return 405, {"error": "지원하지 않는 메서드입니다."}
+        try:
+            if method == "GET":
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            else:
+                params = json.loads(body or b"{}")
+                if not isinstance(params, dict):
+                    raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+            return 200, handler(params)
+        except ValueError as e:
+            # json.JSONDecodeError도 ValueError
+            return 400, {"error": str(e)}
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader, writer):
+        """연결 하나에서 keep-alive로 들어오는 요청을 차례로 처리합니다."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "요청 본문이 너무 큽니다."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.dispatch(method, target, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    """문제 은행을 불러오고 요청을 받기 시작합니다 (Ctrl+C로 종료)."""
+    loop = asyncio.get_running_loop()
+    # 저장 디바운스 타이머도 이벤트 루프에서 돌도록 연결 (call_later는 밀리초 단위)
+    engine = QuizEngine(args.data_dir,
+                        call_later=lambda ms, callback: loop.call_later(ms / 1000, callback),
+                        on_error=lambda e: print(f"저장 중 오류가 발생했습니다: {str(e)}", file=sys.stderr))
+    try:
+        engine.load()
+        if args.max_typo is not None:
+            engine.matcher.max_distance = args.max_typo
+        server = QuizServer(engine, engine.path("quiz_learners.json"))
+        listener = await asyncio.start_server(server.handle_connection, args.host, args.port,
+                                              backlog=args.backlog)
+        print(f"퀴즈 서버 시작: http://{args.host}:{args.port} "
+              f"(문제 {len(server.questions)}개, 학습자 {len(server.learners)}명)")
+        try:
+            # kill 등으로 종료할 때도 남은 저장을 마치도록 (Windows는 지원하지 않음)
+            loop.add_signal_handler(signal.SIGTERM, listener.close)
+        except (NotImplementedError, AttributeError):
+            pass
+        async with listener:
+            try:
+                await listener.serve_forever()
+            except asyncio.CancelledError:
+                pass
+    finally:
+        engine.close()
+
+
+def typo_distance(text):
+    """--max-typo 값을 확인합니다 (0 이상의 정수만)."""
+    try:
+        return check_typo_distance(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="퀴즈마스터 로컬 다중 사용자 서버")
+    parser.add_argument("--data-dir", default=".", help="quiz_data.json 등이 있는 폴더")
+    parser.add_argument("--host", default="127.0.0.1", help="접속을 받을 주소 (기본: 이 컴퓨터만)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backlog", type=int, default=1024, help="동시에 대기할 수 있는 연결 수")
+    parser.add_argument("--max-typo", type=typo_distance, help="정답으로 인정할 오타 글자 수 (기본은 설정 파일의 값)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except (ValueError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
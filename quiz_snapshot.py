@@ -0,0 +1,80 @@
+import marshal
+import os
+import tempfile
+from array import array
+
+from quiz_persistence import copy_file_mode
+from quiz_table import QuestionTable
+
+
+# 형식이 바뀌면 올려서 이전 스냅샷을 버리게 함 (숫자 열의 바이트 크기도 포함)
+SNAPSHOT_VERSION = (1, array('I').itemsize)
+
+
+def source_key(source_path):
+    """원본 JSON 파일의 (수정 시각, 크기). 파일이 없으면 None"""
+    try:
+        stat = os.stat(source_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_snapshot(path, source_path):
+    """원본이 스냅샷을 만든 뒤로 바뀌지 않았으면 스냅샷에서 QuestionTable을 만들고,
+    아니면(또는 스냅샷이 없거나 깨졌으면) None을 반환합니다.
+    """
+    key = source_key(source_path)
+    if key is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            # marshal.load(f)는 파일을 조금씩 읽어 느리므로 한 번에 읽어서 풂
+            version, mtime_ns, size, columns = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != SNAPSHOT_VERSION or (mtime_ns, size) != key:
+        return None
+    return table_from_columns(*columns)
+
+
+def table_from_columns(ids, wrong_counts, texts, answers, extras):
+    """스냅샷의 열로 QuestionTable을 바로 채웁니다 (행마다 dict를 거치지 않음)."""
+    table = QuestionTable()
+    table.ids.frombytes(ids)
+    table.wrong_counts.frombytes(wrong_counts)
+    table.texts.extend(texts)
+    table.answers.extend(answers)
+    table.extras.extend(extras)
+    table.rows.extend([None] * len(texts))
+    table.recount()
+    return table
+
+
+def write_snapshot(path, source_path, table, key=None):
+    """table의 열을 원본 파일의 (수정 시각, 크기)와 함께 원자적으로 저장합니다.
+
+    key를 주면 지금 원본 파일 대신 그 값을 적습니다 (원본을 교체할 때 미리
+    구해 둔 값으로, 그사이 다른 인스턴스가 원본을 바꿨으면 스냅샷을 쓰지 않게 됨).
+    스냅샷은 시작 속도를 위한 캐시일 뿐이므로 쓰지 못해도 오류로 보지 않습니다.
+    """
+    if key is None:
+        key = source_key(source_path)
+    if key is None:
+        return
+    columns = (table.ids.tobytes(), table.wrong_counts.tobytes(),
+               table.texts, table.answers, table.extras)
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".snapshot", dir=directory)
+        try:
+            copy_file_mode(fd, path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(marshal.dumps((SNAPSHOT_VERSION, key[0], key[1], columns)))
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    except OSError:
+        pass
@@ -0,0 +1,686 @@
+import json
+import os
+import sqlite3
+
+from quiz_bank import QuestionBank, read_bank_usage, write_bank
+from quiz_filelock import FileLock
+from quiz_journal import AnswerJournal, apply_records, diff_records, row_record
+from quiz_persistence import write_json_atomic
+from quiz_snapshot import read_snapshot, source_key, write_snapshot
+from quiz_table import QuestionTable
+
+
+# 답안 확인으로 바뀔 수 있는 필드 (틀린 횟수, 간격 반복 일정)
+ANSWER_FIELDS = ("wrong_count", "due", "interval")
+
+# 일괄 작업(되돌리기 포함)으로 바뀔 수 있는 필드
+BATCH_FIELDS = ("question", "answer", "wrong_count")
+
+BANK_EXTENSION = ".qbank"  # 블록 압축 문제 은행 파일 확장자
+
+
+class JsonQuestionStore:
+    """quiz_data.json 기반 문제 저장소입니다.
+
+    모든 변경은 먼저 저널에 문제 단위 레코드로 기록하고, 저널이 쌓이면
+    PersistenceService로 전체 저장(압축)을 예약합니다. 불러온 문제는 열 단위
+    QuestionTable에 보관합니다.
+
+    같은 파일을 여는 다른 인스턴스와는 저널을 함께 씁니다. 기록과 압축은
+    FileLock(quiz_data.json.lock)을 잡은 채로 하고, pull_changes()가 다른
+    인스턴스가 덧붙인 레코드만 읽어 바뀐 행에만 반영하므로 서로의 변경을
+    덮어쓰지 않습니다. 반영한 내용은 on_changes(바뀐 내용)로 알립니다.
+
+    snapshot_path가 있으면 JSON 파일을 쓸 때마다 같은 내용을 marshal 스냅샷으로도
+    남겨 두고, 다음 실행 때 JSON 파일의 수정 시각과 크기가 그대로면 JSON을
+    파싱하지 않고 스냅샷에서 바로 불러옵니다.
+    """
+
+    def __init__(self, path, persistence, journal_path="quiz_data.journal", snapshot_path=None):
+        self.path = path
+        self.persistence = persistence
+        self.journal = AnswerJournal(journal_path)
+        self.snapshot_path = snapshot_path
+        self.lock = FileLock(path + ".lock")
+        self.questions = QuestionTable()
+        self.next_id = 1
+        self.on_changes = None  # 다른 인스턴스의 변경을 반영한 뒤 부를 함수
+
+    def load(self):
+        """파일에서 문제를 불러오고 마지막 저장 이후의 저널 기록을 반영합니다."""
+        with self.lock:
+            self.questions = self.read_table()
+        self.next_id = max(self.next_id, max(self.questions.ids, default=0) + 1)
+        return self.questions
+
+    def read_table(self):
+        """스냅샷이나 JSON 파일과 저널로 지금의 문제 표를 만듭니다 (잠금을 잡고 부름)."""
+        table = read_snapshot(self.snapshot_path, self.path) if self.snapshot_path else None
+        if table is None:
+            questions = []
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    questions = json.load(f)
+            self.assign_ids(questions)
+            table = QuestionTable(questions)
+            if self.snapshot_path:
+                write_snapshot(self.snapshot_path, self.path, table)
+        self.journal.replay(table, self.path)
+        return table
+
+    def assign_ids(self, questions):
+        """ID가 없는 문제에 고유 ID를 부여합니다."""
+        self.next_id = max([self.next_id] + [q["id"] + 1 for q in questions if "id" in q])
+        for question in questions:
+            if "id" not in question:
+                question["id"] = self.next_id
+                self.next_id += 1
+
+    def pull_changes(self):
+        """다른 인스턴스가 저널에 기록한 변경을 반영하고 바뀐 내용을 반환합니다 (없으면 None).
+
+        읽지 못한 조각이 그사이 압축되어 지워졌으면 파일을 다시 읽어 지금
+        목록과 다른 행만 반영합니다.
+        """
+        if not self.journal.modified():
+            return None
+        with self.lock:
+            records, missed = self.journal.read_new()
+            if missed:
+                records = diff_records(self.questions, self.read_table())
+            changes = apply_records(self.questions, records)
+            self.track(records)
+        # 다른 인스턴스가 쓴 ID는 (지운 문제라도) 다시 쓰지 않음
+        self.next_id = max([self.next_id] + [record["id"] + 1 for record in records if "id" in record])
+        if changes and self.on_changes:
+            self.on_changes(changes)
+        return changes
+
+    def write_records(self, records):
+        """변경 레코드를 저널에 기록하고, 쌓였으면 전체 저장(압축)을 예약합니다."""
+        with self.lock:
+            self.journal.append_records(records)
+            self.track(records)
+            if self.journal.missed:
+                # 반영하지 못한 조각이 그사이 압축되어 지워졌으면 방금 쓴 기록까지 담긴
+                # 파일을 다시 읽어 맞춤 (그대로 두면 다시 시작할 때까지 목록이 어긋남)
+                self.pull_changes()
+        if self.journal.needs_compaction():
+            self.save()
+
+    def track(self, records):
+        """저널에 기록했거나 다른 인스턴스에서 읽어 반영한 레코드 (바뀐 행만 저장하는 저장소가 씀)"""
+
+    def save(self):
+        """전체 저장을 예약합니다."""
+        self.persistence.request(self.path, self.snapshot)
+
+    def snapshot(self):
+        """저장할 문제 데이터의 스냅샷을 만듭니다 (메인 스레드에서 호출).
+
+        다른 인스턴스의 기록까지 반영한 뒤 지금까지의 저널을 봉인하고, 작성
+        스레드에서는 그보다 나중 조각까지 반영한 압축이 없을 때만 파일을 교체합니다.
+        """
+        with self.lock:
+            self.pull_changes()
+            sequence = self.journal.checkpoint()
+            questions = self.questions.to_dicts()
+        written = {}
+
+        def replace(temp_path, path):
+            # 작성 스레드에서 임시 파일을 다 쓴 뒤 호출됨
+            with self.lock:
+                key = source_key(temp_path)
+                previous = self.journal.commit_compaction(sequence, temp_path, path)
+            if previous is None:
+                return False
+            written.update(key=key, previous=previous)
+
+        def on_written():
+            if self.snapshot_path:
+                write_snapshot(self.snapshot_path, self.path, QuestionTable(questions), written["key"])
+            # 다른 인스턴스가 아직 읽고 있을 수 있으므로 직전 압축까지의 조각만 지움
+            with self.lock:
+                self.journal.discard_through(written["previous"])
+        return questions, on_written, replace
+
+    def add(self, question_text, answer_text, extra=None):
+        """새 문제를 추가하고 추가된 문제를 반환합니다 (extra는 첨부 파일 같은 나머지 필드)."""
+        question = {
+            "id": self.next_id,
+            "question": question_text,
+            "answer": answer_text,
+            "wrong_count": 0
+        }
+        question.update(extra or {})
+        self.next_id += 1
+        question = self.questions.append(question)
+        self.write_records([row_record(question)])
+        return question
+
+    def update(self, index, fields):
+        """index번째 문제의 필드를 수정합니다."""
+        question = self.questions[index]
+        question.update(fields)
+        self.write_records([dict(fields, id=question["id"])])
+
+    def delete(self, indices):
+        """여러 문제를 삭제합니다."""
+        records = [{"op": "delete", "id": self.questions.ids[index]} for index in indices]
+        self.questions.delete(indices)
+        self.write_records(records)
+
+    def commit_batch(self, changed, deleted, restored=(), extra_changed=(), added=()):
+        """일괄 작업을 반영하고 새로 추가한 행 목록을 반환합니다.
+
+        changed 행(삭제 전 위치)은 이미 고쳐져 있고, deleted 행은 삭제한 뒤
+        restored(QuestionTable.take() 형식)를 되살리고 added 문제에 ID를 붙여
+        끝에 추가합니다. 바뀐 행은 BATCH_FIELDS만, 첨부 파일 같은 나머지 필드가
+        바뀐 extra_changed 행과 되살리거나 추가한 행은 행 전체를 저널에 한 번에
+        기록합니다 (빠진 필드도 다른 인스턴스에 반영되도록).
+        """
+        questions = self.questions
+        extra_changed = set(extra_changed)
+        records = [row_record(questions[index]) if index in extra_changed else
+                   {"id": questions.ids[index], "question": questions.texts[index],
+                    "answer": questions.answers[index], "wrong_count": questions.wrong_counts[index]}
+                   for index in changed]
+        records.extend({"op": "delete", "id": questions.ids[index]} for index in deleted)
+        questions.delete(deleted)
+        questions.insert(restored)
+        records.extend(row_record(questions[record[0]], record[0]) for record in restored)
+        start = len(questions)
+        for question in added:
+            question["id"] = self.next_id
+            self.next_id += 1
+        questions.extend(added)
+        added = questions.rows_at(range(start, len(questions)))
+        records.extend(row_record(question) for question in added)
+        self.write_records(records)
+        return added
+
+    def record_answer(self, question):
+        """답안 확인으로 바뀐 필드만 저널에 기록합니다."""
+        self.record_answers((question,))
+
+    def record_answers(self, questions):
+        """답안 확인으로 바뀐 필드를 문제마다 저널에 기록합니다 (쌓이면 전체 저장으로 압축)."""
+        self.write_records([dict({f: question[f] for f in ANSWER_FIELDS if f in question}, id=question["id"])
+                            for question in questions])
+
+    def reset_wrong_counts(self):
+        """모든 문제의 틀린 횟수를 초기화합니다 (틀린 횟수 열을 한 번에 0으로)."""
+        self.questions.reset_wrong_counts()
+        self.write_records([{"op": "reset_wrong_counts"}])
+
+    def filter_by_wrong_count(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 문제 목록을 반환합니다."""
+        return self.questions.rows_at(self.questions.positions_at_least(min_wrong_count))
+
+    def count_by_wrong_count(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 문제 수를 반환합니다."""
+        return self.questions.count_at_least(min_wrong_count)
+
+    def close(self):
+        """저장소를 닫습니다 (예약된 저장은 PersistenceService가 처리)."""
+
+
+class BankQuestionStore(JsonQuestionStore):
+    """블록 압축 문제 은행 파일(quiz_data.qbank, quiz_bank 참고) 기반 문제 저장소입니다.
+
+    변경을 저널에 기록하고 다른 인스턴스와 함께 쓰는 방식은 JSON 저장소와
+    같고, 저널을 정리할 때만 다릅니다. 마지막 정리 이후 바뀐 문제 ID를 기억해
+    두었다가 그 문제가 든 블록만 다시 압축해 파일에 덧붙이므로 정리 비용이
+    문제 은행 크기가 아니라 바뀐 양에 비례합니다. 되살린 행처럼 순서가
+    바뀌었거나, 틀린 횟수를 모두 초기화했거나, 바뀐 행이 많거나, 빈 자리가
+    커졌으면 전체를 새로 씁니다.
+    """
+
+    REWRITE_RATIO = 4  # 문제 수의 1/REWRITE_RATIO보다 많이 바뀌면 전체를 새로 씀
+
+    def __init__(self, path, persistence, journal_path, codec="zlib"):
+        super().__init__(path, persistence, journal_path)
+        self.codec = codec
+        self.dirty = set()  # 마지막 정리 이후 바뀌거나 추가된 문제 ID
+        self.deleted = set()  # 마지막 정리 이후 지운 문제 ID
+        self.rewrite = False  # 다음 정리 때 전체를 새로 써야 하는지
+        self.unconfirmed = []  # 정리를 맡겼지만 아직 기록되지 않은 (바뀐 ID, 지운 ID, 전체 여부)
+        self.bank = None  # 마지막으로 읽거나 고친 QuestionBank (파일이 그대로면 색인을 다시 읽지 않음)
+
+    def load(self):
+        """문제 은행 파일에서 문제를 불러오고 마지막 정리 이후의 저널 기록을 반영합니다."""
+        questions = super().load()
+        # 파일에 없는 기록을 다시 적용했으면 어느 행이 바뀌었는지 모르므로 다음 정리 때 전체를 씀
+        if self.journal.pending:
+            self.rewrite = True
+        return questions
+
+    def read_table(self):
+        """문제 은행 파일을 블록 단위로 읽고 저널을 반영해 문제 표를 만듭니다 (잠금을 잡고 부름)."""
+        self.bank = QuestionBank(self.path) if os.path.exists(self.path) else None
+        table = QuestionTable(self.bank) if self.bank is not None else QuestionTable()
+        self.next_id = max(self.next_id, max(table.ids, default=0) + 1)
+        self.journal.replay(table, self.path)
+        return table
+
+    def track(self, records):
+        """레코드로 바뀐 문제 ID를 다음 정리 때까지 모아 둡니다."""
+        if self.rewrite:
+            return
+        for record in records:
+            op = record.get("op")
+            if op == "reset_wrong_counts" or (op == "set" and record.get("position") is not None):
+                self.rewrite = True
+                self.dirty = set()
+                self.deleted = set()
+                return
+            if op == "delete":
+                self.deleted.add(record["id"])
+                self.dirty.discard(record["id"])
+            elif "id" in record:
+                self.dirty.add(record["id"])
+
+    def save(self):
+        """정리(바뀐 블록만 또는 전체 저장)를 예약합니다."""
+        self.persistence.request(self.path, self.snapshot, self.write_file)
+
+    def snapshot(self):
+        """저장할 변경의 스냅샷을 만듭니다 (메인 스레드에서 호출).
+
+        앞서 맡긴 정리가 실패했을 수 있으므로 아직 기록되지 않은 변경까지 합칩니다.
+        """
+        with self.lock:
+            self.pull_changes()
+            sequence = self.journal.checkpoint()
+            self.unconfirmed.append((self.dirty, self.deleted, self.rewrite))
+            self.dirty, self.deleted, self.rewrite = set(), set(), False
+            pending = list(self.unconfirmed)
+            dirty = set().union(*(entry[0] for entry in pending))
+            deleted = set().union(*(entry[1] for entry in pending))
+            rewrite = any(entry[2] for entry in pending)
+            if not rewrite:
+                usage = read_bank_usage(self.path)
+                rewrite = (usage is None or usage[1] > usage[0]
+                           or (len(dirty) + len(deleted)) * self.REWRITE_RATIO > len(self.questions))
+            if rewrite:
+                data = {"rows": self.questions.to_dicts()}
+            else:
+                positions = self.questions.positions_of_ids(dirty)
+                data = {"rows": [dict(row.items()) for row in self.questions.rows_at(positions)],
+                        "deleted": deleted}
+        data.update(sequence=sequence, rewrite=rewrite)
+
+        def on_written():
+            for entry in pending:
+                if any(entry is other for other in self.unconfirmed):
+                    self.unconfirmed.remove(entry)
+            # 다른 인스턴스가 아직 읽고 있을 수 있으므로 직전 압축까지의 조각만 지움
+            with self.lock:
+                self.journal.discard_through(data["previous"])
+        return data, on_written
+
+    def write_file(self, path, data, replace=None):
+        """작성 스레드: 바뀐 블록만 고쳐 쓰거나 전체를 새로 쓰고 압축 표시를 남깁니다.
+
+        그사이 다른 인스턴스가 더 나중 조각까지 정리했으면 쓰지 않고 False를 반환합니다.
+        """
+        sequence = data["sequence"]
+        if data["rewrite"]:
+            def replace(temp_path, path):
+                with self.lock:
+                    previous = self.journal.commit_compaction(sequence, temp_path, path)
+                if previous is None:
+                    return False
+                data["previous"] = previous
+                self.bank = None
+            return write_bank(path, data["rows"], replace, self.codec)
+        with self.lock:
+            if self.journal.read_marker().get("through", 0) > sequence:
+                return False
+            try:
+                if self.bank is None or not self.bank.is_current():
+                    self.bank = QuestionBank(path)
+                self.bank.apply(data["rows"], data["deleted"])
+            except (OSError, ValueError):
+                self.bank = None
+                self.rewrite = True  # 다음 정리 때 전체를 새로 씀
+                raise
+            data["previous"] = self.journal.commit_compaction(sequence, None, path)
+        return True
+
+
+class SqliteQuestionStore:
+    """SQLite 기반 문제 저장소입니다.
+
+    wrong_count에 인덱스를 두어 필터링, 개수 세기, 초기화를 인덱스 조회로
+    처리하고, 추가/수정/삭제/답안 기록은 해당 행만 씁니다. 화면 표시와 연습
+    세션은 메모리의 문제 목록(QuestionTable)을 그대로 사용하므로 questions와
+    by_id를 함께 유지합니다.
+
+    같은 DB를 여는 다른 인스턴스의 변경을 알 수 있도록 쓰기 트랜잭션마다
+    revision 표의 번호를 올려 바꾼 행의 rev에 적고, 지운 행은 deleted_questions에
+    남깁니다. pull_changes()는 PRAGMA data_version으로 다른 연결의 커밋이 있었을
+    때만 마지막으로 읽은 번호보다 rev가 큰 행과 지운 행을 읽어 반영합니다.
+    """
+
+    COLUMNS = ("id", "question", "answer", "wrong_count")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            wrong_count INTEGER NOT NULL DEFAULT 0,
+            extra TEXT,
+            rev INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_questions_wrong_count ON questions (wrong_count);
+        CREATE TABLE IF NOT EXISTS revision (value INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS deleted_questions (
+            id INTEGER PRIMARY KEY,
+            rev INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # 시작할 때 백그라운드 스레드에서 불러온 뒤 메인 스레드에서 쓰므로 스레드 검사를 끔
+        # (동시에 쓰지는 않음)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # 한 행씩 자주 커밋하므로 WAL 모드로 커밋 비용을 줄임
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = FileLock(path + ".lock")
+        with self.lock:
+            self.conn.executescript(self.SCHEMA)
+            self.migrate()
+        self.questions = QuestionTable()
+        self.by_id = {}
+        self.last_rev = 0  # 반영한 마지막 변경 번호
+        self.data_version = None  # 그때의 PRAGMA data_version
+        self.on_changes = None  # 다른 인스턴스의 변경을 반영한 뒤 부를 함수
+
+    def migrate(self):
+        """이전 버전 DB에 변경 번호 열과 표를 더합니다."""
+        with self.conn:
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(questions)")]
+            if "rev" not in columns:
+                self.conn.execute("ALTER TABLE questions ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_questions_rev ON questions (rev)")
+            if self.conn.execute("SELECT COUNT(*) FROM revision").fetchone()[0] == 0:
+                self.conn.execute("INSERT INTO revision (value) VALUES (0)")
+
+    @classmethod
+    def row_params(cls, question):
+        """문제 dict를 INSERT용 값으로 변환합니다 (기본 필드 외에는 extra에 보관)."""
+        extra = {k: v for k, v in question.items() if k not in cls.COLUMNS}
+        return (question.get("id"), question["question"], question["answer"],
+                question.get("wrong_count", 0),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    def load(self):
+        """DB에서 문제를 불러옵니다."""
+        with self.lock:
+            self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            self.last_rev = self.conn.execute("SELECT value FROM revision").fetchone()[0]
+            self.questions = QuestionTable(self.iter_rows())
+        self.by_id = {q["id"]: q for q in self.questions}
+        return self.questions
+
+    def iter_rows(self, min_rev=None):
+        """DB의 문제를 ID 순서대로 dict로 하나씩 읽습니다 (min_rev를 주면 그 뒤에 바뀐 행만)."""
+        query = "SELECT id, question, answer, wrong_count, extra FROM questions"
+        params = ()
+        if min_rev is not None:
+            query += " WHERE rev > ?"
+            params = (min_rev,)
+        for question_id, text, answer, wrong_count, extra in self.conn.execute(query + " ORDER BY id", params):
+            question = {"id": question_id, "question": text, "answer": answer,
+                        "wrong_count": wrong_count}
+            if extra:
+                question.update(json.loads(extra))
+            yield question
+
+    def begin_revision(self):
+        """쓰기 트랜잭션 안에서 변경 번호를 올리고 새 번호를 반환합니다."""
+        self.conn.execute("UPDATE revision SET value = value + 1")
+        return self.conn.execute("SELECT value FROM revision").fetchone()[0]
+
+    def end_revision(self, rev):
+        """자기 커밋만 있었으면 그 변경은 이미 반영한 것으로 둡니다 (다른 연결의 커밋이 끼었으면
+        다음 pull_changes()에서 함께 읽음)."""
+        if self.conn.execute("PRAGMA data_version").fetchone()[0] == self.data_version:
+            self.last_rev = rev
+
+    def pull_changes(self):
+        """다른 인스턴스가 바꾼 행만 읽어 반영하고 바뀐 내용을 반환합니다 (없으면 None)."""
+        with self.lock:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self.data_version:
+                return None
+            rev = self.conn.execute("SELECT value FROM revision").fetchone()[0]
+            records = [{"op": "delete", "id": question_id} for (question_id,) in self.conn.execute(
+                "SELECT id FROM deleted_questions WHERE rev > ?", (self.last_rev,))]
+            records.extend(row_record(question) for question in self.iter_rows(self.last_rev))
+            self.data_version = version
+            self.last_rev = rev
+        for record in records:
+            if record["op"] == "delete":
+                self.by_id.pop(record["id"], None)
+        changes = apply_records(self.questions, records)
+        if changes:
+            self.by_id.update((q["id"], q) for q in self.questions.rows_at(changes["added"]))
+            if self.on_changes:
+                self.on_changes(changes)
+        return changes
+
+    def insert_many(self, questions):
+        """문제 여러 개를 한 트랜잭션으로 추가합니다 (마이그레이션, 가져오기용)."""
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            self.conn.executemany(
+                "INSERT INTO questions (id, question, answer, wrong_count, extra, rev) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.row_params(q) + (rev,) for q in questions))
+            self.conn.executemany("DELETE FROM deleted_questions WHERE id = ?",
+                                  ((q["id"],) for q in questions))
+        self.end_revision(rev)
+
+    def next_ids(self):
+        """새 문제에 붙일 첫 ID (다른 인스턴스가 지운 ID도 다시 쓰지 않음)"""
+        return max(self.conn.execute("SELECT MAX(id) FROM questions").fetchone()[0] or 0,
+                   self.conn.execute("SELECT MAX(id) FROM deleted_questions").fetchone()[0] or 0) + 1
+
+    def add(self, question_text, answer_text, extra=None):
+        """새 문제를 추가하고 추가된 문제를 반환합니다 (extra는 첨부 파일 같은 나머지 필드)."""
+        question = {"question": question_text, "answer": answer_text, "wrong_count": 0}
+        question.update(extra or {})
+        return self.add_many([question])[0]
+
+    def add_many(self, questions):
+        """문제 여러 개에 ID를 붙여 한 트랜잭션으로 추가합니다."""
+        with self.lock:
+            next_id = self.next_ids()
+            for question in questions:
+                question["id"] = next_id
+                next_id += 1
+            self.insert_many(questions)
+        start = len(self.questions)
+        self.questions.extend(questions)
+        added = [self.questions[index] for index in range(start, len(self.questions))]
+        self.by_id.update((q["id"], q) for q in added)
+        return added
+
+    def update(self, index, fields):
+        """index번째 문제의 필드를 수정합니다."""
+        question = self.questions[index]
+        question.update(fields)
+        _, text, answer, wrong_count, extra = self.row_params(question)
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            self.conn.execute(
+                "UPDATE questions SET question = ?, answer = ?, wrong_count = ?, extra = ?, rev = ? WHERE id = ?",
+                (text, answer, wrong_count, extra, rev, question["id"]))
+        self.end_revision(rev)
+
+    def delete_rows(self, ids, rev):
+        """트랜잭션 안에서 문제들을 지우고 다른 인스턴스가 알 수 있게 지운 ID를 남깁니다."""
+        self.conn.executemany("DELETE FROM questions WHERE id = ?", ((question_id,) for question_id in ids))
+        self.conn.executemany("INSERT OR REPLACE INTO deleted_questions (id, rev) VALUES (?, ?)",
+                              ((question_id, rev) for question_id in ids))
+
+    def delete(self, indices):
+        """여러 문제를 삭제합니다."""
+        ids = [self.questions.ids[index] for index in indices]
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            self.delete_rows(ids, rev)
+        self.end_revision(rev)
+        for question_id in ids:
+            del self.by_id[question_id]
+        self.questions.delete(indices)
+
+    def commit_batch(self, changed, deleted, restored=(), extra_changed=(), added=()):
+        """일괄 작업으로 바뀐 행, 삭제할 행, 되살릴 행, 추가할 문제를 한 트랜잭션으로 기록합니다.
+
+        extra는 나머지 필드(첨부 파일 등)가 바뀐 extra_changed 행만 다시 씁니다.
+        새로 추가한 행 목록을 반환합니다.
+        """
+        questions = self.questions
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            next_id = self.next_ids()
+            for question in added:
+                question["id"] = next_id
+                next_id += 1
+            self.conn.executemany(
+                "UPDATE questions SET question = ?, answer = ?, wrong_count = ?, rev = ? WHERE id = ?",
+                ((questions.texts[index], questions.answers[index], questions.wrong_counts[index],
+                  rev, questions.ids[index]) for index in changed))
+            self.conn.executemany(
+                "UPDATE questions SET extra = ? WHERE id = ?",
+                ((json.dumps(questions.extras[index], ensure_ascii=False) if questions.extras[index] else None,
+                  questions.ids[index]) for index in extra_changed))
+            self.delete_rows([questions.ids[index] for index in deleted], rev)
+            self.conn.executemany(
+                "INSERT INTO questions (id, question, answer, wrong_count, extra, rev) VALUES (?, ?, ?, ?, ?, ?)",
+                ((question_id, text, answer, wrong_count,
+                  json.dumps(extra, ensure_ascii=False) if extra else None, rev)
+                 for _, question_id, text, answer, wrong_count, extra in restored))
+            self.conn.executemany("DELETE FROM deleted_questions WHERE id = ?",
+                                  ((record[1],) for record in restored))
+            self.conn.executemany(
+                "INSERT INTO questions (id, question, answer, wrong_count, extra, rev) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.row_params(q) + (rev,) for q in added))
+        self.end_revision(rev)
+        for index in deleted:
+            del self.by_id[questions.ids[index]]
+        questions.delete(deleted)
+        questions.insert(restored)
+        self.by_id.update((question["id"], question) for question in questions.rows_at(
+            record[0] for record in restored))
+        start = len(questions)
+        questions.extend(added)
+        added = questions.rows_at(range(start, len(questions)))
+        self.by_id.update((question["id"], question) for question in added)
+        return added
+
+    def answer_params(self, question, rev):
+        """답안 확인으로 바뀐 값(틀린 횟수, 간격 반복 일정이 든 extra)을 UPDATE용으로 만듭니다."""
+        _, _, _, wrong_count, extra = self.row_params(question)
+        return wrong_count, extra, rev, question["id"]
+
+    def record_answer(self, question):
+        """답안 확인으로 바뀐 값을 해당 행에만 기록합니다."""
+        self.record_answers((question,))
+
+    def record_answers(self, questions):
+        """답안 확인으로 바뀐 값을 한 트랜잭션으로 기록합니다."""
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            self.conn.executemany("UPDATE questions SET wrong_count = ?, extra = ?, rev = ? WHERE id = ?",
+                                  (self.answer_params(q, rev) for q in questions))
+        self.end_revision(rev)
+
+    def reset_wrong_counts(self):
+        """틀린 횟수가 있는 문제만 인덱스로 찾아 초기화합니다."""
+        with self.lock, self.conn:
+            rev = self.begin_revision()
+            self.conn.execute("UPDATE questions SET wrong_count = 0, rev = ? WHERE wrong_count > 0", (rev,))
+        self.end_revision(rev)
+        self.questions.reset_wrong_counts()
+
+    def filter_by_wrong_count(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 문제 목록을 반환합니다."""
+        cursor = self.conn.execute(
+            "SELECT id FROM questions WHERE wrong_count >= ? ORDER BY id", (min_wrong_count,))
+        # 다른 인스턴스가 추가해 아직 반영하지 않은 행은 뺌
+        by_id = self.by_id
+        return [by_id[question_id] for (question_id,) in cursor if question_id in by_id]
+
+    def count_by_wrong_count(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 문제 수를 반환합니다."""
+        cursor = self.conn.execute(
+            "SELECT COUNT(*) FROM questions WHERE wrong_count >= ?", (min_wrong_count,))
+        return cursor.fetchone()[0]
+
+    def close(self):
+        """DB 연결을 닫습니다."""
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(json_path, db_path, journal_path="quiz_data.journal"):
+    """기존 JSON 문제 파일(저널 포함)을 SQLite DB로 한 번에 옮깁니다."""
+    source = JsonQuestionStore(json_path, None, journal_path)
+    questions = source.load()
+
+    # 중간에 실패해도 반쯤 채워진 DB가 남지 않도록 임시 파일에 만든 뒤 교체
+    temp_path = db_path + ".migrating"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    target = SqliteQuestionStore(temp_path)
+    try:
+        target.insert_many(questions)
+    finally:
+        target.close()
+    os.replace(temp_path, db_path)
+    if os.path.exists(target.lock.path):
+        os.remove(target.lock.path)
+    return len(questions)
+
+
+def convert_question_file(source_path, target_path, codec="zlib", journal_path=None):
+    """JSON 문제 파일과 문제 은행 파일(.qbank)을 서로 바꾸고 옮긴 문제 수를 반환합니다.
+
+    형식은 확장자로 정하고, 원본의 저널(quiz_data.journal 또는 quiz_data.qbank.journal)에
+    남은 변경까지 반영해 옮깁니다. 문제 은행 파일은 블록 단위로 씁니다.
+    """
+    if not os.path.exists(source_path):
+        raise ValueError(f"파일을 찾을 수 없습니다: {source_path}")
+    if source_path.endswith(BANK_EXTENSION):
+        source = BankQuestionStore(source_path, None, journal_path or source_path + ".journal")
+    else:
+        source = JsonQuestionStore(source_path, None, journal_path or os.path.splitext(source_path)[0] + ".journal")
+    questions = source.load()
+    if target_path.endswith(BANK_EXTENSION):
+        write_bank(target_path, questions, codec=codec)
+    else:
+        write_json_atomic(target_path, questions.to_dicts())
+    return len(questions)
+
+
+def open_question_store(settings, persistence, json_path="quiz_data.json",
+                        db_path="quiz_data.db", journal_path="quiz_data.journal",
+                        snapshot_path=None, bank_path="quiz_data.qbank"):
+    """설정의 storage_backend에 맞는 문제 저장소를 엽니다."""
+    if settings.get("storage_backend") == "bank":
+        # 처음 문제 은행으로 전환할 때 기존 JSON 데이터를 옮겨 둠 (JSON 파일은 그대로 보존)
+        codec = settings.get("bank_compression", "zlib")
+        if not os.path.exists(bank_path) and os.path.exists(json_path):
+            convert_question_file(json_path, bank_path, codec, journal_path)
+        return BankQuestionStore(bank_path, persistence, bank_path + ".journal", codec)
+    if settings.get("storage_backend") == "sqlite":
+        # 처음 SQLite로 전환할 때 기존 JSON 데이터를 옮겨 둠 (JSON 파일은 그대로 보존)
+        if not os.path.exists(db_path) and os.path.exists(json_path):
+            migrate_json_to_sqlite(json_path, db_path, journal_path)
+        return SqliteQuestionStore(db_path)
+    return JsonQuestionStore(json_path, persistence, journal_path, snapshot_path)
@@ -0,0 +1,300 @@
+import itertools
+import sys
+from array import array
+
+
+class QuestionRow:
+    """QuestionTable의 한 행을 dict처럼 읽고 쓰는 뷰입니다.
+
+    값은 표의 열에 그대로 있으므로 question["wrong_count"] += 1처럼 쓰면 표가
+    바로 바뀝니다. 같은 행에는 항상 같은 뷰 객체가 돌아옵니다.
+    """
+
+    __slots__ = ("table", "position")
+
+    def __init__(self, table, position):
+        self.table = table
+        self.position = position
+
+    def __getitem__(self, key):
+        try:
+            return self.table.columns[key][self.position]
+        except KeyError:
+            pass
+        extra = self.table.extras[self.position]
+        if extra is None:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key, value):
+        if key == "wrong_count":
+            self.table.set_wrong_count(self.position, value)
+            return
+        column = self.table.columns.get(key)
+        if column is not None:
+            column[self.position] = value
+            return
+        extras = self.table.extras
+        if extras[self.position] is None:
+            extras[self.position] = {}
+        extras[self.position][key] = value
+
+    def __contains__(self, key):
+        if key in self.table.columns:
+            return True
+        extra = self.table.extras[self.position]
+        return extra is not None and key in extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        extra = self.table.extras[self.position]
+        return list(self.table.columns) + (list(extra) if extra else [])
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def __repr__(self):
+        return f"QuestionRow({dict(self)!r})"
+
+
+class DetachedTable:
+    """삭제된 행의 값을 한 행짜리 표로 보관합니다 (삭제 후에도 뷰를 읽을 수 있도록)."""
+
+    def __init__(self, row):
+        self.columns = {key: [row[key]] for key in row.table.columns}
+        self.extras = [row.table.extras[row.position]]
+
+    def set_wrong_count(self, position, value):
+        self.columns["wrong_count"][position] = value
+
+
+class QuestionTable:
+    """문제 목록을 열 단위로 보관하는 표입니다.
+
+    문제 ID와 틀린 횟수는 array('I'), 문제/정답 문자열은 리스트(정답은
+    sys.intern으로 같은 문자열을 공유)에 두고, 간격 반복 일정 같은 나머지 필드는
+    있는 행에만 dict로 둡니다. 문제마다 dict를 만들지 않으므로 메모리가 적게
+    들고, 틀린 횟수 필터/개수/초기화는 열 하나만 훑습니다.
+
+    목록처럼 인덱스로 접근하면 QuestionRow 뷰를 돌려주며, 뷰는 처음 접근할 때
+    만들어 재사용합니다.
+    """
+
+    DELETE_IN_PLACE_LIMIT = 16  # 이보다 많이 지우면 열을 한 번에 다시 만듦
+
+    def __init__(self, questions=()):
+        self.ids = array('I')
+        self.wrong_counts = array('I')
+        self.texts = []
+        self.answers = []
+        self.extras = []  # 기본 열 외의 필드 dict (없으면 None)
+        self.rows = []  # 만들어 둔 행 뷰 (아직 없으면 None)
+        # 틀린 횟수 합계와 틀린 문제 수 (틀린 횟수가 바뀌는 곳마다 고치므로 열을 훑지 않고 읽음)
+        self.total_wrong = 0
+        self.wrong_questions = 0
+        self.columns = {
+            "id": self.ids,
+            "question": self.texts,
+            "answer": self.answers,
+            "wrong_count": self.wrong_counts
+        }
+        self.extend(questions)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        row = self.rows[index]
+        if row is None:
+            if index < 0:
+                index += len(self.rows)
+            row = self.rows[index] = QuestionRow(self, index)
+        return row
+
+    def __iter__(self):
+        rows = self.rows
+        for index in range(len(rows)):
+            row = rows[index]
+            yield row if row is not None else self[index]
+
+    def rows_at(self, positions):
+        """여러 위치의 행 뷰 목록"""
+        rows = self.rows
+        return [rows[index] or self[index] for index in positions]
+
+    def positions_of_ids(self, ids):
+        """문제 ID가 ids 안에 있는 행 위치 목록 (ID 열만 훑음)"""
+        return list(itertools.compress(range(len(self.ids)), map(ids.__contains__, self.ids)))
+
+    def append(self, question):
+        """dict(또는 행 뷰) 하나를 끝에 추가하고 그 행의 뷰를 반환합니다."""
+        self.extend((question,))
+        return self[len(self.ids) - 1]
+
+    def extend(self, questions):
+        """여러 문제를 끝에 추가합니다."""
+        columns = self.columns
+        start = len(self.wrong_counts)
+        for question in questions:
+            self.ids.append(question["id"])
+            self.texts.append(question["question"])
+            self.answers.append(sys.intern(question["answer"]))
+            self.wrong_counts.append(question.get("wrong_count", 0))
+            extra = {key: question[key] for key in question.keys() if key not in columns}
+            self.extras.append(extra or None)
+            self.rows.append(None)
+        self.count_wrong(self.wrong_counts[start:])
+
+    def delete(self, indices):
+        """여러 행을 삭제합니다. 삭제된 행의 뷰는 마지막 값을 그대로 읽을 수 있습니다."""
+        if not indices:
+            return
+        indices = sorted(set(indices), reverse=True)
+        self.count_wrong([self.wrong_counts[index] for index in indices], -1)
+        for index in indices:
+            row = self.rows[index]
+            if row is not None:
+                row.table = DetachedTable(row)
+                row.position = 0
+        columns = (self.ids, self.wrong_counts, self.texts, self.answers, self.extras, self.rows)
+        if len(indices) <= self.DELETE_IN_PLACE_LIMIT:
+            for index in indices:
+                for column in columns:
+                    del column[index]
+        else:
+            # 많이 지울 때는 행마다 당기지 않고 남길 행만 골라 한 번에 다시 채움
+            keep = bytearray(b"\x01") * len(self.ids)
+            for index in indices:
+                keep[index] = 0
+            for column in columns:
+                kept = itertools.compress(column, keep)
+                column[:] = array(column.typecode, kept) if isinstance(column, array) else list(kept)
+        # 삭제된 행 뒤쪽 뷰의 위치를 한 번에 당김
+        for position in range(indices[-1], len(self.rows)):
+            row = self.rows[position]
+            if row is not None:
+                row.position = position
+
+    def set_row(self, position, question):
+        """position번째 행의 값을 question(dict)으로 모두 바꿉니다 (기본 열 외의 필드도 통째로)."""
+        self.ids[position] = question["id"]
+        self.texts[position] = question["question"]
+        self.answers[position] = sys.intern(question["answer"])
+        self.set_wrong_count(position, question.get("wrong_count", 0))
+        extra = {key: question[key] for key in question.keys() if key not in self.columns}
+        self.extras[position] = extra or None
+
+    def set_wrong_count(self, position, value):
+        """position번째 행의 틀린 횟수를 바꾸고 합계를 고칩니다."""
+        old = self.wrong_counts[position]
+        self.wrong_counts[position] = value
+        self.total_wrong += value - old
+        self.wrong_questions += (value > 0) - (old > 0)
+
+    def count_wrong(self, values, sign=1):
+        """추가(sign=1)하거나 지운(sign=-1) 행들의 틀린 횟수 values를 합계에 반영합니다."""
+        self.total_wrong += sign * sum(values)
+        self.wrong_questions += sign * (len(values) - values.count(0))
+
+    def recount(self):
+        """열을 직접 채운 뒤 틀린 횟수 합계를 다시 셉니다."""
+        self.total_wrong = 0
+        self.wrong_questions = 0
+        self.count_wrong(self.wrong_counts)
+
+    def take(self, positions):
+        """여러 위치의 행 값을 (위치, ID, 문제, 정답, 틀린 횟수, 나머지 필드) 튜플로 떼어 둡니다.
+
+        행마다 dict를 만들지 않으므로 삭제한 행을 되살릴 수 있게 보관할 때 적게 듭니다.
+        """
+        return [(position, self.ids[position], self.texts[position], self.answers[position],
+                 self.wrong_counts[position], dict(self.extras[position]) if self.extras[position] else None)
+                for position in sorted(positions)]
+
+    def insert(self, records):
+        """take()로 떼어 둔 행들을 그 위치에 다시 끼워 넣습니다."""
+        if not records:
+            return
+        records = sorted(records, key=lambda record: record[0])
+        columns = (self.ids, self.texts, self.answers, self.wrong_counts, self.extras, self.rows)
+        values = (
+            [record[1] for record in records],
+            [record[2] for record in records],
+            [sys.intern(record[3]) for record in records],
+            [record[4] for record in records],
+            [record[5] for record in records],
+            [None] * len(records)
+        )
+        self.count_wrong(values[3])
+        if len(records) <= self.DELETE_IN_PLACE_LIMIT:
+            for number, record in enumerate(records):
+                for column, column_values in zip(columns, values):
+                    column.insert(record[0], column_values[number])
+        else:
+            # 많이 넣을 때는 행마다 밀지 않고 기존 구간과 새 값을 이어 붙여 한 번에 다시 만듦
+            for column, column_values in zip(columns, values):
+                merged = array(column.typecode) if isinstance(column, array) else []
+                start = 0
+                for number, record in enumerate(records):
+                    end = record[0] - number
+                    merged.extend(column[start:end])
+                    merged.append(column_values[number])
+                    start = end
+                merged.extend(column[start:])
+                column[:] = merged
+        # 끼워 넣은 행 뒤쪽 뷰의 위치를 한 번에 밈
+        for position in range(records[0][0], len(self.rows)):
+            row = self.rows[position]
+            if row is not None:
+                row.position = position
+
+    def at_least_mask(self, min_wrong_count):
+        """행마다 틀린 횟수 ≥ min_wrong_count면 1, 아니면 0인 바이트열을 만듭니다.
+
+        틀린 횟수가 모두 255 이하면(대부분의 경우) 열의 원시 바이트에서 하위
+        바이트만 잘라 bytes.translate로 한 번에 비교하므로 행마다 파이썬 코드를
+        실행하지 않습니다.
+        """
+        counts = self.wrong_counts
+        size = counts.itemsize
+        raw = counts.tobytes()
+        low_offset = 0 if sys.byteorder == "little" else size - 1
+        high_offsets = [offset for offset in range(size) if offset != low_offset]
+        if min_wrong_count < 256 and all(raw[offset::size].count(0) == len(counts) for offset in high_offsets):
+            table = bytes(1 if value >= min_wrong_count else 0 for value in range(256))
+            return raw[low_offset::size].translate(table)
+        return bytes(map(min_wrong_count.__le__, counts))
+
+    def positions_at_least(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 행 위치 목록 (틀린 횟수 열만 훑음)"""
+        return list(itertools.compress(range(len(self.ids)), self.at_least_mask(min_wrong_count)))
+
+    def count_at_least(self, min_wrong_count):
+        """틀린 횟수가 min_wrong_count 이상인 행 수"""
+        return self.at_least_mask(min_wrong_count).count(1)
+
+    def reset_wrong_counts(self):
+        """틀린 횟수 열 전체를 0으로 바꿉니다."""
+        self.wrong_counts[:] = array('I', bytes(len(self.wrong_counts) * self.wrong_counts.itemsize))
+        self.total_wrong = 0
+        self.wrong_questions = 0
+
+    def to_dicts(self):
+        """저장용으로 모든 행을 dict 목록으로 만듭니다."""
+        questions = []
+        for question_id, text, answer, wrong_count, extra in zip(
+                self.ids, self.texts, self.answers, self.wrong_counts, self.extras):
+            question = {"id": question_id, "question": text, "answer": answer, "wrong_count": wrong_count}
+            if extra:
+                question.update(extra)
+            questions.append(question)
+        return questions
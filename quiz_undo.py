@@ -0,0 +1,94 @@
+import sys
+from collections import deque
+
+
+DEFAULT_UNDO_MEMORY_MB = 16
+
+
+def batch_size(batch):
+    """되돌리기 기록 하나(QuestionBatch)가 차지하는 메모리를 대강 셉니다 (바이트)."""
+    size = sys.getsizeof(batch.deletes) + 32 * len(batch.deletes)
+    size += sys.getsizeof(batch.fields)
+    for fields in batch.fields.values():
+        size += sys.getsizeof(fields) + 32
+        size += sum(sys.getsizeof(value) for value in fields.values())
+    size += sys.getsizeof(batch.resets) + 32 * len(batch.resets)
+    size += sys.getsizeof(batch.wrong_deltas) + 64 * len(batch.wrong_deltas)
+    size += sys.getsizeof(batch.wrong_count_ids) + sys.getsizeof(batch.wrong_count_values)
+    size += sys.getsizeof(batch.restores)
+    for _, _, text, answer, _, extra in batch.restores:
+        # 튜플과 위치/ID/틀린 횟수 숫자, 문제/정답 문자열 (정답은 다른 행과 공유할 수도 있음)
+        size += 150 + sys.getsizeof(text) + sys.getsizeof(answer)
+        if extra:
+            size += sys.getsizeof(extra) + 64 * len(extra)
+    return size
+
+
+class UndoHistory:
+    """문제 편집을 되돌리고 다시 실행하기 위한 기록입니다.
+
+    작업마다 문제 목록 전체를 복사하지 않고, 그 작업을 되돌리는 일괄
+    작업(바뀐 행의 이전 값, 삭제한 행과 그 위치, 추가한 행의 ID)만 보관합니다.
+    되돌리면 그 일괄 작업을 적용하면서 다시 실행할 일괄 작업을 얻습니다.
+
+    두 스택에 쌓인 기록의 크기 합이 max_bytes를 넘으면 가장 오래된 기록부터
+    버리며, 혼자서 max_bytes를 넘는 작업은 되돌릴 수 없습니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_UNDO_MEMORY_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.undo_stack = deque()  # (이름, 되돌릴 QuestionBatch, 크기), 끝이 가장 최근
+        self.redo_stack = deque()
+        self.size = 0
+
+    def record(self, label, inverse):
+        """새 작업을 기록합니다 (다시 실행할 기록은 버림)."""
+        self.drop(self.redo_stack, len(self.redo_stack))
+        self.push(self.undo_stack, label, inverse)
+
+    def push(self, stack, label, batch):
+        size = batch_size(batch)
+        stack.append((label, batch, size))
+        self.size += size
+        # 오래된 되돌리기 기록부터, 그래도 넘으면 가장 먼 다시 실행 기록부터 버림
+        while self.size > self.max_bytes and self.undo_stack:
+            self.drop(self.undo_stack, 1)
+        while self.size > self.max_bytes and self.redo_stack:
+            self.drop(self.redo_stack, 1)
+
+    def drop(self, stack, count):
+        for _ in range(count):
+            self.size -= stack.popleft()[2]
+
+    def undo_label(self):
+        """되돌릴 작업 이름 (없으면 None)"""
+        return self.undo_stack[-1][0] if self.undo_stack else None
+
+    def redo_label(self):
+        """다시 실행할 작업 이름 (없으면 None)"""
+        return self.redo_stack[-1][0] if self.redo_stack else None
+
+    def pop_undo(self):
+        """되돌릴 (이름, 일괄 작업)을 꺼냅니다."""
+        return self.pop(self.undo_stack)
+
+    def pop_redo(self):
+        """다시 실행할 (이름, 일괄 작업)을 꺼냅니다."""
+        return self.pop(self.redo_stack)
+
+    def pop(self, stack):
+        label, batch, size = stack.pop()
+        self.size -= size
+        return label, batch
+
+    def push_undo(self, label, batch):
+        """다시 실행한 작업을 되돌리기 기록에 올립니다."""
+        self.push(self.undo_stack, label, batch)
+
+    def push_redo(self, label, batch):
+        """되돌린 작업을 다시 실행 기록에 올립니다."""
+        self.push(self.redo_stack, label, batch)
+
+    def clear(self):
+        self.drop(self.undo_stack, len(self.undo_stack))
+        self.drop(self.redo_stack, len(self.redo_stack))